@@ -0,0 +1,76 @@
+"""Benchmark for the vectorized fleet analyzer.
+
+Builds a synthetic fleet (containers spread over namespaces and workload
+kinds, some without requests or limits) and times loading it into columns,
+the analysis itself, and building issues for what stands out.
+
+Usage:
+    python benchmarks/bench_fleet.py [--containers 500000] [--namespaces 2000]
+"""
+
+import argparse
+import random
+import time
+
+from src.analyzers.fleet import FleetAnalyzer, FleetColumns
+
+KINDS = ["Deployment", "StatefulSet", "DaemonSet"]
+CPU = [0.0, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 8.0]
+MEMORY = [0, 64, 128, 256, 512, 1024, 2048, 16384]
+MIB = 1024 * 1024
+
+
+def make_rows(count: int, namespaces: int) -> list:
+    rng = random.Random(0)
+    rows = []
+    for i in range(count):
+        cpu = rng.choice(CPU)
+        memory = rng.choice(MEMORY) * MIB
+        rows.append((
+            f"ns-{rng.randrange(namespaces)}",
+            rng.choice(KINDS),
+            f"workload-{i}",
+            "app",
+            cpu,
+            memory,
+            cpu * rng.choice((0, 1, 2, 8)),
+            memory * rng.choice((0, 1, 2)),
+        ))
+    return rows
+
+
+def make_fleet(rows: list) -> FleetColumns:
+    columns = FleetColumns()
+    for row in rows:
+        columns.add(*row)
+    return columns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--containers", type=int, default=500_000)
+    parser.add_argument("--namespaces", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Generating the synthetic fleet is not part of what is measured
+    rows = make_rows(args.containers, args.namespaces)
+    started = time.perf_counter()
+    columns = make_fleet(rows)
+    print(f"load      {args.containers} containers in {time.perf_counter() - started:.3f}s")
+
+    analyzer = FleetAnalyzer()
+    best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        report = analyzer.analyze(columns)
+        best = min(best, time.perf_counter() - started)
+    print(f"analyze   {args.containers} containers in {best:.3f}s (best of {args.repeat})")
+
+    started = time.perf_counter()
+    issues = report.issues(cluster="bench")
+    print(f"issues    {len(issues)} built in {time.perf_counter() - started:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
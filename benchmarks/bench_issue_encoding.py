@@ -0,0 +1,69 @@
+"""Benchmark for Issue memory footprint and bulk JSON encoding.
+
+Reports the memory held per Issue and the encode throughput of the
+per-issue ``to_dict`` path against the bulk encoders.
+
+Usage:
+    python benchmarks/bench_issue_encoding.py [--count 100000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from src.detectors.base.detector import Issue, Platform, Severity
+from src.detectors.base.encoding import encode_issues, encode_ndjson
+from src.utils.serialization import dumps
+
+
+def make_issues(count: int):
+    return [
+        Issue(
+            platform=Platform.K8S,
+            resource_type="Deployment",
+            resource_name=f"workload-{i}",
+            namespace=f"ns-{i % 200}",
+            cluster="bench",
+            severity=Severity.MEDIUM,
+            title="Missing resource limits",
+            description="Container app has no resource limits",
+            check="missing_resources",
+            current_value={"cpu": "100m", "memory": "128Mi"},
+            metadata={"container": "app"},
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    issues = make_issues(args.count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    held = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"memory   {held / args.count:8.0f} bytes/issue (including field values)")
+
+    cases = {
+        "to_dict + json": lambda: json.dumps([i.to_dict() for i in issues], default=str).encode(),
+        "to_dict + dumps": lambda: dumps([i.to_dict() for i in issues]),
+        "encode_issues": lambda: encode_issues(issues),
+        "encode_ndjson": lambda: encode_ndjson(issues),
+    }
+    for name, case in cases.items():
+        started = time.perf_counter()
+        payload = case()
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:16s} {elapsed:6.3f}s  {args.count / elapsed:10,.0f} issues/s"
+            f"  {len(payload) / 2**20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
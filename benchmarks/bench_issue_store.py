@@ -0,0 +1,81 @@
+"""Benchmark for IssueStore ingestion and queries.
+
+Ingests one detection cycle worth of issues (first cycle: full upsert;
+steady state: unchanged issues are only touched) and runs a few indexed
+queries. "cycle" is a steady-state cycle as the scheduler writes it: 1% of
+the issues changed and are upserted, the rest are touched.
+
+Usage:
+    python benchmarks/bench_issue_store.py [--count 100000] [--path /tmp/issues.db]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.core.issue_store import IssueStore
+from src.detectors.base.detector import Issue, Platform, Severity
+
+SEVERITIES = list(Severity)
+
+
+def make_issues(count: int):
+    return [
+        Issue(
+            platform=Platform.K8S,
+            resource_type="Deployment",
+            resource_name=f"workload-{i}",
+            namespace=f"ns-{i % 200}",
+            cluster="bench",
+            severity=SEVERITIES[i % len(SEVERITIES)],
+            title="Missing resource limits",
+            description="Container app has no resource limits",
+            check="missing_resources",
+            metadata={"container": "app"},
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--path", default=None)
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "issues.db")
+    store = IssueStore(path)
+    issues = make_issues(args.count)
+
+    fingerprints = [issue.fingerprint for issue in issues]
+    changed = issues[:args.count // 100]
+    cases = [
+        ("insert", lambda: store.upsert(issues)),
+        ("upsert", lambda: store.upsert(issues)),
+        # As the scheduler calls it, with the deduplicator's fingerprints
+        ("upsert*", lambda: store.upsert(issues, fingerprints=fingerprints)),
+        ("touch", lambda: store.touch(fingerprints)),
+        ("cycle", lambda: (
+            store.upsert(changed, fingerprints=fingerprints[:len(changed)]),
+            store.touch(fingerprints[len(changed):]),
+        )),
+    ]
+    for label, case in cases:
+        started = time.perf_counter()
+        case()
+        elapsed = time.perf_counter() - started
+        print(f"{label:8s} {args.count} issues in {elapsed:.3f}s ({args.count / elapsed:,.0f}/s)")
+
+    for filters in ({"severity": "high"}, {"namespace": "ns-7"}, {"platform": "k8s"}):
+        started = time.perf_counter()
+        rows = store.query(filters, limit=100)
+        total = store.count(filters)
+        elapsed = time.perf_counter() - started
+        print(f"query {filters}: {len(rows)}/{total} rows in {elapsed * 1000:.1f}ms")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
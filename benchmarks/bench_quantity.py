@@ -0,0 +1,67 @@
+"""Microbenchmark for Kubernetes quantity parsing.
+
+Compares the memoized parser against the previous per-call implementation
+on a realistic mix of repeated quantity strings.
+
+Usage:
+    python benchmarks/bench_quantity.py [--count 200000]
+"""
+
+import argparse
+import random
+import timeit
+
+from src.detectors.k8s.quantity import _parse_milli, memo_info, parse_bytes, parse_cpu_cores
+
+QUANTITIES = [
+    "50m", "100m", "250m", "500m", "1", "2", "4",
+    "64Mi", "128Mi", "256Mi", "512Mi", "1Gi", "2Gi", "8Gi", "1.5Gi",
+]
+
+
+def legacy_parse_memory(memory_str: str) -> int:
+    """Previous PodResourceDetector._parse_memory, kept for comparison."""
+    memory_str = str(memory_str).strip()
+    multipliers = {
+        'Ki': 1024, 'Mi': 1024 ** 2, 'Gi': 1024 ** 3, 'Ti': 1024 ** 4,
+        'K': 1000, 'M': 1000 ** 2, 'G': 1000 ** 3, 'T': 1000 ** 4,
+    }
+    for suffix, multiplier in multipliers.items():
+        if memory_str.endswith(suffix):
+            return int(float(memory_str[:-len(suffix)]) * multiplier)
+    return int(float(memory_str))
+
+
+def legacy_parse_cpu(cpu_str: str) -> float:
+    """Previous PodResourceDetector._parse_cpu, kept for comparison."""
+    cpu_str = str(cpu_str).strip()
+    if cpu_str.endswith('m'):
+        return float(cpu_str[:-1]) / 1000.0
+    return float(cpu_str)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cpu = [rng.choice(QUANTITIES[:7]) for _ in range(args.count)]
+    memory = [rng.choice(QUANTITIES[7:]) for _ in range(args.count)]
+
+    cases = {
+        "legacy cpu": lambda: [legacy_parse_cpu(q) for q in cpu],
+        "legacy memory": lambda: [legacy_parse_memory(q) for q in memory],
+        "memoized cpu": lambda: [parse_cpu_cores(q) for q in cpu],
+        "memoized memory": lambda: [parse_bytes(q) for q in memory],
+    }
+
+    _parse_milli.cache_clear()
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=1, repeat=5))
+        print(f"{name:16s} {seconds * 1e9 / args.count:8.1f} ns/op")
+    print(f"memo: {memo_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Startup-time benchmark based on ``python -X importtime``.
+
+Imports the CLI modules in fresh interpreters, reports the median total import
+time and the slowest modules, and exits non-zero when the median exceeds the
+budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 500] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Same default as tests/unit/test_startup_time.py
+BUDGET_MS = float(os.environ.get("OPSAGENT_IMPORT_BUDGET_MS", "500"))
+
+CLI_MODULES = (
+    "src.main",
+    "src.core.detection_engine",
+    "src.detectors.base.encoding",
+    "src.detectors.k8s.pod_resources",
+)
+
+
+def profile(modules) -> Tuple[float, Dict[str, int]]:
+    """Return the total import time in ms and the cumulative µs per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    cumulative: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, module_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(module_us)
+        if not name.startswith("  "):
+            total_us += int(module_us)
+    return total_us / 1000, cumulative
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    totals: List[float] = []
+    slowest: Dict[str, int] = {}
+    for _ in range(args.runs):
+        total, cumulative = profile(CLI_MODULES)
+        totals.append(total)
+        slowest = cumulative
+
+    median = statistics.median(totals)
+    print(f"import time: median {median:.1f}ms over {args.runs} runs "
+          f"(min {min(totals):.1f}ms, max {max(totals):.1f}ms)")
+    print("\nslowest modules (cumulative, last run):")
+    for name, module_us in sorted(slowest.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {module_us / 1000:8.1f}ms  {name}")
+
+    if median > args.budget_ms:
+        print(f"\nFAIL: median {median:.1f}ms exceeds budget {args.budget_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
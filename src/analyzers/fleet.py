@@ -0,0 +1,388 @@
+"""Fleet-wide container resource analysis.
+
+``PodResourceDetector`` judges each container on its own against fixed
+thresholds. The analyzer instead looks at the whole fleet: requests and limits
+of every container are loaded into NumPy columns, and per-namespace and
+per-workload-class percentiles, interquartile-range outliers and limit/request
+ratios are computed with vectorized group operations. Containers are only
+visited one by one to build issues for the ones that stand out.
+
+NumPy comes with the ``analysis`` extra and is imported when a fleet is
+analyzed.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.detectors.base.detector import Issue, Platform, Severity
+from src.rules.base import ContainerFacts
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Request/limit columns, in cores and bytes
+METRICS = ("cpu_request", "memory_request", "cpu_limit", "memory_limit")
+
+MIB = 1024 * 1024
+
+
+class _Codes:
+    """Interns group names as dense integer codes."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.codes = array("q")
+
+    def append(self, name: str) -> None:
+        code = self.index.get(name)
+        if code is None:
+            code = self.index[name] = len(self.names)
+            self.names.append(name)
+        self.codes.append(code)
+
+
+class FleetColumns:
+    """Column store of container requests and limits, filled row by row.
+
+    Numeric columns are typed ``array.array`` buffers, so the analyzer maps
+    them into NumPy without copying element by element.
+    """
+
+    def __init__(self):
+        self.namespaces = _Codes()
+        self.classes = _Codes()
+        self.workloads: List[str] = []
+        self.containers: List[str] = []
+        self.values: Dict[str, array] = {metric: array("d") for metric in METRICS}
+
+    def __len__(self) -> int:
+        return len(self.containers)
+
+    def add(
+        self,
+        namespace: str,
+        workload_class: str,
+        workload: str,
+        container: str,
+        cpu_request: float = 0.0,
+        memory_request: float = 0,
+        cpu_limit: float = 0.0,
+        memory_limit: float = 0,
+    ) -> None:
+        """Add one container; a value of 0 means unset."""
+        self.namespaces.append(namespace or "")
+        self.classes.append(workload_class)
+        self.workloads.append(workload)
+        self.containers.append(container)
+        self.values["cpu_request"].append(cpu_request)
+        self.values["memory_request"].append(memory_request)
+        self.values["cpu_limit"].append(cpu_limit)
+        self.values["memory_limit"].append(memory_limit)
+
+    def add_workload(self, resource_type: str, workload: Any) -> None:
+        """Add every container of a workload object (client model or lean)."""
+        metadata = workload.metadata
+        pod_spec = workload.spec.template.spec
+        for container in (pod_spec.containers if pod_spec else None) or ():
+            facts = ContainerFacts(container)
+            self.add(
+                metadata.namespace, resource_type, metadata.name, facts.name,
+                facts.cpu_request, facts.memory_request, facts.cpu_limit, facts.memory_limit,
+            )
+
+
+@dataclass
+class GroupStats:
+    """Percentiles of every metric for each group (namespace or workload class)."""
+    names: List[str]
+    percentiles: Tuple[float, ...]
+    # metric -> number of containers that set it, per group
+    counts: Dict[str, "np.ndarray"] = field(default_factory=dict)
+    # metric -> array of shape (groups, len(percentiles)); NaN for empty groups
+    values: Dict[str, "np.ndarray"] = field(default_factory=dict)
+
+    def get(self, name: str, metric: str, percentile: float) -> Optional[float]:
+        """Return one percentile of one group, or None if unknown or empty."""
+        try:
+            value = self.values[metric][self.names.index(name), self.percentiles.index(percentile)]
+        except ValueError:
+            return None
+        return None if value != value else float(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for position, name in enumerate(self.names):
+            result[name] = {
+                metric: {
+                    "count": int(self.counts[metric][position]),
+                    **{
+                        f"p{percentile:g}": _to_float(self.values[metric][position, i])
+                        for i, percentile in enumerate(self.percentiles)
+                    },
+                }
+                for metric in self.values
+            }
+        return result
+
+
+@dataclass
+class FleetReport:
+    """Result of one fleet analysis."""
+    columns: FleetColumns
+    by_namespace: GroupStats
+    by_class: GroupStats
+    # metric -> per-container mask of requests far above the namespace's peers
+    outliers: Dict[str, "np.ndarray"]
+    # resource -> per-container limit/request ratio; NaN unless both are set
+    ratios: Dict[str, "np.ndarray"]
+    # resource -> per-container mask of ratios above max_limit_ratio
+    high_ratios: Dict[str, "np.ndarray"]
+    max_limit_ratio: float
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def issues(self, cluster: Optional[str] = None) -> List[Issue]:
+        """Build issues for outlier requests and oversized limit/request ratios."""
+        return list(self.iter_issues(cluster))
+
+    def iter_issues(self, cluster: Optional[str] = None) -> Iterator[Issue]:
+        """Yield the issues of :meth:`issues` one at a time.
+
+        Everything but the Issue objects is computed in bulk up front: values
+        are selected with the masks and formatted once per distinct value, and
+        namespace medians once per namespace.
+        """
+        import numpy as np
+
+        columns = self.columns
+        namespace_codes = np.frombuffer(columns.namespaces.codes, dtype=np.int64)
+        detected_at = datetime.utcnow()
+        p50 = self.by_namespace.percentiles.index(50)
+
+        for metric in ("cpu_request", "memory_request"):
+            rows = np.flatnonzero(self.outliers[metric])
+            values = np.frombuffer(columns.values[metric], dtype=np.float64)[rows]
+            codes = namespace_codes[rows]
+            medians = _format_many(metric, self.by_namespace.values[metric][:, p50])
+            title = f"{_label(metric)} far above namespace peers"
+            for i, value, code in zip(rows.tolist(), _format_many(metric, values), codes.tolist()):
+                namespace = columns.namespaces.names[code]
+                yield self._issue(
+                    i, cluster, namespace, detected_at,
+                    check=f"fleet_outlier_{metric}",
+                    title=title,
+                    description=(
+                        f"Container '{columns.containers[i]}' requests {value}, well above "
+                        f"the other containers in namespace '{namespace}' "
+                        f"(median {medians[code]})."
+                    ),
+                    current={metric: value},
+                    recommended={metric: medians[code]},
+                )
+
+        for resource in ("cpu", "memory"):
+            rows = np.flatnonzero(self.high_ratios[resource])
+            ratios = self.ratios[resource][rows]
+            title = f"{'CPU' if resource == 'cpu' else 'Memory'} limit far above request"
+            for i, ratio, rounded in zip(
+                rows.tolist(), ratios.tolist(), np.round(ratios, 2).tolist()
+            ):
+                yield self._issue(
+                    i, cluster, columns.namespaces.names[columns.namespaces.codes[i]], detected_at,
+                    check=f"limit_request_ratio_{resource}",
+                    title=title,
+                    description=(
+                        f"Container '{columns.containers[i]}' has a {resource} limit "
+                        f"{ratio:.1f}x its request; the node can be overcommitted "
+                        f"well beyond what the scheduler reserved."
+                    ),
+                    current={"ratio": rounded},
+                    recommended={"ratio": self.max_limit_ratio},
+                )
+
+    def _issue(
+        self, i, cluster, namespace, detected_at, check, title, description, current, recommended
+    ) -> Issue:
+        columns = self.columns
+        container = columns.containers[i]
+        return Issue(
+            platform=Platform.K8S,
+            resource_type=columns.classes.names[columns.classes.codes[i]],
+            resource_name=columns.workloads[i],
+            namespace=namespace,
+            cluster=cluster,
+            severity=Severity.LOW,
+            title=title,
+            description=description,
+            detected_at=detected_at,
+            current_value={"container": container, **current},
+            recommended_value=recommended,
+            check=check,
+            metadata={"container": container},
+        )
+
+
+class FleetAnalyzer:
+    """Vectorized percentile, outlier and ratio analysis over a FleetColumns.
+
+    A request is an outlier when it exceeds both ``Q3 + iqr_factor * IQR`` and
+    ``min_factor`` times the median of its namespace, and the namespace has at
+    least ``min_group_size`` containers setting that request. The median floor
+    keeps namespaces of near-identical containers (IQR close to 0) quiet. A
+    limit/request ratio above ``max_limit_ratio`` is reported as well.
+    """
+
+    def __init__(
+        self,
+        percentiles: Sequence[float] = (50, 90, 95, 99),
+        iqr_factor: float = 1.5,
+        min_factor: float = 2.0,
+        min_group_size: int = 5,
+        max_limit_ratio: float = 4.0,
+    ):
+        # Quartiles are always computed; outliers and recommendations need them
+        self.percentiles = tuple(sorted(set(percentiles) | {25, 50, 75}))
+        self.iqr_factor = iqr_factor
+        self.min_factor = min_factor
+        self.min_group_size = min_group_size
+        self.max_limit_ratio = max_limit_ratio
+
+    def analyze(self, columns: FleetColumns) -> FleetReport:
+        import numpy as np
+
+        values = {}
+        for metric in METRICS:
+            column = np.frombuffer(columns.values[metric], dtype=np.float64).copy()
+            # 0 means unset; keep it out of percentiles and ratios
+            column[column <= 0] = np.nan
+            values[metric] = column
+
+        namespace_codes = _codes_array(columns.namespaces)
+        class_codes = _codes_array(columns.classes)
+        # Sorting by value is shared by both groupings; NaN sorts last
+        orders = {
+            metric: np.argsort(column, kind="stable")[:np.count_nonzero(~np.isnan(column))]
+            for metric, column in values.items()
+        }
+        by_namespace = self._group_stats(columns.namespaces.names, namespace_codes, values, orders)
+        by_class = self._group_stats(columns.classes.names, class_codes, values, orders)
+
+        q1 = self.percentiles.index(25)
+        median = self.percentiles.index(50)
+        q3 = self.percentiles.index(75)
+        outliers = {}
+        for metric in ("cpu_request", "memory_request"):
+            stats = by_namespace.values[metric]
+            iqr = stats[:, q3] - stats[:, q1]
+            upper = np.maximum(
+                stats[:, q3] + self.iqr_factor * iqr, self.min_factor * stats[:, median]
+            )
+            large = by_namespace.counts[metric] >= self.min_group_size
+            with np.errstate(invalid="ignore"):
+                above = values[metric] > upper[namespace_codes]
+                outliers[metric] = above & large[namespace_codes]
+
+        ratios, high_ratios = {}, {}
+        for resource in ("cpu", "memory"):
+            ratio = values[f"{resource}_limit"] / values[f"{resource}_request"]
+            ratios[resource] = ratio
+            with np.errstate(invalid="ignore"):
+                high_ratios[resource] = ratio > self.max_limit_ratio
+
+        return FleetReport(
+            columns=columns,
+            by_namespace=by_namespace,
+            by_class=by_class,
+            outliers=outliers,
+            ratios=ratios,
+            high_ratios=high_ratios,
+            max_limit_ratio=self.max_limit_ratio,
+        )
+
+    def _group_stats(self, names, codes, values, orders) -> GroupStats:
+        stats = GroupStats(names=list(names), percentiles=self.percentiles)
+        for metric, column in values.items():
+            counts, percentiles = group_percentiles(
+                codes, column, len(names), self.percentiles, order=orders[metric]
+            )
+            stats.counts[metric] = counts
+            stats.values[metric] = percentiles
+        return stats
+
+
+def group_percentiles(
+    codes: "np.ndarray",
+    values: "np.ndarray",
+    groups: int,
+    percentiles: Sequence[float],
+    order: Optional["np.ndarray"] = None,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Percentiles of ``values`` per group code, ignoring NaN.
+
+    The values are laid out sorted by (group, value); each percentile is then
+    a linear interpolation between two positions inside its group's slice, as
+    ``numpy.percentile`` computes it. ``order`` may pass in the positions of
+    the non-NaN values in ascending value order, to share that sort between
+    groupings. Returns per-group counts and an array of shape
+    ``(groups, len(percentiles))``.
+    """
+    import numpy as np
+
+    if order is None:
+        order = np.argsort(values, kind="stable")[:np.count_nonzero(~np.isnan(values))]
+    # A stable sort by group keeps values ascending within each group
+    grouped = codes[order]
+    order = order[np.argsort(grouped, kind="stable")]
+    ordered = values[order]
+
+    counts = np.bincount(grouped, minlength=groups)
+    starts = np.cumsum(counts) - counts
+    result = np.full((groups, len(percentiles)), np.nan)
+
+    present = counts > 0
+    position = (counts[present, None] - 1) * (np.asarray(percentiles, dtype=np.float64) / 100.0)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, counts[present, None] - 1)
+    fraction = position - low
+    base = starts[present, None]
+    result[present] = ordered[base + low] * (1 - fraction) + ordered[base + high] * fraction
+    return counts, result
+
+
+def _codes_array(interned: _Codes) -> "np.ndarray":
+    import numpy as np
+
+    codes = np.frombuffer(interned.codes, dtype=np.int64)
+    # Stable sorts of 16-bit keys use radix sort
+    return codes.astype(np.uint16) if len(interned.names) <= 1 << 16 else codes
+
+
+def _label(metric: str) -> str:
+    return {"cpu_request": "CPU request", "memory_request": "Memory request"}[metric]
+
+
+def _format_many(metric: str, values: "np.ndarray") -> List[Optional[str]]:
+    """Format an array of values, each distinct value only once."""
+    import numpy as np
+
+    if not len(values):
+        return []
+    distinct, inverse = np.unique(values, return_inverse=True)
+    text = [_format(metric, value) for value in distinct.tolist()]
+    return [text[position] for position in inverse.tolist()]
+
+
+def _format(metric: str, value: float) -> Optional[str]:
+    if value != value:
+        return None
+    if metric.startswith("cpu"):
+        return f"{int(round(value * 1000))}m"
+    return f"{int(round(value / MIB))}Mi"
+
+
+def _to_float(value: float) -> Optional[float]:
+    return None if value != value else float(value)
@@ -0,0 +1,363 @@
+"""Usage-based right-sizing from a Prometheus-compatible metrics source.
+
+``UsageCollector`` pulls container CPU and memory usage with range queries
+against Prometheus (or Thanos, Mimir, or a Grafana datasource proxy). Queries
+are batched: one query covers a group of namespaces, long lookbacks are split
+into chunks below the server's point limit, and ``step`` downsamples the
+series server-side (``rate`` / ``max_over_time`` over each step, so spikes
+between points are kept). Samples land in a bounded buffer per workload
+container, and refreshes only fetch what is new since the previous one.
+
+Recommendations are the configured percentile (p95 by default) of the
+observed usage plus headroom.
+"""
+
+import asyncio
+import copy
+import math
+import re
+import time
+from array import array
+from contextlib import asynccontextmanager
+from operator import itemgetter
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus rejects range queries returning more than 11,000 points per series
+MAX_POINTS = 11000
+
+# Pod name suffixes added by workload controllers, most specific first:
+# Deployment (ReplicaSet hash + random), StatefulSet (ordinal), DaemonSet (random).
+# Generated suffixes use Kubernetes' vowel-free alphabet, so words in a
+# workload name ("node-exporter") are not mistaken for a hash.
+_SAFE = "[bcdfghjklmnpqrstvwxz2456789]"
+_POD_SUFFIXES = (
+    re.compile(rf"^(?P<workload>.+)-{_SAFE}{{6,10}}-{_SAFE}{{5}}$"),
+    re.compile(r"^(?P<workload>.+)-\d+$"),
+    re.compile(rf"^(?P<workload>.+)-{_SAFE}{{5}}$"),
+)
+
+MIB = 1024 * 1024
+
+# Smallest recommendations, so idle containers still get a usable request
+MIN_CPU_CORES = 0.01
+MIN_MEMORY_BYTES = 32 * MIB
+
+CPU = "cpu"
+MEMORY = "memory"
+
+
+class PrometheusError(RuntimeError):
+    """Raised when the metrics source rejects a query."""
+
+
+def workload_of(pod: str) -> str:
+    """Strip the controller-generated suffix from a pod name."""
+    for pattern in _POD_SUFFIXES:
+        match = pattern.match(pod)
+        if match:
+            return match.group("workload")
+    return pod
+
+
+class PrometheusClient:
+    """Minimal async client for the Prometheus HTTP query API.
+
+    Queries run on a session from ``session()``; queries of one session share
+    a connection pool, and concurrent sessions each get their own.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        bearer_token: Optional[str] = None,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = url.rstrip("/")
+        self._headers = {"Authorization": f"Bearer {bearer_token}"} if bearer_token else {}
+        self._timeout = timeout
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator["PrometheusClient"]:
+        """Yield a copy of this client with its own connection pool."""
+        session = copy.copy(self)
+        session._client = httpx.AsyncClient(
+            base_url=self.url,
+            headers=self._headers,
+            timeout=self._timeout,
+            transport=self._transport,
+        )
+        try:
+            yield session
+        finally:
+            await session._client.aclose()
+
+    async def query(self, promql: str, at: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Run an instant query and return its vector result."""
+        params = {"query": promql}
+        if at is not None:
+            params["time"] = f"{at:.3f}"
+        return await self._post("/api/v1/query", params)
+
+    async def query_range(
+        self, promql: str, start: float, end: float, step: int
+    ) -> List[Dict[str, Any]]:
+        """Run a range query, split into chunks below ``MAX_POINTS`` per series.
+
+        Series of all chunks are merged by their label set.
+        """
+        series: Dict[Tuple[Tuple[str, str], ...], Dict[str, Any]] = {}
+        span = step * (MAX_POINTS - 1)
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(end, chunk_start + span)
+            result = await self._post("/api/v1/query_range", {
+                "query": promql,
+                "start": f"{chunk_start:.3f}",
+                "end": f"{chunk_end:.3f}",
+                "step": str(step),
+            })
+            for item in result:
+                key = tuple(sorted(item["metric"].items()))
+                merged = series.setdefault(key, {"metric": item["metric"], "values": []})
+                merged["values"].extend(item.get("values") or ())
+            chunk_start = chunk_end + step
+        return list(series.values())
+
+    async def _post(self, path: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if self._client is None:
+            raise RuntimeError("PrometheusClient used outside 'async with client.session()'")
+        # Form-encoded POST keeps long namespace matchers out of the URL
+        response = await self._client.post(path, data=params)
+        try:
+            body = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise PrometheusError(f"Invalid response from {path}")
+        if body.get("status") != "success":
+            error_type = body.get("errorType", "error")
+            raise PrometheusError(f"{error_type}: {body.get('error', response.text)}")
+        return body["data"]["result"]
+
+
+class UsageSeries:
+    """Bounded buffers of one workload container's usage samples, oldest first.
+
+    Samples are stored as packed doubles (8 bytes each instead of a pointer
+    plus a float object), so a week of 5-minute samples for CPU and memory
+    takes about 32KB per container.
+    """
+
+    __slots__ = ("cpu", "memory", "max_samples", "last_seen")
+
+    def __init__(self, max_samples: int):
+        self.cpu = array("d")
+        self.memory = array("d")
+        self.max_samples = max_samples
+        self.last_seen = 0.0
+
+    def extend(self, resource: str, samples: List[Tuple[float, float]]) -> None:
+        """Append ``(timestamp, value)`` samples in time order, dropping the oldest."""
+        if not samples:
+            return
+        buffer = getattr(self, resource)
+        buffer.extend(value for _, value in samples)
+        excess = len(buffer) - self.max_samples
+        if excess > 0:
+            del buffer[:excess]
+        self.last_seen = max(self.last_seen, samples[-1][0])
+
+    def percentile(self, resource: str, percentile: float) -> Optional[float]:
+        """Nearest-rank percentile of the buffered samples, or None when empty."""
+        samples = sorted(getattr(self, resource))
+        if not samples:
+            return None
+        rank = max(1, math.ceil(percentile / 100.0 * len(samples)))
+        return samples[rank - 1]
+
+
+class UsageCollector:
+    """Collects container usage for one cluster and derives request recommendations."""
+
+    SELECTOR = 'container!="",container!="POD"'
+    NAMESPACES_QUERY = "count by (namespace) (container_memory_working_set_bytes{{{selector}}})"
+    QUERIES = {
+        CPU: (
+            "sum by (namespace, pod, container) "
+            "(rate(container_cpu_usage_seconds_total{{{selector}}}[{window}s]))"
+        ),
+        MEMORY: (
+            "max by (namespace, pod, container) "
+            "(max_over_time(container_memory_working_set_bytes{{{selector}}}[{window}s]))"
+        ),
+    }
+
+    def __init__(
+        self,
+        source,
+        cluster: Optional[str] = None,
+        grafana=None,
+        client: Optional[PrometheusClient] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.source = source
+        self.cluster = cluster
+        self._client = client or self._build_client(source, grafana)
+        self._clock = clock
+        self._series: Dict[Tuple[str, str, str], UsageSeries] = {}
+        self._last_end: Optional[float] = None
+        # Refreshes (e.g. a scheduled run and an export) take turns, so each one
+        # starts where the previous one ended and no samples are ingested twice
+        self._refresh_lock = asyncio.Lock()
+
+    @staticmethod
+    def _build_client(source, grafana) -> PrometheusClient:
+        if source.url:
+            return PrometheusClient(source.url, source.bearer_token, source.timeout)
+        if grafana is not None and grafana.url and source.grafana_datasource_uid:
+            # Query through Grafana's datasource proxy with the Grafana API key
+            url = (
+                f"{grafana.url.rstrip('/')}/api/datasources/proxy/uid/"
+                f"{source.grafana_datasource_uid}"
+            )
+            return PrometheusClient(url, source.bearer_token or grafana.api_key, source.timeout)
+        raise ValueError("metrics_source needs a url or grafana.url with grafana_datasource_uid")
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    async def refresh(self, owns_namespace: Callable[[str], bool] = lambda namespace: True) -> None:
+        """Fetch usage since the previous refresh for every owned namespace.
+
+        Concurrent calls run one after another.
+        """
+        async with self._refresh_lock:
+            source = self.source
+            end = self._clock()
+            start = end - source.lookback
+            if self._last_end is not None:
+                start = max(start, self._last_end + source.step)
+            if start > end:
+                return
+
+            async with self._client.session() as client:
+                namespaces = await self._fetch(client, start, end, owns_namespace)
+            self._last_end = end
+            self._evict(end - source.lookback)
+        logger.info(
+            "Usage refreshed",
+            cluster=self.cluster,
+            namespaces=len(namespaces),
+            containers=len(self._series)
+        )
+
+    async def _fetch(
+        self, client: PrometheusClient, start: float, end: float, owns_namespace
+    ) -> List[str]:
+        source = self.source
+        base = self._selector()
+        listed = await client.query(self.NAMESPACES_QUERY.format(selector=base), at=end)
+        namespaces = sorted(
+            item["metric"]["namespace"]
+            for item in listed
+            if item["metric"].get("namespace") and owns_namespace(item["metric"]["namespace"])
+        )
+
+        window = max(source.step, 60)
+        semaphore = asyncio.Semaphore(source.max_concurrency)
+        batches = [
+            namespaces[i:i + source.namespaces_per_query]
+            for i in range(0, len(namespaces), source.namespaces_per_query)
+        ]
+
+        async def fetch(resource: str, batch: List[str]) -> None:
+            selector = f'{base},namespace=~"{"|".join(batch)}"'
+            promql = self.QUERIES[resource].format(selector=selector, window=window)
+            async with semaphore:
+                result = await client.query_range(promql, start, end, source.step)
+            self._ingest(resource, result)
+
+        await asyncio.gather(*(
+            fetch(resource, batch) for resource in self.QUERIES for batch in batches
+        ))
+        return namespaces
+
+    def recommend(self, namespace: str, workload: str, container: str) -> Optional[Dict[str, Any]]:
+        """Return usage-based requests and limits, or None without enough samples.
+
+        Each resource falls back to None on its own when it has fewer than
+        ``min_samples`` samples.
+        """
+        series = self._series.get((namespace, workload, container))
+        if series is None:
+            return None
+
+        source = self.source
+        usage, requests, limits = {}, {}, {}
+        # Rounded up (10m, 1Mi) so small usage changes keep the same value;
+        # limits stay at twice the request like the static recommendation
+        if len(series.cpu) >= source.min_samples:
+            usage[CPU] = series.percentile(CPU, source.percentile)
+            millicores = math.ceil(max(usage[CPU] * source.headroom, MIN_CPU_CORES) * 100) * 10
+            requests[CPU] = f"{millicores}m"
+            limits[CPU] = f"{millicores * 2}m"
+        if len(series.memory) >= source.min_samples:
+            usage[MEMORY] = series.percentile(MEMORY, source.percentile)
+            mebibytes = math.ceil(max(usage[MEMORY] * source.headroom, MIN_MEMORY_BYTES) / MIB)
+            requests[MEMORY] = f"{mebibytes}Mi"
+            limits[MEMORY] = f"{mebibytes * 2}Mi"
+        if not requests:
+            return None
+        return {
+            "requests": requests,
+            "limits": limits,
+            "usage": usage,
+            "percentile": source.percentile,
+            "samples": {CPU: len(series.cpu), MEMORY: len(series.memory)},
+        }
+
+    def _selector(self) -> str:
+        selector = self.SELECTOR
+        if self.source.cluster_label and self.cluster:
+            selector += f',{self.source.cluster_label}="{self.cluster}"'
+        return selector
+
+    def _ingest(self, resource: str, result: Iterable[Dict[str, Any]]) -> None:
+        """Add one query's samples, merged by timestamp across the pods of a workload.
+
+        Without the merge, the bounded buffer would drop whole pods' history
+        (everything of the first pod listed) instead of the oldest samples.
+        """
+        merged: Dict[Tuple[str, str, str], List[Tuple[float, float]]] = {}
+        for item in result:
+            metric = item["metric"]
+            key = (
+                metric.get("namespace", ""),
+                workload_of(metric.get("pod", "")),
+                metric.get("container", ""),
+            )
+            samples = merged.setdefault(key, [])
+            for timestamp, value in item.get("values") or ():
+                value = float(value)
+                if value == value:  # Skip NaN
+                    samples.append((float(timestamp), value))
+
+        for key, samples in merged.items():
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = UsageSeries(self.source.max_samples)
+            samples.sort(key=itemgetter(0))
+            series.extend(resource, samples)
+
+    def _evict(self, cutoff: float) -> None:
+        """Drop containers without samples inside the lookback window."""
+        stale = [key for key, series in self._series.items() if series.last_seen < cutoff]
+        for key in stale:
+            del self._series[key]
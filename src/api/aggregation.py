@@ -0,0 +1,159 @@
+"""Merged reads across sharded replicas.
+
+With sharding every replica detects, stores and publishes only its own shard
+of the issues, while the Service in front of them routes each request to an
+arbitrary replica. ``ShardAggregator`` lets any replica answer for all of
+them: it polls every peer's ``/shard/issues`` (conditional on the peer's
+snapshot version, so an unchanged peer costs a 304) and publishes the local
+and peer issues as one merged snapshot. Replicas that see the same issues
+build the same snapshot version, so ETags and cursors carry over from one
+replica to the next. History queries fan out to every replica and merge the
+pages on their keyset, ``(first_seen, fingerprint)``.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import structlog
+
+from src.api.snapshot import IssueSnapshot
+from src.utils.serialization import loads
+
+logger = structlog.get_logger(__name__)
+
+
+class PeerUnavailable(RuntimeError):
+    """Raised when a replica needed for a merged history page cannot be reached."""
+
+
+class ShardAggregator:
+    """Keeps a snapshot of every replica's open issues up to date.
+
+    A peer that cannot be reached keeps contributing the issues it last
+    returned until it leaves the membership, so a slow replica does not make
+    its issues flicker out of the merged view.
+    """
+
+    def __init__(
+        self,
+        membership,
+        local: IssueSnapshot,
+        merged: IssueSnapshot,
+        issue_store=None,
+        interval: float = 5.0,
+        timeout: float = 5.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.membership = membership
+        self.local = local
+        self.merged = merged
+        self.issue_store = issue_store
+        self.interval = interval
+        self._timeout = timeout
+        self._transport = transport
+        # identity -> (ETag of the peer's last response, its issues)
+        self._peer_issues: Dict[str, Tuple[Optional[str], List[Dict[str, Any]]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Build the merged snapshot and keep refreshing it in the background."""
+        self._task = asyncio.create_task(self._run(), name="shard-aggregator")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def refresh(self) -> None:
+        """Fetch changed peer issues and republish the merged snapshot."""
+        peers = self.membership.peers
+        for identity in set(self._peer_issues) - set(peers):
+            del self._peer_issues[identity]
+
+        if peers:
+            async with self._client() as client:
+                await asyncio.gather(*(
+                    self._fetch_issues(client, identity, url) for identity, url in peers.items()
+                ))
+
+        # Merged in identity order, so every replica resolves an issue reported
+        # by two replicas (mid-rebalance) the same way and builds the same version
+        sources = {identity: items for identity, (_, items) in self._peer_issues.items()}
+        sources[self.membership.identity] = self.local.items()
+        merged: Dict[str, Dict[str, Any]] = {}
+        for identity in sorted(sources):
+            for item in sources[identity]:
+                merged[item["fingerprint"]] = item
+        await asyncio.to_thread(self.merged.publish_items, merged.values())
+
+    async def history(
+        self,
+        filters: Dict[str, Any],
+        active_only: bool,
+        after: Optional[Tuple[float, str]],
+        cursor: Optional[str],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Return one history page merged from this replica's store and every peer's.
+
+        Each replica returns up to ``limit`` rows after the cursor, so the
+        first ``limit`` rows of the union are the merged page.
+        """
+        params = {name: value for name, value in filters.items() if value is not None}
+        params["include_resolved"] = str(not active_only).lower()
+        params["limit"] = limit
+        if cursor:
+            params["cursor"] = cursor
+
+        local = asyncio.to_thread(self.issue_store.query, filters, active_only, after, limit)
+        peers = self.membership.peers
+        async with self._client() as client:
+            pages = await asyncio.gather(local, *(
+                self._fetch_history(client, identity, url, params)
+                for identity, url in peers.items()
+            ))
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        for page in pages:
+            for row in page:
+                rows[row["fingerprint"]] = row
+        ordered = sorted(rows.values(), key=lambda row: (row["first_seen"], row["fingerprint"]))
+        return ordered[:limit]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Shard aggregation failed", error=str(e), exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self._timeout, transport=self._transport)
+
+    async def _fetch_issues(self, client: httpx.AsyncClient, identity: str, url: str) -> None:
+        etag, _ = self._peer_issues.get(identity, (None, []))
+        headers = {"If-None-Match": etag} if etag else {}
+        try:
+            response = await client.get(f"{url}/shard/issues", headers=headers)
+            if response.status_code == 304:
+                return
+            response.raise_for_status()
+            items = loads(response.content)["items"]
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning("Failed to fetch peer issues", peer=identity, url=url, error=str(e))
+            return
+        self._peer_issues[identity] = (response.headers.get("ETag"), items)
+
+    async def _fetch_history(
+        self, client: httpx.AsyncClient, identity: str, url: str, params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        try:
+            response = await client.get(f"{url}/shard/history", params=params)
+            response.raise_for_status()
+            return loads(response.content)["items"]
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            # A page without one replica's rows would silently skip them for good
+            raise PeerUnavailable(f"Replica {identity} unavailable: {e}") from e
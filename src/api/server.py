@@ -1,19 +1,49 @@
 """FastAPI server for OpsAgent API."""
 
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+import asyncio
+import base64
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 import structlog
 
+from src.api.aggregation import PeerUnavailable
+from src.api.snapshot import InvalidQuery, IssueSnapshot
+from src.detectors.base.encoding import encode_ndjson
+from src.metrics.prometheus import render_latest
+from src.utils.serialization import dumps
+
 logger = structlog.get_logger(__name__)
 
 
-def create_app(config) -> FastAPI:
-    """Create and configure FastAPI application."""
+def create_app(
+    config,
+    snapshot: Optional[IssueSnapshot] = None,
+    issue_store=None,
+    detection_engine=None,
+    aggregator=None,
+) -> FastAPI:
+    """Create and configure FastAPI application.
+
+    ``/issues`` serves the open issues from ``snapshot``, which the scheduler
+    republishes after each detection run. ``/issues/history`` queries
+    ``issue_store`` when persistence is enabled, and ``/issues/export`` runs
+    ``detection_engine`` and streams the results as NDJSON, one export at a
+    time.
+
+    With sharding, ``aggregator`` (a ``ShardAggregator``) keeps ``snapshot``
+    merged across replicas and fans history queries out to them; the
+    ``/shard/*`` endpoints serve this replica's own shard to its peers.
+    """
     app = FastAPI(
         title="Multi-Cloud OpsAgent",
         description="Intelligent AIOps for Kubernetes, AWS, and Azure",
         version="0.1.0",
     )
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    snapshot = snapshot if snapshot is not None else IssueSnapshot()
 
     @app.get("/")
     async def root():
@@ -23,10 +53,180 @@ def create_app(config) -> FastAPI:
     async def health():
         return {"status": "healthy"}
 
-    @app.get("/metrics")
-    async def metrics():
-        # TODO: Return Prometheus metrics
-        return JSONResponse(content={"metrics": "not_implemented"})
+    @app.get("/issues")
+    async def list_issues(
+        request: Request,
+        severity: Optional[str] = None,
+        platform: Optional[str] = None,
+        namespace: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=1000),
+    ):
+        query: Dict[str, Any] = {
+            "filters": {
+                "severity": severity,
+                "platform": platform,
+                "namespace": namespace,
+                "resource_type": resource_type,
+            },
+            "fields": [name for name in fields.split(",") if name] if fields else None,
+            "cursor": cursor,
+            "limit": limit,
+        }
+
+        etag = snapshot.etag(**query)
+        if etag in _parse_etags(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        try:
+            body, etag = snapshot.page(**query)
+        except InvalidQuery as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
+        )
+
+    if detection_engine is not None:
+        # Each export is a full live scan, so only one runs at a time
+        export_lock = asyncio.Lock()
+
+        @app.get("/issues/export")
+        async def export_issues():
+            if export_lock.locked():
+                raise HTTPException(
+                    status_code=429,
+                    detail="An export is already running",
+                    headers={"Retry-After": "30"},
+                )
+            await export_lock.acquire()
+
+            async def body():
+                async for batch in detection_engine.stream_detection():
+                    yield encode_ndjson(batch)
+
+            return _LockedStreamingResponse(
+                body(), lock=export_lock, media_type="application/x-ndjson"
+            )
+
+    if issue_store is not None:
+        @app.get("/issues/history")
+        async def issue_history(
+            severity: Optional[str] = None,
+            platform: Optional[str] = None,
+            namespace: Optional[str] = None,
+            resource_type: Optional[str] = None,
+            include_resolved: bool = True,
+            cursor: Optional[str] = None,
+            limit: int = Query(100, ge=1, le=1000),
+        ):
+            filters = {
+                "severity": severity,
+                "platform": platform,
+                "namespace": namespace,
+                "resource_type": resource_type,
+            }
+            after = _decode_history_cursor(cursor) if cursor else None
+            if aggregator is None:
+                rows = await asyncio.to_thread(
+                    issue_store.query, filters, not include_resolved, after, limit
+                )
+            else:
+                try:
+                    rows = await aggregator.history(
+                        filters, not include_resolved, after, cursor, limit
+                    )
+                except PeerUnavailable as e:
+                    raise HTTPException(status_code=503, detail=str(e))
+            return _history_response(rows, limit)
+
+    if aggregator is not None:
+        local = aggregator.local
+
+        @app.get("/shard/issues")
+        async def shard_issues(request: Request):
+            etag = f'"{local.version}"'
+            if etag in _parse_etags(request.headers.get("if-none-match")):
+                return Response(status_code=304, headers={"ETag": etag})
+            return Response(
+                content=dumps({"items": local.items()}),
+                media_type="application/json",
+                headers={"ETag": etag},
+            )
+
+        if issue_store is not None:
+            @app.get("/shard/history")
+            async def shard_history(
+                severity: Optional[str] = None,
+                platform: Optional[str] = None,
+                namespace: Optional[str] = None,
+                resource_type: Optional[str] = None,
+                include_resolved: bool = True,
+                cursor: Optional[str] = None,
+                limit: int = Query(100, ge=1, le=1000),
+            ):
+                filters = {
+                    "severity": severity,
+                    "platform": platform,
+                    "namespace": namespace,
+                    "resource_type": resource_type,
+                }
+                after = _decode_history_cursor(cursor) if cursor else None
+                rows = await asyncio.to_thread(
+                    issue_store.query, filters, not include_resolved, after, limit
+                )
+                return _history_response(rows, limit)
+
+    if config.metrics.enabled:
+        @app.get(config.metrics.path)
+        async def metrics():
+            payload, content_type = render_latest()
+            return Response(content=payload, media_type=content_type)
 
     logger.info("FastAPI application created")
     return app
+
+
+class _LockedStreamingResponse(StreamingResponse):
+    """Releases ``lock`` once the response ends, even if the client disconnects."""
+
+    def __init__(self, content, lock: asyncio.Lock, **kwargs):
+        super().__init__(content, **kwargs)
+        self._lock = lock
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._lock.release()
+
+
+def _parse_etags(header: Optional[str]) -> set:
+    """Split an If-None-Match header into its entity tags."""
+    if not header:
+        return set()
+    return {tag.strip() for tag in header.split(",")}
+
+
+def _history_response(rows, limit: int) -> Response:
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = base64.urlsafe_b64encode(
+            f"{last['first_seen']!r}:{last['fingerprint']}".encode()
+        ).decode()
+    return Response(
+        content=dumps({"items": rows, "next_cursor": next_cursor}),
+        media_type="application/json",
+    )
+
+
+def _decode_history_cursor(cursor: str):
+    try:
+        first_seen, fingerprint = base64.urlsafe_b64decode(cursor.encode()).decode().split(":", 1)
+        return float(first_seen), fingerprint
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
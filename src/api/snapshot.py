@@ -0,0 +1,205 @@
+"""Precomputed, read-optimized view of the open issues served by the API."""
+
+import base64
+import bisect
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.detectors.base.detector import Issue, Severity
+from src.utils.cache import LRUCache
+from src.utils.serialization import dumps
+
+# Fields a client may filter on
+FILTER_FIELDS = ("severity", "platform", "namespace", "resource_type")
+
+# Fields of Issue.to_dict() that may be projected with ``fields``
+ISSUE_FIELDS = (
+    "id", "fingerprint", "check", "platform", "resource_type", "resource_name",
+    "severity", "title", "description", "detected_at", "namespace", "cluster",
+    "region", "tags", "auto_fixable", "current_value", "recommended_value", "metadata",
+)
+
+# Most severe first
+_SEVERITY_RANK = {severity.value: rank for rank, severity in enumerate(reversed(list(Severity)))}
+
+
+class InvalidQuery(ValueError):
+    """Raised for an unknown field or a malformed cursor."""
+
+
+@dataclass(frozen=True)
+class _View:
+    version: str
+    keys: List[Tuple[int, str]]
+    items: List[Dict[str, Any]]
+    # field -> value -> sorted positions into ``items``
+    index: Dict[str, Dict[Any, List[int]]] = field(default_factory=dict)
+
+
+def _sort_key(item: Dict[str, Any]) -> Tuple[int, str]:
+    return _SEVERITY_RANK.get(item["severity"], len(_SEVERITY_RANK)), item["fingerprint"]
+
+
+class IssueSnapshot:
+    """Immutable snapshot of the open issues, swapped atomically on publish.
+
+    Issues are converted to dicts, sorted (most severe first, then by
+    fingerprint) and indexed by every filter field once per publish, so a
+    request only slices and encodes one page. Encoded pages are cached per
+    snapshot version, and the version doubles as the ETag, so clients polling
+    an unchanged snapshot get a 304 without any serialization.
+    """
+
+    def __init__(self, page_cache_size: int = 256):
+        self._view = self._build([])
+        self._pages = LRUCache(page_cache_size)
+        self._publish_lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        return self._view.version
+
+    def __len__(self) -> int:
+        return len(self._view.items)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Return the open issues as dicts, in snapshot order."""
+        return self._view.items
+
+    def publish(self, issues: Iterable[Issue]) -> bool:
+        """Replace the snapshot; returns False when the content is unchanged."""
+        return self.publish_items(issue.to_dict() for issue in issues)
+
+    def publish_items(self, items: Iterable[Dict[str, Any]]) -> bool:
+        """Like :meth:`publish`, for issues already converted with ``to_dict()``."""
+        view = self._build(items)
+        with self._publish_lock:
+            if view.version == self._view.version:
+                return False
+            self._view = view
+            self._pages.clear()
+        return True
+
+    def etag(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> str:
+        """ETag of one query's response against the current snapshot."""
+        return self._etag(self._view.version, self._query(filters, fields, cursor, limit))
+
+    def page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[bytes, str]:
+        """Return one encoded page of issues and its ETag."""
+        view = self._view
+        query = self._query(filters, fields, cursor, limit)
+        filters = dict(query[0])
+        etag = self._etag(view.version, query)
+
+        cache_key = (view.version, query)
+        cached = self._pages.get(cache_key)
+        if cached is not None:
+            return cached, etag
+
+        unknown = set(fields or ()) - set(ISSUE_FIELDS)
+        if unknown:
+            raise InvalidQuery(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        positions = self._match(view, filters)
+        start = 0
+        if cursor:
+            after = self._decode_cursor(cursor)
+            if positions is None:
+                start = bisect.bisect_right(view.keys, after)
+            else:
+                start = bisect.bisect_right(positions, after, key=view.keys.__getitem__)
+
+        total = len(view.items) if positions is None else len(positions)
+        window = range(start, min(start + limit, total))
+        if positions is None:
+            selected = [view.items[i] for i in window]
+        else:
+            selected = [view.items[positions[i]] for i in window]
+
+        next_cursor = None
+        if window and window[-1] + 1 < total:
+            next_cursor = self._encode_cursor(_sort_key(selected[-1]))
+
+        if fields:
+            selected = [{name: item.get(name) for name in fields} for item in selected]
+
+        body = dumps({
+            "items": selected,
+            "total": total,
+            "next_cursor": next_cursor,
+            "version": view.version,
+        })
+        self._pages.put(cache_key, body)
+        return body, etag
+
+    @staticmethod
+    def _query(filters, fields, cursor, limit) -> Tuple[Any, ...]:
+        """Canonical, hashable form of a request."""
+        filters = tuple(sorted((k, v) for k, v in (filters or {}).items() if v is not None))
+        return filters, tuple(fields or ()), cursor, limit
+
+    @staticmethod
+    def _build(items: Iterable[Dict[str, Any]]) -> _View:
+        items = sorted(items, key=_sort_key)
+        keys = [_sort_key(item) for item in items]
+
+        digest = hashlib.blake2b(digest_size=16)
+        for issue in items:
+            digest.update(issue["fingerprint"].encode())
+            digest.update(dumps([issue["severity"], issue["title"],
+                                 issue["current_value"], issue["recommended_value"]]))
+
+        index: Dict[str, Dict[Any, List[int]]] = {name: {} for name in FILTER_FIELDS}
+        for position, item in enumerate(items):
+            for name in FILTER_FIELDS:
+                index[name].setdefault(item.get(name), []).append(position)
+
+        return _View(version=digest.hexdigest(), keys=keys, items=items, index=index)
+
+    @staticmethod
+    def _match(view: _View, filters: Dict[str, Any]) -> Optional[List[int]]:
+        """Return matching positions in snapshot order, or None for no filter."""
+        if not filters:
+            return None
+        candidates = []
+        for name, value in filters.items():
+            if name not in FILTER_FIELDS:
+                raise InvalidQuery(f"Unsupported filter: {name}")
+            candidates.append(view.index[name].get(value, []))
+        candidates.sort(key=len)
+        positions = candidates[0]
+        for other in candidates[1:]:
+            allowed = set(other)
+            positions = [p for p in positions if p in allowed]
+        return positions
+
+    @staticmethod
+    def _etag(version: str, query: Tuple[Any, ...]) -> str:
+        digest = hashlib.blake2b(repr(query).encode(), digest_size=8).hexdigest()
+        return f'W/"{version}-{digest}"'
+
+    @staticmethod
+    def _encode_cursor(key: Tuple[int, str]) -> str:
+        return base64.urlsafe_b64encode(f"{key[0]}:{key[1]}".encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[int, str]:
+        try:
+            rank, fingerprint = base64.urlsafe_b64decode(cursor.encode()).decode().split(":", 1)
+            return int(rank), fingerprint
+        except ValueError as e:
+            raise InvalidQuery(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,155 @@
+"""Cross-cycle issue deduplication."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+from src.detectors.base.detector import Issue
+from src.metrics import prometheus as metrics
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class IssueDelta:
+    """What changed between two runs of the same detector."""
+    new: List[Issue] = field(default_factory=list)
+    changed: List[Issue] = field(default_factory=list)
+    unchanged: List[Issue] = field(default_factory=list)
+    resolved: List[Issue] = field(default_factory=list)
+    # Fingerprint of each issue above, keyed by list, in the same order, so
+    # consumers such as the issue store do not hash them again
+    fingerprints: Dict[str, List[str]] = field(default_factory=lambda: {
+        "new": [], "changed": [], "unchanged": [], "resolved": [],
+    })
+
+    @property
+    def actionable(self) -> List[Issue]:
+        """Issues that need remediation: new or changed since the last run."""
+        return self.new + self.changed
+
+    @property
+    def actionable_fingerprints(self) -> List[str]:
+        return self.fingerprints["new"] + self.fingerprints["changed"]
+
+
+@dataclass
+class _Entry:
+    issue: Issue
+    digest: str
+    scope: str
+    last_seen: float
+
+
+class IssueDeduplicator:
+    """In-memory index of open issues keyed by fingerprint.
+
+    Each detector reports into its own scope. An issue is *new* the first time
+    its fingerprint is seen, *changed* when its severity, title or values differ
+    from the previous report, and *resolved* when a complete run of the same
+    scope no longer reports it. Entries not seen for ``ttl`` seconds are evicted,
+    so they count as new again if they reappear.
+    """
+
+    def __init__(self, ttl: float = 86400, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[str, _Entry] = {}
+        self._scopes: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, scope: str, issues: List[Issue], complete: bool = True) -> IssueDelta:
+        """Record one run's issues for a scope and return the delta.
+
+        Pass ``complete=False`` when the run failed or timed out, so missing
+        issues are not mistaken for resolved ones.
+        """
+        now = self._clock()
+        self._evict(now)
+
+        delta = IssueDelta()
+        seen: Set[str] = set()
+        for issue in issues:
+            fingerprint = issue.fingerprint
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+
+            digest = issue.content_digest()
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                kind = "new"
+            elif entry.digest != digest:
+                kind = "changed"
+            else:
+                kind = "unchanged"
+            if entry is not None and entry.scope != scope:
+                # Moved here, e.g. restored without a scope; the old scope must
+                # not resolve it or keep it open
+                self._scopes.get(entry.scope, set()).discard(fingerprint)
+            getattr(delta, kind).append(issue)
+            delta.fingerprints[kind].append(fingerprint)
+            self._entries[fingerprint] = _Entry(issue, digest, scope, now)
+
+        previous = self._scopes.get(scope, set())
+        if complete:
+            for fingerprint in previous - seen:
+                entry = self._entries.pop(fingerprint, None)
+                if entry is not None:
+                    delta.resolved.append(entry.issue)
+                    delta.fingerprints["resolved"].append(fingerprint)
+            self._scopes[scope] = seen
+        else:
+            self._scopes[scope] = previous | seen
+
+        metrics.ISSUE_CHANGES.labels("new").inc(len(delta.new))
+        metrics.ISSUE_CHANGES.labels("changed").inc(len(delta.changed))
+        metrics.ISSUE_CHANGES.labels("resolved").inc(len(delta.resolved))
+        metrics.OPEN_ISSUES.set(len(self._entries))
+
+        logger.info(
+            "Issues deduplicated",
+            scope=scope,
+            new=len(delta.new),
+            changed=len(delta.changed),
+            unchanged=len(delta.unchanged),
+            resolved=len(delta.resolved)
+        )
+        return delta
+
+    def restore(self, issues: Iterable[Tuple[Optional[str], Issue]]) -> None:
+        """Seed the index with ``(scope, issue)`` pairs still open from before a restart.
+
+        Restored issues count as unchanged when they are reported again, so a
+        restart does not send every open issue to remediation a second time.
+        A pair without a scope joins one when it is next reported.
+        """
+        now = self._clock()
+        for scope, issue in issues:
+            fingerprint = issue.fingerprint
+            scope = scope or ""
+            self._entries[fingerprint] = _Entry(issue, issue.content_digest(), scope, now)
+            self._scopes.setdefault(scope, set()).add(fingerprint)
+        metrics.OPEN_ISSUES.set(len(self._entries))
+        logger.info("Restored open issues", count=len(self._entries))
+
+    def active(self) -> List[Issue]:
+        """Return the latest version of every open issue."""
+        return [entry.issue for entry in self._entries.values()]
+
+    def _evict(self, now: float) -> None:
+        expired = [
+            fingerprint for fingerprint, entry in self._entries.items()
+            if now - entry.last_seen > self.ttl
+        ]
+        for fingerprint in expired:
+            entry = self._entries.pop(fingerprint)
+            scope = self._scopes.get(entry.scope)
+            if scope is not None:
+                scope.discard(fingerprint)
+        if expired:
+            logger.debug("Evicted stale issues", count=len(expired))
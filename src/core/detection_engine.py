@@ -1,10 +1,13 @@
 """Core detection engine that orchestrates all platform detectors."""
 
-from typing import List
-import structlog
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Set, Tuple
 
-from src.detectors.base.detector import Issue
+import structlog
 
+from src.detectors.base.detector import IncompleteDetection, Issue
+from src.metrics import prometheus as metrics
 
 logger = structlog.get_logger(__name__)
 
@@ -12,10 +15,26 @@ logger = structlog.get_logger(__name__)
 class DetectionEngine:
     """Orchestrates detection across all platforms."""
 
-    def __init__(self, config):
+    def __init__(self, config, full_concurrency: bool = False, shard=None):
         self.config = config
         self.logger = structlog.get_logger(__name__)
         self.detectors = self._initialize_detectors()
+        # With sharding, replicas split the work: namespace-aware detectors
+        # filter per namespace, every other detector is owned as a whole
+        self.shard = shard
+        if shard is not None and shard.granularity == "namespace":
+            for detector in self.detectors:
+                if detector.shard_by_namespace:
+                    detector.shard = shard
+        self._tasks: Set[asyncio.Task] = set()
+        # Outcome of each detector's latest run: "ok", "skipped", "partial",
+        # "timeout" or "error"
+        self.last_outcome: Dict[str, str] = {}
+        # One-shot scans run every detector at once instead of parallel_workers
+        self.workers = max(1, config.detection.parallel_workers)
+        if full_concurrency:
+            self.workers = max(1, len(self.detectors))
+        self._semaphore = asyncio.Semaphore(self.workers)
 
     def _initialize_detectors(self):
         """Initialize all enabled detectors."""
@@ -28,15 +47,22 @@ class DetectionEngine:
             azure_enabled=self.config.azure.enabled
         )
 
-        # K8s detectors
-        # Initialize if running in-cluster OR if contexts are configured
-        if self.config.k8s.in_cluster or self.config.k8s.contexts:
+        # K8s detectors: one per cluster, each with its own API client and pool
+        k8s_detectors = self._initialize_k8s_detectors()
+        detectors.extend(k8s_detectors)
+        if k8s_detectors:
+            self.logger.info("K8s detectors initialized", count=len(k8s_detectors))
+
+        # Offline manifest scanning
+        if self.config.manifests.enabled:
             try:
-                from src.detectors.k8s.pod_resources import PodResourceDetector
-                detectors.append(PodResourceDetector(self.config))
-                self.logger.info("K8s detectors initialized", count=1)
+                from src.detectors.k8s.manifests import ManifestDetector
+                detectors.append(ManifestDetector(self.config))
+                self.logger.info("Manifest detector initialized", paths=self.config.manifests.paths)
             except Exception as e:
-                self.logger.error("Failed to initialize K8s detectors", error=str(e), exc_info=True)
+                self.logger.error(
+                    "Failed to initialize manifest detector", error=str(e), exc_info=True
+                )
 
         # AWS detectors
         if self.config.aws.enabled:
@@ -47,7 +73,9 @@ class DetectionEngine:
                     detectors.append(RDSMySQLDetector(self.config))
                     aws_detector_count += 1
                 except Exception as e:
-                    self.logger.error("Failed to initialize RDS detector", error=str(e), exc_info=True)
+                    self.logger.error(
+                        "Failed to initialize RDS detector", error=str(e), exc_info=True
+                    )
 
             if self.config.aws.resources.get("kinesis", {}).get("enabled"):
                 try:
@@ -55,7 +83,9 @@ class DetectionEngine:
                     detectors.append(KinesisShardDetector(self.config))
                     aws_detector_count += 1
                 except Exception as e:
-                    self.logger.error("Failed to initialize Kinesis detector", error=str(e), exc_info=True)
+                    self.logger.error(
+                        "Failed to initialize Kinesis detector", error=str(e), exc_info=True
+                    )
 
             self.logger.info("AWS detectors initialized", count=aws_detector_count)
 
@@ -67,34 +97,226 @@ class DetectionEngine:
         self.logger.info("Detector initialization complete", total_detectors=len(detectors))
         return detectors
 
+    def _initialize_k8s_detectors(self):
+        """Create a PodResourceDetector for in-cluster access and each enabled context."""
+        k8s = self.config.k8s
+        contexts = [context for context in k8s.contexts if context.get("enabled", True)]
+        if not k8s.in_cluster and not contexts:
+            return []
+
+        try:
+            from src.detectors.k8s.pod_resources import PodResourceDetector
+        except Exception as e:
+            self.logger.error("Failed to initialize K8s detectors", error=str(e), exc_info=True)
+            return []
+
+        detectors = []
+        if k8s.in_cluster:
+            detectors.append(PodResourceDetector(self.config))
+        for context in contexts:
+            try:
+                detectors.append(PodResourceDetector(self.config, context=context))
+            except Exception as e:
+                self.logger.error(
+                    "Failed to initialize K8s detector",
+                    context=context.get("name"),
+                    error=str(e),
+                    exc_info=True
+                )
+        return detectors
+
     async def run_detection(self) -> List[Issue]:
-        """Run all detectors and collect issues."""
-        self.logger.info("Starting detection cycle")
+        """Run all detectors concurrently and collect issues.
+
+        At most ``detection.parallel_workers`` detectors run at once. Results are
+        merged in detector registration order so the output is stable no matter
+        which detector finishes first.
+        """
+        self.logger.info(
+            "Starting detection cycle",
+            detectors=len(self.detectors),
+            parallel_workers=self.workers
+        )
+
+        started = time.perf_counter()
+        tasks = [self._spawn(detector) for detector in self.detectors]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            self._tasks.difference_update(tasks)
+
         all_issues = []
+        for issues in results:
+            all_issues.extend(issues)
+
+        # Cycle duration and overrun metrics are recorded per job by the Scheduler
+        elapsed = time.perf_counter() - started
+        self.logger.info(
+            "Detection cycle completed",
+            total_issues=len(all_issues),
+            duration_seconds=round(elapsed, 3)
+        )
+        return all_issues
+
+    async def stream_detection(self, queue_size: int = 8) -> AsyncIterator[List[Issue]]:
+        """Run all detectors and yield batches of issues as they are produced.
+
+        Detectors push batches into a bounded queue, so a slow consumer pauses
+        them instead of letting results pile up: memory stays bounded by
+        ``queue_size`` batches no matter how many issues there are. Batches
+        from different detectors are interleaved. Closing the generator early
+        cancels the remaining detectors.
+
+        Streaming runs use their own ``parallel_workers`` limit, so a long
+        export does not hold back scheduled detection, and they are not
+        subject to ``detector_timeout`` since their pace is set by the consumer.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        semaphore = asyncio.Semaphore(self.workers)
+        finished = object()
 
+        async def produce(detector) -> None:
+            if not self.owns(detector):
+                await queue.put(finished)
+                return
+            try:
+                async with semaphore:
+                    async for batch in detector.detect_stream():
+                        await queue.put(batch)
+            except Exception as e:
+                self.logger.error(
+                    "Detector stream failed",
+                    detector=detector.name,
+                    error=str(e),
+                    exc_info=True
+                )
+            await queue.put(finished)
+
+        tasks = [
+            asyncio.create_task(produce(detector), name=f"stream:{detector.name}")
+            for detector in self.detectors
+        ]
+        self._tasks.update(tasks)
+
+        remaining = len(tasks)
+        try:
+            while remaining:
+                batch = await queue.get()
+                if batch is finished:
+                    remaining -= 1
+                    continue
+                yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._tasks.difference_update(tasks)
+
+    async def run_detector(self, detector) -> List[Issue]:
+        """Run a single detector, e.g. from its own schedule.
+
+        Runs share the engine-wide ``parallel_workers`` limit with full cycles.
+        """
+        task = self._spawn(detector)
+        try:
+            return await task
+        finally:
+            self._tasks.discard(task)
+
+    def _spawn(self, detector) -> asyncio.Task:
+        """Start a tracked task for one detector run."""
+        task = asyncio.create_task(
+            self._run_detector(detector),
+            name=f"detector:{detector.name}"
+        )
+        self._tasks.add(task)
+        return task
+
+    def cancel(self) -> None:
+        """Cancel all in-flight detector runs."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def close(self) -> None:
+        """Release background resources held by the detectors."""
         for detector in self.detectors:
             try:
-                self.logger.debug(
-                    "Running detector",
-                    detector=detector.__class__.__name__
+                detector.close()
+            except Exception as e:
+                self.logger.error(
+                    "Failed to close detector",
+                    detector=detector.name,
+                    error=str(e)
                 )
-                issues = await detector.detect()
-                all_issues.extend(issues)
+
+    def owns(self, detector) -> bool:
+        """Return True if this replica runs ``detector`` at all."""
+        if self.shard is None or detector.shard is not None:
+            return True
+        return self.shard.owns(f"detector:{detector.name}")
+
+    async def _run_detector(self, detector) -> List[Issue]:
+        """Run a single detector under the worker limit and timeout."""
+        name = detector.name
+        if not self.owns(detector):
+            self.last_outcome[name] = "skipped"
+            self.logger.debug("Detector owned by another replica", detector=name)
+            return []
+        timeout = self.config.detection.detector_timeout or self.config.detection.interval
+
+        async with self._semaphore:
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                self.logger.debug("Running detector", detector=name)
+                async with asyncio.timeout(timeout):
+                    issues = await detector.detect()
+                outcome = "ok"
+                self._record_issues(issues)
                 self.logger.info(
                     "Detector completed",
-                    detector=detector.__class__.__name__,
+                    detector=name,
                     issues_found=len(issues)
                 )
+                return issues
+            except IncompleteDetection as e:
+                # Report what was checked; the run still does not count as complete
+                outcome = "partial"
+                self._record_issues(e.issues)
+                self.logger.error(
+                    "Detector completed partially",
+                    detector=name,
+                    issues_found=len(e.issues),
+                    error=str(e)
+                )
+                return e.issues
+            except TimeoutError:
+                outcome = "timeout"
+                self.logger.error(
+                    "Detector timed out",
+                    detector=name,
+                    timeout_seconds=timeout
+                )
             except Exception as e:
                 self.logger.error(
                     "Detector failed",
-                    detector=detector.__class__.__name__,
+                    detector=name,
                     error=str(e),
                     exc_info=True
                 )
+            finally:
+                self.last_outcome[name] = outcome
+                metrics.DETECTOR_DURATION.labels(name, outcome).observe(
+                    time.perf_counter() - started
+                )
+        return []
 
-        self.logger.info(
-            "Detection cycle completed",
-            total_issues=len(all_issues)
-        )
-        return all_issues
+    @staticmethod
+    def _record_issues(issues: List[Issue]) -> None:
+        """Count issues by severity and platform."""
+        counts: Dict[Tuple[str, str], int] = {}
+        for issue in issues:
+            key = (issue.severity.value, issue.platform.value)
+            counts[key] = counts.get(key, 0) + 1
+        for (severity, platform), count in counts.items():
+            metrics.ISSUES_FOUND.labels(severity, platform).inc(count)
@@ -0,0 +1,294 @@
+"""Persistent SQLite-backed issue store."""
+
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import structlog
+
+from src.detectors.base.detector import Issue
+from src.utils.serialization import dumps, loads
+
+logger = structlog.get_logger(__name__)
+
+# Filter indexes end in the keyset columns, so a filtered page is one index range scan
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    fingerprint   TEXT PRIMARY KEY,
+    id            TEXT NOT NULL,
+    platform      TEXT NOT NULL,
+    cluster       TEXT,
+    region        TEXT,
+    namespace     TEXT,
+    resource_type TEXT NOT NULL,
+    resource_name TEXT NOT NULL,
+    check_name    TEXT,
+    severity      TEXT NOT NULL,
+    title         TEXT NOT NULL,
+    first_seen    REAL NOT NULL,
+    last_seen     REAL NOT NULL,
+    resolved_at   REAL,
+    payload       BLOB NOT NULL,
+    scope         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_issues_severity ON issues (severity, first_seen, fingerprint);
+CREATE INDEX IF NOT EXISTS idx_issues_platform ON issues (platform, first_seen, fingerprint);
+CREATE INDEX IF NOT EXISTS idx_issues_namespace ON issues (namespace, first_seen, fingerprint);
+CREATE INDEX IF NOT EXISTS idx_issues_first_seen ON issues (first_seen, fingerprint);
+CREATE INDEX IF NOT EXISTS idx_issues_last_seen ON issues (last_seen);
+"""
+
+# Payloads are stored as a JSON array of these fields, in ``Issue.to_dict`` order
+# without the fingerprint (it has its own column), and expanded back on read
+_PAYLOAD_FIELDS = (
+    "id", "check", "platform", "resource_type", "resource_name", "severity", "title",
+    "description", "detected_at", "namespace", "cluster", "region", "tags",
+    "auto_fixable", "current_value", "recommended_value", "metadata",
+)
+_payload_values = attrgetter(*_PAYLOAD_FIELDS)
+
+# Column values of a row between fingerprint and first_seen; Platform and
+# Severity are str enums, which sqlite3 binds as their value
+_column_values = attrgetter(
+    "id", "platform", "cluster", "region", "namespace", "resource_type",
+    "resource_name", "check", "severity", "title",
+)
+
+_UPSERT = """
+INSERT INTO issues (
+    fingerprint, id, platform, cluster, region, namespace, resource_type,
+    resource_name, check_name, severity, title, first_seen, last_seen, payload, scope
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (fingerprint) DO UPDATE SET
+    id = excluded.id,
+    severity = excluded.severity,
+    title = excluded.title,
+    last_seen = excluded.last_seen,
+    resolved_at = NULL,
+    payload = excluded.payload,
+    scope = excluded.scope
+"""
+
+# Columns callers may filter on
+FILTER_COLUMNS = ("severity", "platform", "namespace", "resource_type", "cluster")
+
+
+class IssueStore:
+    """Embedded issue history keyed by issue fingerprint.
+
+    Each detection run is written with a single batched ``executemany`` upsert
+    in one transaction. ``first_seen`` is kept from the first insert and
+    ``last_seen`` is refreshed on every run; unchanged issues only need a
+    :meth:`touch`. Rows are built without a dict per issue: the payload is a
+    JSON array of the issue's fields, expanded into ``to_dict`` form only for
+    the rows that are read. The database runs in WAL mode and reads go
+    through their own connection, so API reads neither block nor wait for
+    ingestion (an in-memory database has a single connection). Calls are
+    blocking; use ``asyncio.to_thread`` from the event loop.
+    """
+
+    def __init__(self, path: str = ":memory:", retention_days: int = 30):
+        self.path = path
+        self.retention_seconds = retention_days * 86400
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(issues)")}
+            if "scope" not in columns:  # Databases created before scopes were stored
+                self._conn.execute("ALTER TABLE issues ADD COLUMN scope TEXT")
+
+        if path == ":memory:":
+            self._reader, self._read_lock = self._conn, self._lock
+        else:
+            self._reader = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._read_lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        if self._reader is not self._conn:
+            with self._read_lock:
+                self._reader.close()
+
+    def upsert(
+        self,
+        issues: Iterable[Issue],
+        seen_at: Optional[float] = None,
+        scope: Optional[str] = None,
+        fingerprints: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Insert or refresh issues; returns the number of rows written.
+
+        ``scope`` is the deduplication scope that reported the issues, kept so
+        :meth:`open_issues` can restore the deduplicator after a restart.
+        ``fingerprints`` may hold the issues' fingerprints, in order, when the
+        caller already computed them.
+        """
+        seen_at = seen_at if seen_at is not None else time.time()
+        issues = list(issues)
+        if fingerprints is None:
+            fingerprints = [issue.fingerprint for issue in issues]
+        times = (seen_at, seen_at)
+        rows = [
+            (fingerprint, *_column_values(issue), *times, dumps(_payload_values(issue)), scope)
+            for issue, fingerprint in zip(issues, fingerprints)
+        ]
+        if not rows:
+            return 0
+        # In key order the B-tree pages of the primary key and of the indexes
+        # (all ending in fingerprint) are written sequentially, not at random
+        rows.sort(key=itemgetter(0))
+
+        with self._lock:
+            with self._transaction():
+                self._conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def touch(self, fingerprints: Iterable[str], seen_at: Optional[float] = None) -> int:
+        """Refresh ``last_seen`` of issues whose content did not change.
+
+        Much cheaper than :meth:`upsert` since nothing is re-serialized; most
+        issues are unchanged from one cycle to the next. The fingerprints are
+        passed as one JSON array, in key order, rather than bound row by row.
+        """
+        seen_at = seen_at if seen_at is not None else time.time()
+        fingerprints = sorted(fingerprints)
+        if not fingerprints:
+            return 0
+
+        with self._lock:
+            with self._transaction():
+                self._conn.execute(
+                    "UPDATE issues SET last_seen = ?, resolved_at = NULL"
+                    " WHERE fingerprint IN (SELECT value FROM json_each(?))",
+                    (seen_at, dumps(fingerprints)),
+                )
+        return len(fingerprints)
+
+    def mark_resolved(
+        self, fingerprints: Iterable[str], resolved_at: Optional[float] = None
+    ) -> None:
+        """Mark issues as resolved without deleting their history."""
+        resolved_at = resolved_at if resolved_at is not None else time.time()
+        rows = [(resolved_at, fingerprint) for fingerprint in fingerprints]
+        if not rows:
+            return
+
+        with self._lock:
+            with self._transaction():
+                self._conn.executemany(
+                    "UPDATE issues SET resolved_at = ?"
+                    " WHERE fingerprint = ? AND resolved_at IS NULL",
+                    rows,
+                )
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete issues resolved, or last seen, before the retention window."""
+        cutoff = (now if now is not None else time.time()) - self.retention_seconds
+        with self._lock:
+            with self._transaction():
+                cursor = self._conn.execute(
+                    "DELETE FROM issues WHERE last_seen < ? OR resolved_at < ?",
+                    (cutoff, cutoff),
+                )
+        if cursor.rowcount:
+            logger.info("Pruned issue history", deleted=cursor.rowcount)
+        return cursor.rowcount
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        active_only: bool = True,
+        after: Optional[Tuple[float, str]] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Return issues ordered by (first_seen, fingerprint).
+
+        ``after`` is the (first_seen, fingerprint) of the last row of the
+        previous page, for keyset pagination.
+        """
+        clauses, params = self._where(filters, active_only)
+        if after is not None:
+            clauses.append("(first_seen, fingerprint) > (?, ?)")
+            params.extend(after)
+
+        sql = "SELECT fingerprint, first_seen, last_seen, resolved_at, payload FROM issues"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY first_seen, fingerprint LIMIT ?"
+        params.append(limit)
+
+        with self._read_lock:
+            rows = self._reader.execute(sql, params).fetchall()
+
+        results = []
+        for fingerprint, first_seen, last_seen, resolved_at, payload in rows:
+            issue = _expand(fingerprint, payload)
+            issue["first_seen"] = first_seen
+            issue["last_seen"] = last_seen
+            issue["resolved_at"] = resolved_at
+            results.append(issue)
+        return results
+
+    def count(self, filters: Optional[Dict[str, Any]] = None, active_only: bool = True) -> int:
+        clauses, params = self._where(filters, active_only)
+        sql = "SELECT COUNT(*) FROM issues"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchone()[0]
+
+    def open_issues(self) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        """Return ``(scope, issue dict)`` for every unresolved issue."""
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT scope, fingerprint, payload FROM issues WHERE resolved_at IS NULL"
+            ).fetchall()
+        return [(scope, _expand(fingerprint, payload)) for scope, fingerprint, payload in rows]
+
+    @staticmethod
+    def _where(filters: Optional[Dict[str, Any]], active_only: bool) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (filters or {}).items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Unsupported filter: {column}")
+            if value is None:
+                continue
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        if active_only:
+            clauses.append("resolved_at IS NULL")
+        return clauses, params
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Wrap writes in one explicit transaction; the connection autocommits otherwise."""
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+
+def _expand(fingerprint: str, payload: bytes) -> Dict[str, Any]:
+    """Rebuild the ``Issue.to_dict`` form of a stored payload."""
+    values = loads(payload)
+    if isinstance(values, dict):  # Rows written before payloads were arrays
+        return values
+    issue = {"id": values[0], "fingerprint": fingerprint}
+    issue.update(zip(_PAYLOAD_FIELDS[1:], values[1:]))
+    return issue
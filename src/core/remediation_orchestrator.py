@@ -1,6 +1,9 @@
 """Orchestrates the remediation workflow."""
 
-from typing import List
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
 import structlog
 
 from src.detectors.base.detector import Issue
@@ -15,21 +18,95 @@ class RemediationOrchestrator:
     def __init__(self, config):
         self.config = config
         self.logger = structlog.get_logger(__name__)
+        # Shared by every process_issues call, so concurrent detector jobs
+        # together never exceed max_concurrent_fixes.
+        self._semaphore = asyncio.Semaphore(max(1, config.remediation.max_concurrent_fixes))
+        self._resource_locks: Dict[Tuple, asyncio.Lock] = {}
+        self._lock_users: Dict[Tuple, int] = {}
 
     async def process_issues(self, issues: List[Issue]) -> None:
-        """Process detected issues and trigger remediation."""
+        """Process detected issues and trigger remediation.
+
+        Issues are drained from a work queue by up to
+        ``remediation.max_concurrent_fixes`` workers. Fixes touching the same
+        resource are serialized, and failed fixes are retried with backoff.
+        """
         self.logger.info("Processing issues for remediation", count=len(issues))
+        if not issues:
+            return
 
+        queue: asyncio.Queue = asyncio.Queue()
         for issue in issues:
+            queue.put_nowait(issue)
+
+        workers = min(max(1, self.config.remediation.max_concurrent_fixes), len(issues))
+        await asyncio.gather(*(self._worker(queue) for _ in range(workers)))
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Process queued issues until the queue is empty."""
+        while True:
             try:
-                await self._process_single_issue(issue)
+                issue = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._process_with_retry(issue)
+
+    async def _process_with_retry(self, issue: Issue) -> None:
+        """Process one issue, retrying failures with exponential backoff."""
+        remediation = self.config.remediation
+        attempts = max(0, remediation.max_retries) + 1
+
+        for attempt in range(1, attempts + 1):
+            try:
+                async with self._resource_lock(issue):
+                    async with self._semaphore:
+                        await self._process_single_issue(issue)
+                return
             except Exception as e:
-                self.logger.error(
-                    "Failed to process issue",
+                if attempt == attempts:
+                    self.logger.error(
+                        "Failed to process issue",
+                        issue_id=issue.id,
+                        attempts=attempt,
+                        error=str(e),
+                        exc_info=True
+                    )
+                    return
+
+                delay = min(
+                    remediation.retry_backoff * 2 ** (attempt - 1),
+                    remediation.retry_backoff_max
+                )
+                self.logger.warning(
+                    "Retrying issue",
                     issue_id=issue.id,
-                    error=str(e),
-                    exc_info=True
+                    attempt=attempt,
+                    retry_in_seconds=delay,
+                    error=str(e)
                 )
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def _resource_lock(self, issue: Issue) -> AsyncIterator[None]:
+        """Hold an exclusive lock on the issue's target resource."""
+        key = (
+            issue.platform,
+            issue.cluster,
+            issue.region,
+            issue.namespace,
+            issue.resource_type,
+            issue.resource_name,
+        )
+        lock = self._resource_locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._resource_locks[key]
 
     async def _process_single_issue(self, issue: Issue) -> None:
         """Process a single issue."""
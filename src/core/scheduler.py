@@ -1,41 +1,129 @@
 """Scheduler for periodic detection runs."""
 
+import asyncio
+import functools
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+import structlog
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-import structlog
 
+from src.core.deduplication import IssueDeduplicator
 from src.core.remediation_orchestrator import RemediationOrchestrator
-
+from src.detectors.base.detector import Issue
+from src.metrics import prometheus as metrics
 
 logger = structlog.get_logger(__name__)
 
 
+@dataclass
+class JobState:
+    """Runtime state of a guarded periodic job."""
+    job_id: str
+    func: Callable[[], Awaitable[None]]
+    base_interval: float
+    interval: float
+    jitter: Optional[float] = None
+    running: bool = False
+    pending: bool = False
+    last_duration: Optional[float] = None
+
+
 class Scheduler:
-    """Schedules periodic detection and remediation."""
+    """Schedules periodic detection and remediation.
+
+    By default every detector is its own job running at the detector's
+    ``check_interval`` (falling back to ``detection.interval``), with the
+    detector's ``check_jitter`` (falling back to ``detection.jitter``). Every
+    run's duration is recorded per job, and runs longer than the job's
+    interval count as overruns. Runs of the same job never overlap. When a run is
+    still in progress at the next tick, ``detection.overlap_policy`` decides
+    what happens:
+
+    - ``skip``: drop the tick.
+    - ``coalesce``: remember it and start exactly one more run as soon as the
+      current one finishes.
+    - ``delay``: drop the tick and measure the next interval from the end of
+      the run instead of its start.
+
+    With ``detection.adaptive_interval`` the interval stretches to fit the
+    measured run time (times ``adaptive_headroom``, capped at ``max_interval``)
+    and shrinks back once runs get faster.
+    """
 
-    def __init__(self, config, detection_engine):
+    # Metric label recorded for a tick that found the previous run in progress
+    OVERRUN_ACTIONS = {"skip": "skipped", "coalesce": "coalesced", "delay": "delayed"}
+
+    # Detector outcomes after which missing issues count as resolved. A detector
+    # owned by another shard hands its issues over to that replica.
+    COMPLETE_OUTCOMES = ("ok", "skipped")
+
+    def __init__(self, config, detection_engine, issue_store=None, snapshot=None):
         self.config = config
         self.detection_engine = detection_engine
+        self.issue_store = issue_store
+        self.snapshot = snapshot
         self.remediation_orchestrator = RemediationOrchestrator(config)
+        self.deduplicator = IssueDeduplicator(ttl=config.detection.dedup_ttl)
         self.scheduler = AsyncIOScheduler()
         self.logger = structlog.get_logger(__name__)
+        self._jobs: Dict[str, JobState] = {}
 
     def start(self) -> None:
         """Start the scheduler."""
-        interval = self.config.detection.interval
+        detection = self.config.detection
+        if self.issue_store is not None:
+            self.restore_open_issues()
 
-        self.scheduler.add_job(
-            self._detection_job,
-            trigger=IntervalTrigger(seconds=interval),
-            id="detection_job",
-            name="Run detection and remediation",
-            replace_existing=True,
-        )
+        if detection.per_detector_schedules:
+            # Each detector runs at its own check_interval, so cheap checks can
+            # run often without dragging expensive cloud scans along.
+            for detector in self.detection_engine.detectors:
+                interval = detector.check_interval or detection.interval
+                jitter = detector.check_jitter
+                if jitter is None:
+                    jitter = detection.jitter
+                self._add_guarded_job(
+                    f"detect:{detector.name}",
+                    f"Run {detector.name} and remediation",
+                    functools.partial(self._detector_job, detector),
+                    interval,
+                    jitter,
+                )
+                self.logger.info(
+                    "Scheduled detector",
+                    detector=detector.name,
+                    interval_seconds=interval,
+                    jitter_seconds=jitter
+                )
+        else:
+            self._add_guarded_job(
+                "detection_job",
+                "Run detection and remediation",
+                self._detection_job,
+                detection.interval,
+                detection.jitter,
+            )
+
+        if self.issue_store is not None:
+            self.scheduler.add_job(
+                self._prune_job,
+                trigger=IntervalTrigger(seconds=self.config.storage.prune_interval),
+                id="prune_issues",
+                name="Prune issue history",
+                replace_existing=True,
+            )
 
         self.scheduler.start()
         self.logger.info(
             "Scheduler started",
-            interval_seconds=interval
+            jobs=len(self._jobs),
+            interval_seconds=detection.interval,
+            overlap_policy=detection.overlap_policy,
+            adaptive_interval=detection.adaptive_interval
         )
 
     def shutdown(self) -> None:
@@ -43,18 +131,153 @@ class Scheduler:
         self.scheduler.shutdown()
         self.logger.info("Scheduler stopped")
 
+    def _add_guarded_job(
+        self,
+        job_id: str,
+        name: str,
+        func: Callable[[], Awaitable[None]],
+        interval: float,
+        jitter: Optional[float] = None,
+    ) -> None:
+        """Register a periodic job that is protected against overlapping runs."""
+        jitter = jitter or None
+        state = JobState(
+            job_id=job_id,
+            func=func,
+            base_interval=interval,
+            interval=interval,
+            jitter=jitter,
+        )
+        self._jobs[job_id] = state
+        metrics.SCHEDULER_INTERVAL.labels(job_id).set(interval)
+
+        self.scheduler.add_job(
+            self._run_guarded,
+            trigger=IntervalTrigger(seconds=interval, jitter=jitter),
+            args=[job_id],
+            id=job_id,
+            name=name,
+            replace_existing=True,
+            # The overlap guard handles concurrent ticks itself, so APScheduler
+            # must hand them over instead of silently refusing to start them.
+            max_instances=2,
+            coalesce=True,
+        )
+
+    async def _run_guarded(self, job_id: str) -> None:
+        """Run a job unless a previous run is still in progress."""
+        state = self._jobs[job_id]
+        policy = self.config.detection.overlap_policy
+
+        if state.running:
+            action = self.OVERRUN_ACTIONS[policy]
+            if policy == "coalesce":
+                state.pending = True
+            metrics.SCHEDULER_OVERRUNS.labels(job_id, action).inc()
+            self.logger.warning(
+                "Previous run still in progress",
+                job=job_id,
+                action=action,
+                interval_seconds=state.interval
+            )
+            return
+
+        state.running = True
+        try:
+            while True:
+                state.pending = False
+                started = time.monotonic()
+                try:
+                    await state.func()
+                finally:
+                    state.last_duration = duration = time.monotonic() - started
+                    self._record_run(state, duration)
+                if not state.pending:
+                    break
+                self.logger.info("Running coalesced run", job=job_id)
+        finally:
+            state.running = False
+
+        self._reschedule(state)
+
+    def _record_run(self, state: JobState, duration: float) -> None:
+        """Export one run's duration and count it as an overrun if it outlasted the interval."""
+        metrics.DETECTION_CYCLE_DURATION.labels(state.job_id).observe(duration)
+        if duration > state.interval:
+            metrics.DETECTION_CYCLE_OVERRUNS.labels(state.job_id).inc()
+            self.logger.warning(
+                "Detection run overran interval",
+                job=state.job_id,
+                duration_seconds=round(duration, 3),
+                interval_seconds=state.interval
+            )
+
+    def _reschedule(self, state: JobState) -> None:
+        """Adjust the job's next run after a completed run."""
+        detection = self.config.detection
+        interval = state.interval
+
+        if detection.adaptive_interval and state.last_duration is not None:
+            max_interval = detection.max_interval or state.base_interval * 4
+            wanted = max(state.base_interval, state.last_duration * detection.adaptive_headroom)
+            interval = min(wanted, max(max_interval, state.base_interval))
+
+        if interval == state.interval and detection.overlap_policy != "delay":
+            return
+
+        if interval != state.interval:
+            self.logger.info(
+                "Adjusting job interval",
+                job=state.job_id,
+                previous_seconds=round(state.interval, 3),
+                interval_seconds=round(interval, 3),
+                last_duration_seconds=round(state.last_duration or 0, 3)
+            )
+            state.interval = interval
+            metrics.SCHEDULER_INTERVAL.labels(state.job_id).set(interval)
+
+        if not self.scheduler.running:
+            return
+        # Rescheduling restarts the interval from now, i.e. from the end of the run
+        self.scheduler.reschedule_job(
+            state.job_id, trigger=IntervalTrigger(seconds=interval, jitter=state.jitter)
+        )
+
+    def run_all_now(self) -> None:
+        """Start every detection job immediately, e.g. after a shard rebalance."""
+        if not self.scheduler.running:
+            return
+        now = datetime.now(timezone.utc)
+        for job_id in self._jobs:
+            self.scheduler.modify_job(job_id, next_run_time=now)
+        self.logger.info("Triggered all detection jobs", jobs=len(self._jobs))
+
+    async def _detector_job(self, detector) -> None:
+        """Run one detector and remediate what is new or changed."""
+        try:
+            issues = await self.detection_engine.run_detector(detector)
+            outcome = self.detection_engine.last_outcome.get(detector.name)
+            complete = outcome in self.COMPLETE_OUTCOMES
+            await self._handle_issues(detector.name, issues, complete)
+
+        except Exception as e:
+            self.logger.error(
+                "Detector job failed",
+                detector=detector.name,
+                error=str(e),
+                exc_info=True
+            )
+
     async def _detection_job(self) -> None:
         """Execute detection and remediation job."""
         try:
             # Run detection
             issues = await self.detection_engine.run_detection()
-
-            if not issues:
-                self.logger.info("No issues detected")
-                return
-
-            # Process issues for remediation
-            await self.remediation_orchestrator.process_issues(issues)
+            complete = all(
+                outcome in self.COMPLETE_OUTCOMES
+                for outcome in self.detection_engine.last_outcome.values()
+            )
+            await self._handle_issues("detection_job", issues, complete)
 
         except Exception as e:
             self.logger.error(
@@ -62,3 +285,65 @@ class Scheduler:
                 error=str(e),
                 exc_info=True
             )
+
+    async def _handle_issues(self, scope: str, issues, complete: bool) -> None:
+        """Deduplicate a run's issues and pass new or changed ones to remediation."""
+        delta = self.deduplicator.update(scope, issues, complete=complete)
+
+        if delta.resolved:
+            self.logger.info("Issues resolved", scope=scope, count=len(delta.resolved))
+
+        if self.issue_store is not None:
+            await self._store_issues(scope, delta)
+
+        if self.snapshot is not None and (delta.actionable or delta.resolved):
+            # Rebuild the API view only when the open issue set actually moved
+            await asyncio.to_thread(self.snapshot.publish, self.deduplicator.active())
+
+        if not delta.actionable:
+            self.logger.info("No new or changed issues", scope=scope)
+            return
+
+        # Process issues for remediation
+        await self.remediation_orchestrator.process_issues(delta.actionable)
+
+    async def _store_issues(self, scope: str, delta) -> None:
+        """Persist a run's delta; storage errors never block remediation."""
+        try:
+            await asyncio.to_thread(
+                self.issue_store.upsert,
+                delta.actionable,
+                scope=scope,
+                fingerprints=delta.actionable_fingerprints,
+            )
+            await asyncio.to_thread(self.issue_store.touch, delta.fingerprints["unchanged"])
+            if delta.resolved:
+                await asyncio.to_thread(
+                    self.issue_store.mark_resolved, delta.fingerprints["resolved"]
+                )
+        except Exception as e:
+            self.logger.error("Failed to store issues", error=str(e), exc_info=True)
+
+    def restore_open_issues(self) -> None:
+        """Seed the deduplicator with the issues the store still has open.
+
+        Without this a restart would treat every open issue as new and send
+        it to remediation again.
+        """
+        try:
+            restored = [
+                (scope, Issue.from_dict(data)) for scope, data in self.issue_store.open_issues()
+            ]
+        except Exception as e:
+            self.logger.error("Failed to restore open issues", error=str(e), exc_info=True)
+            return
+        self.deduplicator.restore(restored)
+        if self.snapshot is not None and restored:
+            self.snapshot.publish(self.deduplicator.active())
+
+    async def _prune_job(self) -> None:
+        """Drop issue history older than the retention window."""
+        try:
+            await asyncio.to_thread(self.issue_store.prune)
+        except Exception as e:
+            self.logger.error("Issue pruning failed", error=str(e), exc_info=True)
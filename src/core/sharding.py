@@ -0,0 +1,293 @@
+"""Horizontal sharding of detection work across agent replicas.
+
+Every replica keeps its own ``coordination.k8s.io`` Lease alive. The holders of
+all unexpired leases form the membership, and a consistent-hash ring over
+them decides which replica scans which shard key (``cluster/namespace`` for
+Kubernetes workloads, the detector name for cloud detectors). When a replica
+joins or leaves only about ``1/N`` of the keys move.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+from src.metrics import prometheus as metrics
+
+logger = structlog.get_logger(__name__)
+
+# Label marking the leases that belong to one sharding group
+GROUP_LABEL = "opsagent.io/shard-group"
+# Lease annotation with the URL peers reach this replica's API at
+API_URL_ANNOTATION = "opsagent.io/api-url"
+
+# Port the agent's API server listens on
+API_PORT = 18080
+
+HTTP_NOT_FOUND = 404
+HTTP_CONFLICT = 409
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes."""
+
+    def __init__(self, members: Iterable[str], vnodes: int = 64):
+        self.members = frozenset(members)
+        self.vnodes = vnodes
+        points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{member}#{replica}"), member)
+            for member in self.members
+            for replica in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [member for _, member in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        """Return the member responsible for ``key``, or None for an empty ring."""
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class ShardMembership:
+    """Lease-based replica membership with a consistent-hash ring.
+
+    Every ``renew_interval`` seconds the replica renews its own Lease and lists
+    the group's leases; holders whose lease has not expired are the members.
+    A replica always counts itself as a member, so if the API server cannot be
+    reached it keeps scanning on its own rather than dropping work. ``stop()``
+    deletes the lease, so a graceful shutdown rebalances on the next renewal
+    instead of after ``lease_duration``. Leases left behind by replicas that
+    crashed are deleted by the next replica that finds them expired.
+    """
+
+    def __init__(
+        self,
+        sharding,
+        k8s: Any = None,
+        api: Any = None,
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        self.identity = sharding.identity or os.environ.get("POD_NAME") or socket.gethostname()
+        self.namespace = sharding.namespace or os.environ.get("POD_NAMESPACE") or "default"
+        self.group = sharding.group
+        self.lease_name = f"{sharding.group}-{self.identity}"
+        self.lease_duration = sharding.lease_duration
+        self.renew_interval = sharding.renew_interval
+        self.granularity = sharding.granularity
+        self.vnodes = sharding.vnodes
+        pod_ip = os.environ.get("POD_IP")
+        self.advertise_url = sharding.advertise_url or (
+            f"http://{pod_ip}:{API_PORT}" if pod_ip else None
+        )
+
+        self._k8s = k8s
+        self._api = api
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._ring = HashRing([self.identity], self.vnodes)
+        self._api_urls: Dict[str, str] = {}
+        self._listeners: List[Callable[[], Any]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def members(self) -> Set[str]:
+        return set(self._ring.members)
+
+    @property
+    def peers(self) -> Dict[str, str]:
+        """API URL of every other member that advertises one."""
+        members = self._ring.members
+        return {
+            identity: url for identity, url in self._api_urls.items()
+            if identity in members and identity != self.identity
+        }
+
+    def owns(self, key: str) -> bool:
+        """Return True if this replica is responsible for ``key``."""
+        return self._ring.owner(key) == self.identity
+
+    def add_listener(self, listener: Callable[[], Any]) -> None:
+        """Call ``listener`` (sync or async) whenever the membership changes."""
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        """Join the group and keep the lease renewed in the background."""
+        await self.sync()
+        self._task = asyncio.create_task(self._run(), name="shard-membership")
+        logger.info(
+            "Joined shard group",
+            identity=self.identity,
+            group=self.group,
+            members=sorted(self.members)
+        )
+
+    async def stop(self) -> None:
+        """Stop renewing and release the lease."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await asyncio.to_thread(self._release)
+        except Exception as e:
+            logger.warning("Failed to release shard lease", lease=self.lease_name, error=str(e))
+
+    async def sync(self) -> None:
+        """Renew this replica's lease and refresh the membership."""
+        try:
+            members = await asyncio.to_thread(self._heartbeat)
+        except Exception as e:
+            logger.warning("Shard membership sync failed", group=self.group, error=str(e))
+            return
+        await self._update(members)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            await self.sync()
+
+    async def _update(self, members: Set[str]) -> None:
+        members = set(members) | {self.identity}
+        metrics.SHARD_MEMBERS.set(len(members))
+        if members == self.members:
+            return
+
+        previous = self.members
+        self._ring = HashRing(members, self.vnodes)
+        metrics.SHARD_REBALANCES.inc()
+        logger.info(
+            "Shard membership changed",
+            identity=self.identity,
+            joined=sorted(members - previous),
+            left=sorted(previous - members),
+            members=len(members)
+        )
+        for listener in self._listeners:
+            try:
+                result = listener()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error("Shard listener failed", error=str(e), exc_info=True)
+
+    def _heartbeat(self) -> Set[str]:
+        """Create or renew our lease and return the holders of all live leases."""
+        from kubernetes.client.rest import ApiException
+
+        api = self._coordination_api()
+        now = self._clock()
+        lease = self._lease_body(now)
+        try:
+            api.patch_namespaced_lease(self.lease_name, self.namespace, lease)
+        except ApiException as e:
+            if e.status != HTTP_NOT_FOUND:
+                raise
+            api.create_namespaced_lease(self.namespace, lease)
+
+        leases = api.list_namespaced_lease(
+            self.namespace, label_selector=f"{GROUP_LABEL}={self.group}"
+        )
+        members = set()
+        api_urls = {}
+        for lease in leases.items:
+            if not lease.spec or not lease.spec.holder_identity:
+                continue
+            holder = lease.spec.holder_identity
+            if self._alive(lease.spec, now):
+                members.add(holder)
+                url = (lease.metadata.annotations or {}).get(API_URL_ANNOTATION)
+                if url:
+                    api_urls[holder] = url.rstrip("/")
+            elif holder != self.identity:
+                self._delete_expired(api, lease)
+        self._api_urls = api_urls
+        return members
+
+    def _delete_expired(self, api: Any, lease: Any) -> None:
+        """Delete a crashed replica's lease unless it was renewed in the meantime."""
+        from kubernetes.client.rest import ApiException
+
+        metadata = lease.metadata
+        try:
+            api.delete_namespaced_lease(
+                metadata.name,
+                self.namespace,
+                body={"preconditions": {"resourceVersion": metadata.resource_version}},
+            )
+        except ApiException as e:
+            # 404/409: already gone, or renewed since it was listed. Any other
+            # failure must not break membership; the next sync retries.
+            if e.status not in (HTTP_NOT_FOUND, HTTP_CONFLICT):
+                logger.warning(
+                    "Failed to delete expired shard lease",
+                    lease=metadata.name,
+                    error=str(e)
+                )
+            return
+        logger.info("Deleted expired shard lease", lease=metadata.name)
+
+    def _release(self) -> None:
+        from kubernetes.client.rest import ApiException
+
+        try:
+            self._coordination_api().delete_namespaced_lease(self.lease_name, self.namespace)
+        except ApiException as e:
+            if e.status != HTTP_NOT_FOUND:
+                raise
+
+    def _alive(self, spec: Any, now: datetime) -> bool:
+        renewed = spec.renew_time or spec.acquire_time
+        if renewed is None:
+            return False
+        if renewed.tzinfo is None:
+            renewed = renewed.replace(tzinfo=timezone.utc)
+        duration = spec.lease_duration_seconds or self.lease_duration
+        return renewed + timedelta(seconds=duration) > now
+
+    def _lease_body(self, now: datetime) -> Dict[str, Any]:
+        # MicroTime must carry exactly six fractional digits, which
+        # datetime.isoformat() drops when microseconds are zero
+        renew_time = now.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        return {
+            "apiVersion": "coordination.k8s.io/v1",
+            "kind": "Lease",
+            "metadata": {
+                "name": self.lease_name,
+                "namespace": self.namespace,
+                "labels": {GROUP_LABEL: self.group},
+                "annotations": (
+                    {API_URL_ANNOTATION: self.advertise_url} if self.advertise_url else {}
+                ),
+            },
+            "spec": {
+                "holderIdentity": self.identity,
+                "leaseDurationSeconds": self.lease_duration,
+                "renewTime": renew_time,
+            },
+        }
+
+    def _coordination_api(self) -> Any:
+        if self._api is None:
+            from kubernetes import client
+
+            from src.detectors.k8s.client import build_api_client
+
+            self._api = client.CoordinationV1Api(build_api_client(self._k8s))
+        return self._api
+
+
+def create_membership(config) -> Optional[ShardMembership]:
+    """Build the replica's membership from config, or None when sharding is off."""
+    if not config.sharding.enabled:
+        return None
+    return ShardMembership(config.sharding, k8s=config.k8s)
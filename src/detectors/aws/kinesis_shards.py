@@ -1,6 +1,6 @@
 """Detector for AWS Kinesis stream shard configurations."""
 
-from typing import List
+from typing import List, Optional
 import structlog
 
 from src.detectors.base.detector import BaseDetector, Issue, Platform, Severity
@@ -20,6 +20,14 @@ class KinesisShardDetector(BaseDetector):
     def resource_type(self) -> str:
         return "Kinesis"
 
+    @property
+    def check_interval(self) -> Optional[int]:
+        return self.config.aws.resources.get("kinesis", {}).get("check_interval")
+
+    @property
+    def check_jitter(self) -> Optional[float]:
+        return self.config.aws.resources.get("kinesis", {}).get("check_jitter")
+
     async def detect(self) -> List[Issue]:
         """Detect Kinesis shard issues."""
         issues = []
@@ -1,6 +1,6 @@
 """Detector for AWS RDS MySQL instances."""
 
-from typing import List
+from typing import List, Optional
 import structlog
 
 from src.detectors.base.detector import BaseDetector, Issue, Platform, Severity
@@ -20,6 +20,14 @@ class RDSMySQLDetector(BaseDetector):
     def resource_type(self) -> str:
         return "RDS"
 
+    @property
+    def check_interval(self) -> Optional[int]:
+        return self.config.aws.resources.get("rds", {}).get("check_interval")
+
+    @property
+    def check_jitter(self) -> Optional[float]:
+        return self.config.aws.resources.get("rds", {}).get("check_jitter")
+
     async def detect(self) -> List[Issue]:
         """Detect RDS MySQL issues."""
         issues = []
@@ -4,8 +4,9 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
-import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import hashlib
+import json
 
 
 class Severity(str, Enum):
@@ -23,9 +24,12 @@ class Platform(str, Enum):
     AZURE = "azure"
 
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
-    """Represents a detected configuration issue."""
+    """Represents a detected configuration issue.
+
+    Slotted: a fleet scan can hold hundreds of thousands of these at once.
+    """
 
     # Required fields (no defaults)
     platform: Platform
@@ -35,12 +39,14 @@ class Issue:
     title: str
     description: str
 
-    # Identification (with defaults)
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # Identification (with defaults); id defaults to the stable fingerprint
+    id: str = ""
+    check: Optional[str] = None
     detected_at: datetime = field(default_factory=datetime.utcnow)
 
     # Context
     namespace: Optional[str] = None
+    cluster: Optional[str] = None
     region: Optional[str] = None
     tags: Dict[str, str] = field(default_factory=dict)
 
@@ -53,10 +59,49 @@ class Issue:
     recommended_value: Optional[Any] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
+    def __post_init__(self):
+        if not self.id:
+            self.id = self.fingerprint
+
+    @property
+    def fingerprint(self) -> str:
+        """Deterministic identity of the problem, stable across detection cycles.
+
+        Built from platform, cluster, region, kind, namespace, name, container
+        and check, so the same problem on the same object always maps to the
+        same value. Issues found in manifest files also include the file path,
+        since two files may define the same object.
+        """
+        parts: Tuple[str, ...] = (
+            self.platform.value,
+            self.cluster or "",
+            self.region or "",
+            self.resource_type,
+            self.namespace or "",
+            self.resource_name,
+            str(self.metadata.get("container") or ""),
+            self.check or self.title,
+        )
+        manifest = self.metadata.get("manifest")
+        if manifest:
+            parts += (str(manifest),)
+        return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+    def content_digest(self) -> str:
+        """Digest of the fields that make a re-detected issue count as changed."""
+        payload = json.dumps(
+            [self.severity.value, self.title, self.current_value, self.recommended_value],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def to_dict(self, fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """Convert to dictionary; pass ``fingerprint`` if it was already computed."""
         return {
             "id": self.id,
+            "fingerprint": fingerprint or self.fingerprint,
+            "check": self.check,
             "platform": self.platform.value,
             "resource_type": self.resource_type,
             "resource_name": self.resource_name,
@@ -65,6 +110,7 @@ class Issue:
             "description": self.description,
             "detected_at": self.detected_at.isoformat(),
             "namespace": self.namespace,
+            "cluster": self.cluster,
             "region": self.region,
             "tags": self.tags,
             "auto_fixable": self.auto_fixable,
@@ -73,18 +119,91 @@ class Issue:
             "metadata": self.metadata,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Issue":
+        """Rebuild an issue from :meth:`to_dict` output (e.g. a stored payload)."""
+        return cls(
+            id=data["id"],
+            check=data.get("check"),
+            platform=Platform(data["platform"]),
+            resource_type=data["resource_type"],
+            resource_name=data["resource_name"],
+            severity=Severity(data["severity"]),
+            title=data["title"],
+            description=data["description"],
+            detected_at=datetime.fromisoformat(data["detected_at"]),
+            namespace=data.get("namespace"),
+            cluster=data.get("cluster"),
+            region=data.get("region"),
+            tags=data.get("tags") or {},
+            remediation_plan=data.get("remediation_plan"),
+            auto_fixable=data.get("auto_fixable", False),
+            current_value=data.get("current_value"),
+            recommended_value=data.get("recommended_value"),
+            metadata=data.get("metadata") or {},
+        )
+
+
+class IncompleteDetection(Exception):
+    """Raised by ``detect()`` when some resources could not be checked.
+
+    Carries the issues found in the resources that were checked, so they are
+    still reported while the run does not count as complete.
+    """
+
+    def __init__(self, message: str, issues: Optional[List[Issue]] = None):
+        super().__init__(message)
+        self.issues = issues or []
+
 
 class BaseDetector(ABC):
     """Base class for all detectors."""
 
+    # True if the detector filters its own work by namespace shard keys;
+    # otherwise the whole detector is one shard key
+    shard_by_namespace = False
+
     def __init__(self, config):
         self.config = config
+        # ShardMembership assigned by the engine when sharding is enabled
+        self.shard = None
+
+    def owns(self, key: str) -> bool:
+        """Return True if this replica is responsible for shard ``key``."""
+        return self.shard is None or self.shard.owns(key)
 
     @abstractmethod
     async def detect(self) -> List[Issue]:
         """Run detection and return list of issues found."""
         pass
 
+    async def detect_stream(self) -> AsyncIterator[List[Issue]]:
+        """Yield issues in batches as they are found.
+
+        The default yields the whole result of ``detect()`` at once; detectors
+        that page through their resources override this to yield per page.
+        """
+        yield await self.detect()
+
+    @property
+    def name(self) -> str:
+        """Return a display name used in logs."""
+        return self.__class__.__name__
+
+    @property
+    def check_interval(self) -> Optional[int]:
+        """Return this detector's own schedule in seconds (None uses detection.interval)."""
+        return None
+
+    @property
+    def check_jitter(self) -> Optional[float]:
+        """Return this detector's own jitter in seconds (None uses detection.jitter)."""
+        return None
+
+    def close(self) -> None:
+        """Release any background resources held by the detector."""
+        pass
+
     @property
     @abstractmethod
     def platform(self) -> Platform:
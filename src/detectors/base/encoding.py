@@ -0,0 +1,40 @@
+"""Bulk JSON encoding of issues.
+
+Every issue is encoded from ``to_dict``, with orjson when it is installed and
+the standard library otherwise, so both paths emit the same fields in the
+same order.
+"""
+
+import json
+from typing import Iterable, Iterator, Optional
+
+from src.detectors.base.detector import Issue
+from src.utils.serialization import orjson
+
+
+def encode_issue(issue: Issue, fingerprint: Optional[str] = None) -> bytes:
+    """Encode one issue as a JSON object.
+
+    Pass ``fingerprint`` when the caller already computed it, to skip hashing
+    it again.
+    """
+    data = issue.to_dict(fingerprint)
+    if orjson is not None:
+        return orjson.dumps(data, default=str)
+    return json.dumps(data, default=str, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def iter_ndjson(issues: Iterable[Issue]) -> Iterator[bytes]:
+    """Yield one newline-terminated JSON document per issue."""
+    for issue in issues:
+        yield encode_issue(issue) + b"\n"
+
+
+def encode_ndjson(issues: Iterable[Issue]) -> bytes:
+    """Encode issues as newline-delimited JSON."""
+    return b"".join(iter_ndjson(issues))
+
+
+def encode_issues(issues: Iterable[Issue]) -> bytes:
+    """Encode issues as one JSON array."""
+    return b"[" + b",".join(encode_issue(issue) for issue in issues) + b"]"
@@ -0,0 +1,92 @@
+"""Kubernetes API client construction and connection pool tuning.
+
+The kubernetes package is imported on first use, so configs and commands that
+never talk to a cluster do not pay for loading it.
+"""
+
+import os
+import socket
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import structlog
+
+if TYPE_CHECKING:
+    from kubernetes import client
+
+
+logger = structlog.get_logger(__name__)
+
+
+def build_api_client(k8s, context: Optional[str] = None) -> "client.ApiClient":
+    """Build a dedicated ApiClient for in-cluster access or one kubeconfig context.
+
+    Each client gets its own Configuration and therefore its own connection pool,
+    sized and tuned from ``K8sConfig`` instead of the library defaults.
+    """
+    from kubernetes import client
+    from kubernetes import config as k8s_config
+
+    configuration = client.Configuration()
+
+    if context is None and k8s.in_cluster:
+        k8s_config.load_incluster_config(client_configuration=configuration)
+        logger.info("Loaded in-cluster Kubernetes configuration")
+    else:
+        config_file = os.path.expanduser(k8s.kubeconfig) if k8s.kubeconfig else None
+        k8s_config.load_kube_config(
+            config_file=config_file,
+            context=context,
+            client_configuration=configuration,
+        )
+        logger.info("Loaded kubeconfig", context=context or "current-context")
+
+    configuration.connection_pool_maxsize = k8s.connection_pool_maxsize
+    if k8s.tcp_keepalive:
+        configuration.socket_options = keepalive_socket_options(k8s.tcp_keepalive_idle)
+
+    api_client = client.ApiClient(configuration)
+    if k8s.gzip:
+        # urllib3 transparently decodes gzip bodies
+        api_client.set_default_header("Accept-Encoding", "gzip")
+    return api_client
+
+
+def request_timeout(k8s) -> Tuple[float, float]:
+    """Return the (connect, read) timeout passed to each API request."""
+    return (k8s.connect_timeout, k8s.read_timeout)
+
+
+def keepalive_socket_options(idle: int) -> List[Tuple[int, int, int]]:
+    """Return urllib3 socket options enabling TCP keep-alive probes."""
+    from urllib3.connection import HTTPConnection
+
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # TCP_KEEPIDLE on Linux, TCP_KEEPALIVE on macOS
+    idle_option = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+    if idle_option is not None:
+        options.append((socket.IPPROTO_TCP, idle_option, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 3)))
+    return options
+
+
+def connection_pool_stats(api_client: Optional["client.ApiClient"]) -> Dict[str, Any]:
+    """Summarize connection reuse across an ApiClient's urllib3 pools.
+
+    ``reused`` counts requests served on an already-open connection.
+    """
+    stats = {"pools": 0, "connections": 0, "requests": 0, "reused": 0}
+    if api_client is None:
+        return stats
+
+    pools = api_client.rest_client.pool_manager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        stats["pools"] += 1
+        stats["connections"] += pool.num_connections
+        stats["requests"] += pool.num_requests
+    stats["reused"] = max(0, stats["requests"] - stats["connections"])
+    return stats
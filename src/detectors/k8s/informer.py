@@ -0,0 +1,213 @@
+"""List/watch informer that keeps per-workload issues up to date."""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+from src.detectors.base.detector import Issue
+from src.metrics import prometheus as metrics
+
+logger = structlog.get_logger(__name__)
+
+HTTP_GONE = 410
+
+
+class WorkloadInformer:
+    """Caches the issues of one workload kind and applies watch events to it.
+
+    The informer lists every object once, records the list's resourceVersion and
+    then watches from there. Only objects whose spec generation or labels changed
+    are re-checked. When the watch expires (410 Gone) it re-lists to resync.
+    Watching is blocking, so it runs on a daemon thread; ``issues()`` returns a
+    snapshot that is safe to read from the event loop.
+    """
+
+    def __init__(
+        self,
+        resource_type: str,
+        list_fn: Callable[..., Any],
+        check_fn: Callable[[Any], List[Issue]],
+        page_size: int = 500,
+        watch_timeout: int = 300,
+        retry_delay: float = 5.0,
+        watch_factory: Callable[[], Any] = watch.Watch,
+        field_selector: Optional[str] = None,
+        request_timeout: Optional[Tuple[float, float]] = None,
+    ):
+        self.resource_type = resource_type
+        self._list_fn = list_fn
+        self._check_fn = check_fn
+        self._page_size = page_size
+        self._watch_timeout = watch_timeout
+        self._retry_delay = retry_delay
+        self._watch_factory = watch_factory
+        self._selector_kwargs = {"field_selector": field_selector} if field_selector else {}
+        self._request_timeout = request_timeout
+
+        # (namespace, name) -> (change stamp, issues)
+        self._cache: Dict[Tuple[str, str], Tuple[Any, List[Issue]]] = {}
+        self._lock = threading.Lock()
+        self._resource_version: Optional[str] = None
+        self._stop = threading.Event()
+        self._synced = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._watch: Optional[Any] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the list/watch loop on a background thread."""
+        if self.running:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"informer-{self.resource_type}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching and wait for the background thread to exit."""
+        self._stop.set()
+        if self._watch is not None:
+            self._watch.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        """Block until the initial list has been loaded."""
+        return self._synced.wait(timeout)
+
+    def issues(self) -> List[Issue]:
+        """Return a snapshot of all cached issues."""
+        with self._lock:
+            entries = list(self._cache.values())
+
+        issues = []
+        for _, object_issues in entries:
+            issues.extend(object_issues)
+        return issues
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._resource_version is None:
+                    self._relist()
+                self._watch_once()
+            except ApiException as e:
+                if e.status == HTTP_GONE:
+                    logger.info(
+                        "Watch expired, resyncing",
+                        resource_type=self.resource_type
+                    )
+                    self._resource_version = None
+                    continue
+                logger.error(
+                    "Informer API error",
+                    resource_type=self.resource_type,
+                    error=str(e)
+                )
+                self._stop.wait(self._retry_delay)
+            except Exception as e:
+                logger.error(
+                    "Informer failed",
+                    resource_type=self.resource_type,
+                    error=str(e),
+                    exc_info=True
+                )
+                self._stop.wait(self._retry_delay)
+
+    def _relist(self) -> None:
+        """List all objects and replace the cache."""
+        cache = {}
+        resource_version = None
+        continue_token = None
+
+        while True:
+            kwargs = {"limit": self._page_size, **self._selector_kwargs}
+            if self._request_timeout:
+                kwargs["_request_timeout"] = self._request_timeout
+            if continue_token:
+                kwargs["_continue"] = continue_token
+
+            with metrics.track_api_call("k8s", f"list_{self.resource_type.lower()}"):
+                result = self._list_fn(**kwargs)
+            for obj in result.items or []:
+                cache[self._key(obj)] = (self._stamp(obj), self._check_fn(obj))
+
+            # Every page of a paginated list is served from the same snapshot
+            resource_version = result.metadata.resource_version
+            continue_token = result.metadata._continue
+            if not continue_token:
+                break
+
+        with self._lock:
+            self._cache = cache
+        self._resource_version = resource_version
+        self._synced.set()
+
+        logger.info(
+            "Informer synced",
+            resource_type=self.resource_type,
+            objects=len(cache),
+            resource_version=resource_version
+        )
+
+    def _watch_once(self) -> None:
+        """Apply watch events until the watch times out or is stopped."""
+        self._watch = self._watch_factory()
+        try:
+            for event in self._watch.stream(
+                self._list_fn,
+                resource_version=self._resource_version,
+                timeout_seconds=self._watch_timeout,
+                allow_watch_bookmarks=True,
+                **self._selector_kwargs,
+            ):
+                if self._stop.is_set():
+                    break
+                self._apply(event["type"], event["object"])
+                if self._watch.resource_version:
+                    self._resource_version = self._watch.resource_version
+        finally:
+            self._watch.stop()
+            self._watch = None
+
+    def _apply(self, event_type: str, obj: Any) -> None:
+        """Apply a single watch event to the cache."""
+        if event_type == "BOOKMARK":
+            return
+
+        key = self._key(obj)
+        if event_type == "DELETED":
+            with self._lock:
+                self._cache.pop(key, None)
+            return
+
+        stamp = self._stamp(obj)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return  # Status-only update; the pod template is unchanged
+
+        issues = self._check_fn(obj)
+        with self._lock:
+            self._cache[key] = (stamp, issues)
+
+    @staticmethod
+    def _key(obj: Any) -> Tuple[str, str]:
+        return obj.metadata.namespace, obj.metadata.name
+
+    @staticmethod
+    def _stamp(obj: Any) -> Any:
+        """Return a value that changes whenever the checked fields can change."""
+        labels = obj.metadata.labels or {}
+        return obj.metadata.generation, tuple(sorted(labels.items()))
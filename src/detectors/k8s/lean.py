@@ -0,0 +1,105 @@
+"""Lean decoding of raw workload list responses.
+
+The generated Kubernetes models deserialize every field of every object,
+including managedFields, annotations and status. The detectors only read object
+metadata and container resources, so list pages are fetched with
+``_preload_content=False``, parsed as plain JSON and mapped onto the small
+slotted classes below. They expose the same attribute names as the generated
+models for the fields the checks use.
+"""
+
+from typing import Any, Dict, List
+
+from src.utils.serialization import loads
+
+
+class ListMeta:
+    __slots__ = ("_continue", "resource_version")
+
+    def __init__(self, data: Dict[str, Any]):
+        self._continue = data.get("continue") or None
+        self.resource_version = data.get("resourceVersion")
+
+
+class ObjectMeta:
+    __slots__ = ("name", "namespace", "uid", "labels", "generation", "resource_version")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.name = data.get("name")
+        self.namespace = data.get("namespace")
+        self.uid = data.get("uid")
+        self.labels = data.get("labels")
+        self.generation = data.get("generation")
+        self.resource_version = data.get("resourceVersion")
+
+
+class ResourceRequirements:
+    __slots__ = ("requests", "limits")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.requests = data.get("requests")
+        self.limits = data.get("limits")
+
+
+class Container:
+    __slots__ = ("name", "resources")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.name = data.get("name")
+        resources = data.get("resources")
+        self.resources = ResourceRequirements(resources) if resources else None
+
+
+class PodSpec:
+    __slots__ = ("containers",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self.containers = [Container(c) for c in data.get("containers") or ()]
+
+
+class PodTemplateSpec:
+    __slots__ = ("spec",)
+
+    def __init__(self, data: Dict[str, Any]):
+        spec = data.get("spec")
+        self.spec = PodSpec(spec) if spec else None
+
+
+class WorkloadSpec:
+    __slots__ = ("template",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self.template = PodTemplateSpec(data.get("template") or {})
+
+
+class Workload:
+    __slots__ = ("metadata", "spec")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.metadata = ObjectMeta(data.get("metadata") or {})
+        self.spec = WorkloadSpec(data.get("spec") or {})
+
+
+class WorkloadList:
+    __slots__ = ("items", "metadata")
+
+    def __init__(self, items: List[Workload], metadata: ListMeta):
+        self.items = items
+        self.metadata = metadata
+
+
+def decode_workload_list(raw: bytes) -> WorkloadList:
+    """Decode a raw list response into lean workload objects."""
+    document = loads(raw)
+    items = [Workload(item) for item in document.get("items") or ()]
+    return WorkloadList(items, ListMeta(document.get("metadata") or {}))
+
+
+def fetch_workload_list(list_fn: Any, **kwargs: Any) -> WorkloadList:
+    """Call a list function without model deserialization and decode the body."""
+    response = list_fn(_preload_content=False, **kwargs)
+    try:
+        return decode_workload_list(response.data)
+    finally:
+        response.release_conn()
+
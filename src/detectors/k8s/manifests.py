@@ -0,0 +1,303 @@
+"""Offline scanning of Kubernetes manifests on disk.
+
+Runs the same pod template checks as ``PodResourceDetector`` against YAML
+manifests in a directory tree (test fixtures, a GitOps checkout, ...), without
+a cluster. Files are parsed with libyaml's C loader across a process pool. A
+cache of per-file content hashes and parsed workloads lets unchanged files be
+skipped on the next run: a file whose size and mtime match is not even read,
+and one that was touched but not changed is hashed but not parsed. Parse
+errors are cached with the file too, so a broken manifest fails every run
+until it is fixed.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+import yaml
+
+from src.detectors.base.detector import IncompleteDetection, Issue
+from src.detectors.k8s.lean import Workload
+from src.detectors.k8s.pod_resources import PodResourceDetector
+
+logger = structlog.get_logger(__name__)
+
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:  # pragma: no cover - PyYAML built without libyaml
+    _Loader = yaml.SafeLoader
+
+MANIFEST_SUFFIXES = (".yaml", ".yml")
+
+# Kinds whose pod template lives at spec.template, as for the live detector
+WORKLOAD_KINDS = frozenset({"Deployment", "StatefulSet", "DaemonSet"})
+
+# Bumped whenever the cached workload format changes
+CACHE_VERSION = 2
+
+# Below this many files to parse, a process pool costs more than it saves
+POOL_THRESHOLD = 64
+
+
+def _content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _slim_workload(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the fields the checks read, so results are cheap to pickle and cache."""
+    metadata = document.get("metadata") or {}
+    spec = document.get("spec") or {}
+    template_spec = (spec.get("template") or {}).get("spec") or {}
+    return {
+        "kind": document["kind"],
+        "metadata": {
+            "name": metadata.get("name"),
+            "namespace": metadata.get("namespace"),
+            "labels": metadata.get("labels"),
+        },
+        "spec": {"template": {"spec": {"containers": [
+            {"name": container.get("name"), "resources": container.get("resources")}
+            for container in template_spec.get("containers") or ()
+            if isinstance(container, dict)
+        ]}}},
+    }
+
+
+def _iter_workloads(documents: Iterator[Any]) -> Iterator[Dict[str, Any]]:
+    for document in documents:
+        if not isinstance(document, dict):
+            continue
+        if document.get("kind") == "List":
+            yield from _iter_workloads(iter(document.get("items") or ()))
+        elif document.get("kind") in WORKLOAD_KINDS:
+            yield _slim_workload(document)
+
+
+def parse_manifest(
+    path: str, known_digest: Optional[str] = None
+) -> Tuple[str, Optional[list], Optional[str]]:
+    """Read, hash and parse one manifest file.
+
+    Runs in worker processes. Returns ``(digest, workloads, error)``;
+    ``workloads`` is None when the content still matches ``known_digest``.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return "", [], str(e)
+
+    digest = _content_digest(data)
+    if digest == known_digest:
+        return digest, None, None
+
+    try:
+        return digest, list(_iter_workloads(yaml.load_all(data, Loader=_Loader))), None
+    except yaml.YAMLError as e:
+        return digest, [], str(e).splitlines()[0]
+
+
+def _parse_task(task: Tuple[str, Optional[str]]) -> Tuple[str, Optional[list], Optional[str]]:
+    return parse_manifest(*task)
+
+
+class ManifestCache:
+    """JSON file of per-manifest stat info, content digest, parsed workloads and parse error."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data.get("files") or {}
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable manifest cache", path=path, error=str(e))
+
+    def save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        self.entries = entries
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "files": entries}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+
+class ManifestDetector(PodResourceDetector):
+    """Checks workload manifests in local directories instead of a live cluster."""
+
+    def __init__(self, config, paths: Optional[List[str]] = None):
+        super().__init__(config)
+        manifests = config.manifests
+        self.paths = list(paths if paths is not None else manifests.paths)
+        self.cluster = manifests.cluster_name
+        # Manifests have no live pods to measure
+        self.usage = None
+        self.workers = manifests.workers or os.cpu_count() or 1
+        self.cache = ManifestCache(manifests.cache_path)
+        self.stats: Dict[str, int] = {}
+        # Path of every manifest that failed to parse or check, with the error
+        self.errors: Dict[str, str] = {}
+
+    @property
+    def name(self) -> str:
+        return f"ManifestDetector[{','.join(self.paths)}]"
+
+    @property
+    def check_interval(self) -> Optional[int]:
+        return self.config.manifests.check_interval
+
+    @property
+    def check_jitter(self) -> Optional[float]:
+        return self.config.manifests.check_jitter
+
+    async def detect(self) -> List[Issue]:
+        """Check every manifest.
+
+        Raises ``IncompleteDetection``, carrying the issues of the manifests
+        that were checked, if any manifest could not be parsed or checked.
+        """
+        issues: List[Issue] = []
+        try:
+            async for batch in self.detect_stream():
+                issues.extend(batch)
+        except IncompleteDetection as e:
+            e.issues = issues
+            raise
+        return issues
+
+    async def detect_stream(self) -> AsyncIterator[List[Issue]]:
+        """Yield issues in batches of about ``k8s.page_size``.
+
+        A document that cannot be checked (e.g. an invalid quantity) is counted
+        in ``stats["errors"]`` and skipped; the other documents are still checked.
+        ``IncompleteDetection`` is raised after the last batch if any manifest
+        failed to parse or check.
+        """
+        workloads = await asyncio.to_thread(self.load_workloads)
+        batch: List[Issue] = []
+        for path, documents in workloads:
+            for document in documents:
+                try:
+                    workload = self._to_workload(document)
+                    if not self.owns_namespace(workload.metadata.namespace):
+                        continue
+                    issues = self._check_workload(document["kind"], workload)
+                except Exception as e:
+                    self._record_error(path, e)
+                    continue
+                for issue in issues:
+                    # id="" recomputes the id from the fingerprint, which includes the path
+                    batch.append(dataclasses.replace(
+                        issue, id="", metadata={**issue.metadata, "manifest": path}
+                    ))
+            if len(batch) >= self.config.k8s.page_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        if self.errors:
+            raise IncompleteDetection(
+                f"{len(self.errors)} manifest(s) could not be checked: "
+                + ", ".join(sorted(self.errors))
+            )
+
+    def load_workloads(self) -> List[Tuple[str, list]]:
+        """Return ``(path, workloads)`` for every manifest, reusing cached results."""
+        previous = self.cache.entries
+        entries: Dict[str, Dict[str, Any]] = {}
+        tasks: List[Tuple[str, str, os.stat_result]] = []
+        stats = {"files": 0, "unchanged": 0, "rehashed": 0, "parsed": 0, "errors": 0}
+        self.errors = {}
+
+        for full_path, key in self._discover():
+            stats["files"] += 1
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                continue
+            cached = previous.get(key)
+            if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                entries[key] = cached
+                stats["unchanged"] += 1
+                if cached.get("error"):
+                    self._record_parse_error(stats, key, cached["error"])
+            else:
+                tasks.append((full_path, key, stat))
+
+        results = self._parse(tasks, previous)
+        for (full_path, key, stat), (digest, workloads, error) in zip(tasks, results):
+            if workloads is None:
+                # Same content as before, so the same workloads and parse error
+                workloads = previous[key]["workloads"]
+                error = previous[key].get("error")
+                stats["rehashed"] += 1
+            else:
+                stats["parsed"] += 1
+            if error:
+                self._record_parse_error(stats, key, error)
+            entries[key] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": digest,
+                "workloads": workloads,
+                "error": error,
+            }
+
+        if tasks or len(entries) != len(previous):
+            self.cache.save(entries)
+        self.stats = stats
+        logger.info("Manifests loaded", paths=self.paths, **stats)
+        return [(key, entry["workloads"]) for key, entry in sorted(entries.items())]
+
+    def _record_parse_error(self, stats: Dict[str, int], path: str, error: str) -> None:
+        stats["errors"] += 1
+        self.errors[path] = error
+        logger.warning("Failed to parse manifest", path=path, error=error)
+
+    def _record_error(self, path: str, error: Exception) -> None:
+        self.stats["errors"] = self.stats.get("errors", 0) + 1
+        self.errors.setdefault(path, str(error))
+        logger.warning("Failed to check manifest", path=path, error=str(error))
+
+    def _discover(self) -> Iterator[Tuple[str, str]]:
+        """Yield (full path, cache key) for every manifest under the configured paths."""
+        for root_path in self.paths:
+            if os.path.isfile(root_path):
+                yield root_path, os.path.normpath(root_path)
+                continue
+            for directory, subdirs, files in os.walk(root_path):
+                subdirs[:] = sorted(d for d in subdirs if not d.startswith("."))
+                for filename in sorted(files):
+                    if filename.endswith(MANIFEST_SUFFIXES):
+                        full_path = os.path.join(directory, filename)
+                        yield full_path, os.path.normpath(full_path)
+
+    def _parse(self, tasks, previous) -> List[Tuple[str, Optional[list], Optional[str]]]:
+        args = [
+            (full_path, (previous.get(key) or {}).get("digest"))
+            for full_path, key, _ in tasks
+        ]
+        if len(args) < POOL_THRESHOLD or self.workers <= 1:
+            return [_parse_task(arg) for arg in args]
+
+        chunksize = max(1, len(args) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(_parse_task, args, chunksize=chunksize))
+
+    @staticmethod
+    def _to_workload(document: Dict[str, Any]) -> Workload:
+        workload = Workload(document)
+        if not workload.metadata.namespace:
+            workload.metadata.namespace = "default"
+        return workload
@@ -1,12 +1,28 @@
 """Detector for Kubernetes Pod resource configurations."""
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import dataclasses
+import functools
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
 import structlog
-from kubernetes import client, config as k8s_config
-from kubernetes.client.rest import ApiException
 
-from src.detectors.base.detector import BaseDetector, Issue, Platform, Severity
+from src.detectors.base.detector import BaseDetector, Issue, Platform
+from src.detectors.k8s.client import build_api_client, connection_pool_stats, request_timeout
+from src.detectors.k8s.lean import fetch_workload_list
+from src.detectors.k8s.quantity import parse_bytes, parse_cpu_cores
+from src.metrics import prometheus as metrics
+from src.rules import builtin
+from src.rules.base import ContainerFacts, Target
+from src.rules.engine import RulePlan
+from src.utils.cache import LRUCache
+
+if TYPE_CHECKING:
+    from kubernetes import client
 
+    from src.analyzers.fleet import FleetAnalyzer, FleetColumns
+    from src.analyzers.usage import UsageCollector
+    from src.detectors.k8s.informer import WorkloadInformer
 
 logger = structlog.get_logger(__name__)
 
@@ -15,19 +31,75 @@ class PodResourceDetector(BaseDetector):
     """Detects Pods without resource limits/requests and over-provisioned Pods."""
 
     # Resource thresholds for detection
-    OVER_PROVISIONED_CPU_THRESHOLD = 2.0  # CPU cores
-    OVER_PROVISIONED_MEMORY_THRESHOLD = 4 * 1024 * 1024 * 1024  # 4Gi in bytes
+    OVER_PROVISIONED_CPU_THRESHOLD = builtin.OVER_PROVISIONED_CPU_THRESHOLD
+    OVER_PROVISIONED_MEMORY_THRESHOLD = builtin.OVER_PROVISIONED_MEMORY_THRESHOLD
 
     # Recommended default resources
-    DEFAULT_CPU_REQUEST = "100m"
-    DEFAULT_CPU_LIMIT = "200m"
-    DEFAULT_MEMORY_REQUEST = "128Mi"
-    DEFAULT_MEMORY_LIMIT = "256Mi"
-
-    def __init__(self, config):
+    DEFAULT_CPU_REQUEST = builtin.DEFAULT_CPU_REQUEST
+    DEFAULT_CPU_LIMIT = builtin.DEFAULT_CPU_LIMIT
+    DEFAULT_MEMORY_REQUEST = builtin.DEFAULT_MEMORY_REQUEST
+    DEFAULT_MEMORY_LIMIT = builtin.DEFAULT_MEMORY_LIMIT
+
+    # Every container check, compiled once into a single pass per container
+    RULES = RulePlan(builtin.DEFAULT_RULES)
+
+    # System namespaces that are never checked
+    SKIP_NAMESPACES = frozenset({
+        'kube-system', 'kube-public', 'kube-node-lease', 'local-path-storage'
+    })
+    # Exclude them server-side too, so they are never sent over the wire
+    NAMESPACE_FIELD_SELECTOR = ",".join(
+        f"metadata.namespace!={namespace}" for namespace in sorted(SKIP_NAMESPACES)
+    )
+
+    # AppsV1Api list method for each workload kind
+    WORKLOAD_LISTERS = {
+        "Deployment": "list_deployment_for_all_namespaces",
+        "StatefulSet": "list_stateful_set_for_all_namespaces",
+        "DaemonSet": "list_daemon_set_for_all_namespaces",
+    }
+
+    # Per-namespace list methods, used when replicas shard the cluster by namespace
+    NAMESPACED_LISTERS = {
+        "Deployment": "list_namespaced_deployment",
+        "StatefulSet": "list_namespaced_stateful_set",
+        "DaemonSet": "list_namespaced_daemon_set",
+    }
+
+    # Times a listing restarts after its continue token expired before giving up
+    MAX_RELISTS = 3
+
+    shard_by_namespace = True
+
+    def __init__(self, config, context: Optional[Dict[str, Any]] = None):
         super().__init__(config)
-        self._k8s_client: Optional[client.AppsV1Api] = None
-        self._core_v1_client: Optional[client.CoreV1Api] = None
+        self.context = context.get("name") if context else None
+        self.cluster = self._cluster_name(config, context)
+        # The kubernetes package is loaded when the first detection starts
+        self._api_client: Optional["client.ApiClient"] = None
+        self._k8s_client: Optional["client.AppsV1Api"] = None
+        self._core_v1_client: Optional["client.CoreV1Api"] = None
+        self._informers: List["WorkloadInformer"] = []
+        self._template_cache = LRUCache(maxsize=config.k8s.template_cache_size)
+        # Usage-based right-sizing; httpx is only loaded when it is enabled
+        self.usage: Optional["UsageCollector"] = None
+        if config.metrics_source.enabled:
+            from src.analyzers.usage import UsageCollector
+
+            self.usage = UsageCollector(
+                config.metrics_source, cluster=self.cluster, grafana=config.grafana
+            )
+        # Fleet-wide comparison of the listed containers; NumPy is loaded on analysis
+        self.fleet: Optional["FleetAnalyzer"] = None
+        if config.k8s.fleet_analysis:
+            from src.analyzers.fleet import FleetAnalyzer
+
+            self.fleet = FleetAnalyzer()
+            if config.k8s.watch:
+                logger.warning(
+                    "Fleet analysis needs workload listing and is skipped with k8s.watch",
+                    cluster=self.cluster,
+                )
 
     def _initialize_k8s_client(self) -> None:
         """Initialize Kubernetes client."""
@@ -35,19 +107,44 @@ class PodResourceDetector(BaseDetector):
             return
 
         try:
-            if self.config.k8s.in_cluster:
-                k8s_config.load_incluster_config()
-                logger.info("Loaded in-cluster Kubernetes configuration")
-            else:
-                k8s_config.load_kube_config()
-                logger.info("Loaded kubeconfig from local environment")
+            from kubernetes import client
 
-            self._k8s_client = client.AppsV1Api()
-            self._core_v1_client = client.CoreV1Api()
+            self._api_client = build_api_client(self.config.k8s, context=self.context)
+            self._k8s_client = client.AppsV1Api(self._api_client)
+            self._core_v1_client = client.CoreV1Api(self._api_client)
         except Exception as e:
-            logger.error("Failed to initialize Kubernetes client", error=str(e))
+            logger.error(
+                "Failed to initialize Kubernetes client",
+                cluster=self.cluster,
+                error=str(e)
+            )
             raise
 
+    @staticmethod
+    def _cluster_name(config, context: Optional[Dict[str, Any]]) -> str:
+        """Return the name issues from this detector are tagged with."""
+        if context:
+            return context.get("cluster") or context["name"]
+        if config.k8s.in_cluster:
+            return config.k8s.cluster_name or "in-cluster"
+        return config.k8s.cluster_name or "default"
+
+    @property
+    def name(self) -> str:
+        return f"{self.__class__.__name__}[{self.cluster}]"
+
+    @property
+    def check_interval(self) -> Optional[int]:
+        return self.config.k8s.check_interval
+
+    @property
+    def check_jitter(self) -> Optional[float]:
+        return self.config.k8s.check_jitter
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """Return connection reuse counters for this cluster's API client."""
+        return connection_pool_stats(self._api_client)
+
     @property
     def platform(self) -> Platform:
         return Platform.K8S
@@ -57,120 +154,447 @@ class PodResourceDetector(BaseDetector):
         return "Pod"
 
     async def detect(self) -> List[Issue]:
-        """Detect Pods missing resource configurations and over-provisioned Pods."""
+        """Detect Pods missing resource configurations and over-provisioned Pods.
+
+        Failures are logged and re-raised so the run is recorded as failed;
+        an empty result would resolve every open issue of this cluster.
+        """
         issues = []
-        logger.info("Running Pod resource detection")
+        logger.info("Running Pod resource detection", cluster=self.cluster)
 
         try:
-            self._initialize_k8s_client()
+            await asyncio.to_thread(self._initialize_k8s_client)
+            await self._refresh_usage()
 
-            # Check all Deployments
-            deployment_issues = await self._check_deployments()
-            issues.extend(deployment_issues)
-
-            # Check all StatefulSets
-            statefulset_issues = await self._check_statefulsets()
-            issues.extend(statefulset_issues)
+            if self.config.k8s.watch:
+                # Served from the watch-maintained cache, no re-list needed
+                issues = await self._collect_informer_issues()
+            else:
+                # List Deployments, StatefulSets and DaemonSets in parallel
+                namespaces = await self._listing_namespaces()
+                fleet = self._fleet_columns()
+                results = await asyncio.gather(
+                    self._check_deployments(namespaces, fleet),
+                    self._check_statefulsets(namespaces, fleet),
+                    self._check_daemonsets(namespaces, fleet),
+                )
+                for workload_issues in results:
+                    issues.extend(workload_issues)
+                if fleet is not None:
+                    issues.extend(await self._analyze_fleet(fleet))
 
-            # Check all DaemonSets
-            daemonset_issues = await self._check_daemonsets()
-            issues.extend(daemonset_issues)
+            connections = self.connection_stats()
+            metrics.K8S_CONNECTIONS.labels(self.cluster).set(connections["connections"])
+            metrics.K8S_REQUESTS.labels(self.cluster).set(connections["requests"])
 
             logger.info(
                 "Pod resource detection completed",
-                total_issues=len(issues)
+                cluster=self.cluster,
+                total_issues=len(issues),
+                template_cache=self._template_cache.stats(),
+                connections=connections
             )
         except Exception as e:
             logger.error(
                 "Pod resource detection failed",
+                cluster=self.cluster,
                 error=str(e),
                 exc_info=True
             )
+            raise
 
         return issues
 
-    async def _check_deployments(self) -> List[Issue]:
-        """Check Deployments for resource issues."""
-        issues = []
+    async def detect_stream(self) -> AsyncIterator[List[Issue]]:
+        """Yield issues one page of workloads at a time.
 
-        try:
-            deployments = self._k8s_client.list_deployment_for_all_namespaces()
-            logger.debug(f"Found {len(deployments.items)} deployments to check")
-
-            for deployment in deployments.items:
-                if self._should_skip_namespace(deployment.metadata.namespace):
-                    continue
-
-                deployment_issues = self._check_pod_template(
-                    name=deployment.metadata.name,
-                    namespace=deployment.metadata.namespace,
-                    resource_type="Deployment",
-                    pod_spec=deployment.spec.template.spec,
-                    labels=deployment.metadata.labels or {}
+        Kinds are listed one after another rather than in parallel, so at most
+        one page of workloads and its issues is held at any time.
+        """
+        await asyncio.to_thread(self._initialize_k8s_client)
+        await self._refresh_usage()
+
+        if self.config.k8s.watch:
+            yield await self._collect_informer_issues()
+            return
+
+        namespaces = await self._listing_namespaces()
+        fleet = self._fleet_columns()
+        for resource_type in self.WORKLOAD_LISTERS:
+            async for page_issues in self._iter_workload_issues(resource_type, namespaces, fleet):
+                if page_issues:
+                    yield page_issues
+        if fleet is not None:
+            fleet_issues = await self._analyze_fleet(fleet)
+            if fleet_issues:
+                yield fleet_issues
+
+    def close(self) -> None:
+        """Stop any running informers and release the connection pool."""
+        for informer in self._informers:
+            informer.stop()
+        self._informers = []
+        if self._api_client is not None:
+            self._api_client.close()
+
+    async def _collect_informer_issues(self) -> List[Issue]:
+        """Return issues from the list/watch informers, starting them on first use."""
+        if not self._informers:
+            from src.detectors.k8s.informer import WorkloadInformer
+
+            for resource_type, lister in self.WORKLOAD_LISTERS.items():
+                informer = WorkloadInformer(
+                    resource_type=resource_type,
+                    list_fn=getattr(self._k8s_client, lister),
+                    check_fn=functools.partial(self._check_workload, resource_type),
+                    page_size=self.config.k8s.page_size,
+                    watch_timeout=self.config.k8s.watch_timeout,
+                    field_selector=self.NAMESPACE_FIELD_SELECTOR,
+                    request_timeout=request_timeout(self.config.k8s),
                 )
-                issues.extend(deployment_issues)
+                informer.start()
+                self._informers.append(informer)
 
-        except ApiException as e:
-            logger.error("Failed to list deployments", error=str(e))
+        issues: List[Issue] = []
+        for informer in self._informers:
+            synced = await asyncio.to_thread(
+                informer.wait_for_sync, self.config.k8s.sync_timeout
+            )
+            if not synced:
+                # A partially filled cache is not a complete view of the cluster
+                raise RuntimeError(
+                    f"{informer.resource_type} informer not synced "
+                    f"within {self.config.k8s.sync_timeout}s"
+                )
+            # Informers cache every workload; ownership is applied on read so
+            # a rebalance takes effect without re-checking anything
+            issues.extend(
+                issue for issue in informer.issues() if self.owns_namespace(issue.namespace)
+            )
+        return self._apply_usage(issues)
 
-        return issues
+    async def _check_deployments(
+        self,
+        namespaces: Optional[List[Optional[str]]] = None,
+        fleet: Optional["FleetColumns"] = None,
+    ) -> List[Issue]:
+        """Check Deployments for resource issues."""
+        return await self._check_workloads("Deployment", namespaces, fleet)
 
-    async def _check_statefulsets(self) -> List[Issue]:
+    async def _check_statefulsets(
+        self,
+        namespaces: Optional[List[Optional[str]]] = None,
+        fleet: Optional["FleetColumns"] = None,
+    ) -> List[Issue]:
         """Check StatefulSets for resource issues."""
+        return await self._check_workloads("StatefulSet", namespaces, fleet)
+
+    async def _check_daemonsets(
+        self,
+        namespaces: Optional[List[Optional[str]]] = None,
+        fleet: Optional["FleetColumns"] = None,
+    ) -> List[Issue]:
+        """Check DaemonSets for resource issues."""
+        return await self._check_workloads("DaemonSet", namespaces, fleet)
+
+    async def _check_workloads(
+        self,
+        resource_type: str,
+        namespaces: Optional[List[Optional[str]]] = None,
+        fleet: Optional["FleetColumns"] = None,
+    ) -> List[Issue]:
+        """Collect issues for every workload of the given kind."""
         issues = []
+        async for page_issues in self._iter_workload_issues(resource_type, namespaces, fleet):
+            issues.extend(page_issues)
+        return issues
 
-        try:
-            statefulsets = self._k8s_client.list_stateful_set_for_all_namespaces()
-            logger.debug(f"Found {len(statefulsets.items)} statefulsets to check")
-
-            for statefulset in statefulsets.items:
-                if self._should_skip_namespace(statefulset.metadata.namespace):
-                    continue
-
-                statefulset_issues = self._check_pod_template(
-                    name=statefulset.metadata.name,
-                    namespace=statefulset.metadata.namespace,
-                    resource_type="StatefulSet",
-                    pod_spec=statefulset.spec.template.spec,
-                    labels=statefulset.metadata.labels or {}
-                )
-                issues.extend(statefulset_issues)
+    async def _iter_workload_issues(
+        self,
+        resource_type: str,
+        namespaces: Optional[List[Optional[str]]] = None,
+        fleet: Optional["FleetColumns"] = None,
+    ) -> AsyncIterator[List[Issue]]:
+        """Yield the issues found on each page of workloads of the given kind.
+
+        ``namespaces`` comes from ``_listing_namespaces``; None in it (the
+        default) lists all namespaces in one paginated listing. Checked
+        workloads are also added to ``fleet`` when given.
+        """
+        from kubernetes.client.rest import ApiException
 
+        try:
+            for namespace in namespaces or [None]:
+                async for page in self._iter_workload_pages(resource_type, namespace):
+                    page_issues = []
+                    for workload in page:
+                        if not self.owns_namespace(workload.metadata.namespace):
+                            continue
+                        page_issues.extend(self._check_workload(resource_type, workload))
+                        if fleet is not None and not self._should_skip_namespace(
+                            workload.metadata.namespace
+                        ):
+                            fleet.add_workload(resource_type, workload)
+                    del page  # Drop the page before the next one is fetched
+                    yield self._apply_usage(page_issues)
         except ApiException as e:
-            logger.error("Failed to list statefulsets", error=str(e))
+            # A partial listing must not pass for a complete one, or workloads
+            # on the missing pages would look fixed
+            logger.error(
+                "Failed to list workloads",
+                resource_type=resource_type,
+                error=str(e)
+            )
+            raise
 
+    def _fleet_columns(self) -> Optional["FleetColumns"]:
+        """Return empty columns to collect this run's containers in, if fleet analysis is on."""
+        if self.fleet is None:
+            return None
+        from src.analyzers.fleet import FleetColumns
+
+        return FleetColumns()
+
+    async def _analyze_fleet(self, columns: "FleetColumns") -> List[Issue]:
+        """Compare the listed containers with their namespaces; runs off the event loop."""
+        fleet = self.fleet
+        if fleet is None or not len(columns):
+            return []
+        report = await asyncio.to_thread(fleet.analyze, columns)
+        issues = await asyncio.to_thread(report.issues, self.cluster)
+        logger.info(
+            "Fleet analysis completed",
+            cluster=self.cluster,
+            containers=len(columns),
+            issues=len(issues),
+        )
         return issues
 
-    async def _check_daemonsets(self) -> List[Issue]:
-        """Check DaemonSets for resource issues."""
-        issues = []
-
-        try:
-            daemonsets = self._k8s_client.list_daemon_set_for_all_namespaces()
-            logger.debug(f"Found {len(daemonsets.items)} daemonsets to check")
-
-            for daemonset in daemonsets.items:
-                if self._should_skip_namespace(daemonset.metadata.namespace):
-                    continue
-
-                daemonset_issues = self._check_pod_template(
-                    name=daemonset.metadata.name,
-                    namespace=daemonset.metadata.namespace,
-                    resource_type="DaemonSet",
-                    pod_spec=daemonset.spec.template.spec,
-                    labels=daemonset.metadata.labels or {}
+    async def _listing_namespaces(self) -> List[Optional[str]]:
+        """Return the namespaces to list workloads in; ``[None]`` means all at once.
+
+        When several replicas share this cluster by namespace, each lists only
+        the namespaces it owns, so the objects every replica fetches and
+        decodes shrink as replicas are added. A single replica keeps the one
+        cluster-wide listing, which needs fewer calls.
+        """
+        if self.shard is None or len(self.shard.members) <= 1:
+            return [None]
+        names = await asyncio.to_thread(self._list_namespace_names)
+        return [
+            namespace for namespace in names
+            if not self._should_skip_namespace(namespace) and self.owns_namespace(namespace)
+        ]
+
+    def _list_namespace_names(self) -> List[str]:
+        """List the names of all namespaces of this cluster."""
+        core_v1 = self._core_v1_client
+        if core_v1 is None:
+            raise RuntimeError("Kubernetes client is not initialized")
+        names: List[str] = []
+        continue_token = None
+        while True:
+            kwargs = {
+                "limit": self.config.k8s.page_size,
+                "_request_timeout": request_timeout(self.config.k8s),
+            }
+            if continue_token:
+                kwargs["_continue"] = continue_token
+            with metrics.track_api_call("k8s", "list_namespace"):
+                result = core_v1.list_namespace(**kwargs)
+            for item in result.items or ():
+                if item.metadata and item.metadata.name:
+                    names.append(item.metadata.name)
+            continue_token = result.metadata._continue if result.metadata else None
+            if not continue_token:
+                return sorted(names)
+
+    async def _iter_workload_pages(
+        self, resource_type: str, namespace: Optional[str] = None
+    ) -> AsyncIterator[List[Any]]:
+        """Page through a workload listing with limit/continue.
+
+        Only one page of deserialized objects is held at a time, so peak memory
+        is bounded by ``k8s.page_size`` rather than by the size of the cluster.
+
+        When the continue token expires (410 Gone) the listing restarts from
+        the beginning. Lists are ordered by namespace/name, so objects up to
+        the last one already yielded are skipped instead of checked twice.
+        """
+        from kubernetes.client.rest import ApiException
+
+        from src.detectors.k8s.informer import HTTP_GONE
+
+        if namespace is None:
+            list_fn = getattr(self._k8s_client, self.WORKLOAD_LISTERS[resource_type])
+            field_selector = self.NAMESPACE_FIELD_SELECTOR
+        else:
+            lister = getattr(self._k8s_client, self.NAMESPACED_LISTERS[resource_type])
+            list_fn = functools.partial(lister, namespace)
+            field_selector = None
+        continue_token = None
+        last_key: Optional[str] = None
+        resume_after: Optional[str] = None
+        relists = 0
+
+        while True:
+            kwargs = {
+                "limit": self.config.k8s.page_size,
+                "_request_timeout": request_timeout(self.config.k8s),
+            }
+            if field_selector:
+                kwargs["field_selector"] = field_selector
+            if continue_token:
+                kwargs["_continue"] = continue_token
+
+            try:
+                with metrics.track_api_call("k8s", f"list_{resource_type.lower()}"):
+                    if self.config.k8s.lean_listing:
+                        result = await asyncio.to_thread(fetch_workload_list, list_fn, **kwargs)
+                    else:
+                        result = await asyncio.to_thread(list_fn, **kwargs)
+            except ApiException as e:
+                if e.status != HTTP_GONE or relists >= self.MAX_RELISTS:
+                    raise
+                relists += 1
+                logger.warning(
+                    "Continue token expired, relisting",
+                    resource_type=resource_type,
+                    relists=relists
                 )
-                issues.extend(daemonset_issues)
+                continue_token = None
+                resume_after = last_key
+                continue
+            continue_token = result.metadata._continue if result.metadata else None
+            items = result.items or []
+            del result
+
+            if resume_after is not None:
+                items = [item for item in items if self._list_key(item) > resume_after]
+                if items:
+                    resume_after = None
+            if items:
+                last_key = self._list_key(items[-1])
+
+            logger.debug("Listed workload page", resource_type=resource_type, count=len(items))
+            yield items
+
+            if not continue_token:
+                break
+
+    @staticmethod
+    def _list_key(workload: Any) -> str:
+        """Return the key the API server orders list results by."""
+        metadata = workload.metadata
+        return f"{metadata.namespace or ''}/{metadata.name or ''}"
+
+    async def _refresh_usage(self) -> None:
+        """Pull new usage samples; on failure the previous samples are kept."""
+        if self.usage is None:
+            return
+        try:
+            await self.usage.refresh(
+                lambda namespace: not self._should_skip_namespace(namespace)
+                and self.owns_namespace(namespace)
+            )
+        except Exception as e:
+            logger.warning("Usage refresh failed", cluster=self.cluster, error=str(e))
 
-        except ApiException as e:
-            logger.error("Failed to list daemonsets", error=str(e))
+    def _apply_usage(self, issues: List[Issue]) -> List[Issue]:
+        """Replace static over-provisioning recommendations with usage-based ones.
 
-        return issues
+        Applied after the template cache, so cached issues pick up new usage.
+        """
+        if self.usage is None:
+            return issues
+        return [
+            self._usage_recommendation(issue) if issue.check == "over_provisioned" else issue
+            for issue in issues
+        ]
+
+    def _usage_recommendation(self, issue: Issue) -> Issue:
+        container = issue.metadata.get("container")
+        static = issue.recommended_value
+        if self.usage is None or issue.namespace is None or container is None or not static:
+            return issue
+        recommendation = self.usage.recommend(issue.namespace, issue.resource_name, container)
+        if recommendation is None:
+            return issue
+        return dataclasses.replace(
+            issue,
+            recommended_value={
+                "requests": {**static["requests"], **recommendation["requests"]},
+                "limits": {**static["limits"], **recommendation["limits"]},
+            },
+            metadata={
+                **issue.metadata,
+                "recommendation_source": "usage",
+                "usage": recommendation["usage"],
+                "usage_percentile": recommendation["percentile"],
+                "usage_samples": recommendation["samples"],
+            },
+        )
+
+    def owns_namespace(self, namespace: Optional[str]) -> bool:
+        """Return True if this replica scans ``namespace`` of this cluster."""
+        return self.owns(f"{self.cluster}/{namespace or ''}")
+
+    def _check_workload(self, resource_type: str, workload: Any) -> List[Issue]:
+        """Check a single workload object's pod template."""
+        metadata = workload.metadata
+        if self._should_skip_namespace(metadata.namespace):
+            return []
+
+        pod_spec = workload.spec.template.spec
+        labels = metadata.labels or {}
+
+        # Unchanged templates map to the same key, so the issues built last time
+        # are reused instead of being rebuilt every cycle. The uid tells apart
+        # an object recreated under the same name, whose generation restarts at 1.
+        generation = metadata.generation
+        key = (
+            resource_type,
+            metadata.namespace,
+            metadata.name,
+            metadata.uid,
+            generation if generation is not None else self._template_hash(pod_spec),
+            tuple(sorted(labels.items())),
+        )
+        cached = self._template_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        issues = self._check_pod_template(
+            name=metadata.name,
+            namespace=metadata.namespace,
+            resource_type=resource_type,
+            pod_spec=pod_spec,
+            labels=labels
+        )
+        self._template_cache.put(key, issues)
+        return list(issues)
+
+    @staticmethod
+    def _template_hash(pod_spec: Any) -> int:
+        """Hash the container fields the checks read, for objects without a generation."""
+        if not pod_spec or not pod_spec.containers:
+            return 0
+
+        parts = []
+        for container in pod_spec.containers:
+            resources = container.resources
+            requests = resources.requests if resources else None
+            limits = resources.limits if resources else None
+            parts.append((
+                container.name,
+                tuple(sorted(requests.items())) if requests else None,
+                tuple(sorted(limits.items())) if limits else None,
+            ))
+        return hash(tuple(parts))
 
     def _should_skip_namespace(self, namespace: str) -> bool:
         """Check if namespace should be skipped (system namespaces)."""
-        skip_namespaces = {'kube-system', 'kube-public', 'kube-node-lease', 'local-path-storage'}
-        return namespace in skip_namespaces
+        return namespace in self.SKIP_NAMESPACES
 
     def _check_pod_template(
         self,
@@ -186,20 +610,9 @@ class PodResourceDetector(BaseDetector):
         if not pod_spec or not pod_spec.containers:
             return issues
 
+        target = Target(name, namespace, resource_type, self.cluster, labels)
         for container in pod_spec.containers:
-            # Check for missing resources
-            missing_issue = self._check_missing_resources(
-                name, namespace, resource_type, container, labels
-            )
-            if missing_issue:
-                issues.append(missing_issue)
-
-            # Check for over-provisioned resources
-            over_provisioned_issue = self._check_over_provisioned(
-                name, namespace, resource_type, container, labels
-            )
-            if over_provisioned_issue:
-                issues.append(over_provisioned_issue)
+            issues.extend(self.RULES.check_container(container, target))
 
         return issues
 
@@ -212,55 +625,9 @@ class PodResourceDetector(BaseDetector):
         labels: Dict[str, str]
     ) -> Optional[Issue]:
         """Check if container is missing resource limits/requests."""
-        resources = container.resources
-
-        missing_limits = not resources or not resources.limits
-        missing_requests = not resources or not resources.requests
-
-        if not missing_limits and not missing_requests:
-            return None
-
-        # Determine what's missing
-        missing_items = []
-        if missing_requests:
-            missing_items.append("requests")
-        if missing_limits:
-            missing_items.append("limits")
-
-        return Issue(
-            platform=Platform.K8S,
-            resource_type=resource_type,
-            resource_name=name,
-            namespace=namespace,
-            severity=Severity.MEDIUM,
-            title=f"Missing resource {'/'.join(missing_items)}",
-            description=(
-                f"Container '{container.name}' in {resource_type} '{name}' "
-                f"is missing resource {'/'.join(missing_items)}. "
-                f"This can lead to unpredictable scheduling and potential resource contention."
-            ),
-            auto_fixable=True,
-            current_value={
-                "container": container.name,
-                "requests": self._resource_to_dict(resources.requests) if resources and resources.requests else None,
-                "limits": self._resource_to_dict(resources.limits) if resources and resources.limits else None,
-            },
-            recommended_value={
-                "requests": {
-                    "cpu": self.DEFAULT_CPU_REQUEST,
-                    "memory": self.DEFAULT_MEMORY_REQUEST,
-                },
-                "limits": {
-                    "cpu": self.DEFAULT_CPU_LIMIT,
-                    "memory": self.DEFAULT_MEMORY_LIMIT,
-                },
-            },
-            tags=labels,
-            metadata={
-                "container": container.name,
-                "missing_requests": missing_requests,
-                "missing_limits": missing_limits,
-            }
+        return builtin.MISSING_RESOURCES.apply(
+            ContainerFacts(container),
+            Target(name, namespace, resource_type, self.cluster, labels),
         )
 
     def _check_over_provisioned(
@@ -272,68 +639,9 @@ class PodResourceDetector(BaseDetector):
         labels: Dict[str, str]
     ) -> Optional[Issue]:
         """Check if container is over-provisioned."""
-        resources = container.resources
-
-        if not resources or not resources.requests:
-            return None
-
-        cpu_request = resources.requests.get('cpu')
-        memory_request = resources.requests.get('memory')
-
-        # Parse CPU (convert to cores)
-        cpu_cores = self._parse_cpu(cpu_request) if cpu_request else 0
-        # Parse memory (convert to bytes)
-        memory_bytes = self._parse_memory(memory_request) if memory_request else 0
-
-        is_over_provisioned = (
-            cpu_cores > self.OVER_PROVISIONED_CPU_THRESHOLD or
-            memory_bytes > self.OVER_PROVISIONED_MEMORY_THRESHOLD
-        )
-
-        if not is_over_provisioned:
-            return None
-
-        # Calculate recommended values (50% of current)
-        recommended_cpu = f"{int(cpu_cores * 500)}m"  # 50% in millicores
-        recommended_memory = f"{int(memory_bytes / (1024 * 1024) * 0.5)}Mi"  # 50% in MiB
-
-        return Issue(
-            platform=Platform.K8S,
-            resource_type=resource_type,
-            resource_name=name,
-            namespace=namespace,
-            severity=Severity.LOW,
-            title="Over-provisioned resources",
-            description=(
-                f"Container '{container.name}' in {resource_type} '{name}' "
-                f"has excessive resource requests (CPU: {cpu_request}, Memory: {memory_request}). "
-                f"Consider reducing to optimize cluster utilization."
-            ),
-            auto_fixable=True,
-            current_value={
-                "container": container.name,
-                "requests": {
-                    "cpu": cpu_request,
-                    "memory": memory_request,
-                },
-                "limits": self._resource_to_dict(resources.limits) if resources.limits else None,
-            },
-            recommended_value={
-                "requests": {
-                    "cpu": recommended_cpu,
-                    "memory": recommended_memory,
-                },
-                "limits": {
-                    "cpu": f"{int(cpu_cores * 1000)}m",  # 2x of recommended request
-                    "memory": f"{int(memory_bytes / (1024 * 1024))}Mi",
-                },
-            },
-            tags=labels,
-            metadata={
-                "container": container.name,
-                "cpu_cores": cpu_cores,
-                "memory_bytes": memory_bytes,
-            }
+        return builtin.OVER_PROVISIONED.apply(
+            ContainerFacts(container),
+            Target(name, namespace, resource_type, self.cluster, labels),
         )
 
     def _resource_to_dict(self, resources: Optional[Dict]) -> Optional[Dict[str, str]]:
@@ -346,40 +654,10 @@ class PodResourceDetector(BaseDetector):
         """Parse CPU string to cores (float)."""
         if not cpu_str:
             return 0.0
-
-        cpu_str = str(cpu_str).strip()
-
-        # Handle millicores (e.g., "100m")
-        if cpu_str.endswith('m'):
-            return float(cpu_str[:-1]) / 1000.0
-
-        # Handle cores (e.g., "1", "0.5")
-        return float(cpu_str)
+        return parse_cpu_cores(cpu_str)
 
     def _parse_memory(self, memory_str: str) -> int:
         """Parse memory string to bytes (int)."""
         if not memory_str:
             return 0
-
-        memory_str = str(memory_str).strip()
-
-        # Define multipliers
-        multipliers = {
-            'Ki': 1024,
-            'Mi': 1024 ** 2,
-            'Gi': 1024 ** 3,
-            'Ti': 1024 ** 4,
-            'K': 1000,
-            'M': 1000 ** 2,
-            'G': 1000 ** 3,
-            'T': 1000 ** 4,
-        }
-
-        # Try to match suffix
-        for suffix, multiplier in multipliers.items():
-            if memory_str.endswith(suffix):
-                value = float(memory_str[:-len(suffix)])
-                return int(value * multiplier)
-
-        # No suffix, assume bytes
-        return int(float(memory_str))
+        return parse_bytes(memory_str)
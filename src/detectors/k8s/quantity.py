@@ -0,0 +1,87 @@
+"""Kubernetes resource quantity parsing.
+
+Implements the ``resource.Quantity`` grammar: a signed decimal number followed
+by a binary SI suffix (Ki..Ei), a decimal SI suffix (n, u, m, k, M..E) or a
+decimal exponent (e.g. ``1e3``). Values are returned as exact integer
+milli-units, rounded up like ``Quantity.MilliValue()``.
+
+Quantity strings repeat heavily across containers ("100m", "128Mi", ...), so
+parsed results are memoized.
+"""
+
+import functools
+import math
+import re
+import sys
+from fractions import Fraction
+from typing import Any
+
+_QUANTITY_RE = re.compile(
+    r"^([+-]?(?:\d+\.?\d*|\.\d+))"  # number
+    r"(?:([eE][+-]?\d+)|(Ki|Mi|Gi|Ti|Pi|Ei|[numkKMGTPE]))?$"  # exponent or suffix
+)
+
+_SUFFIX_MULTIPLIERS = {
+    "Ki": Fraction(2 ** 10),
+    "Mi": Fraction(2 ** 20),
+    "Gi": Fraction(2 ** 30),
+    "Ti": Fraction(2 ** 40),
+    "Pi": Fraction(2 ** 50),
+    "Ei": Fraction(2 ** 60),
+    "n": Fraction(1, 10 ** 9),
+    "u": Fraction(1, 10 ** 6),
+    "m": Fraction(1, 10 ** 3),
+    "k": Fraction(10 ** 3),
+    "K": Fraction(10 ** 3),  # Not canonical, but accepted for compatibility
+    "M": Fraction(10 ** 6),
+    "G": Fraction(10 ** 9),
+    "T": Fraction(10 ** 12),
+    "P": Fraction(10 ** 15),
+    "E": Fraction(10 ** 18),
+}
+
+MEMO_SIZE = 4096
+
+
+def parse_quantity_milli(quantity: Any) -> int:
+    """Parse a Kubernetes quantity into integer milli-units.
+
+    ``"100m"`` -> 100, ``"2"`` -> 2000, ``"1Ki"`` -> 1024000.
+
+    Raises:
+        ValueError: If the value is not a valid quantity.
+    """
+    if not isinstance(quantity, str):
+        quantity = str(quantity)
+    return _parse_milli(sys.intern(quantity.strip()))
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _parse_milli(quantity: str) -> int:
+    match = _QUANTITY_RE.match(quantity)
+    if match is None:
+        raise ValueError(f"Invalid quantity: {quantity!r}")
+
+    number, exponent, suffix = match.groups()
+    value = Fraction(number)
+    if exponent:
+        value *= Fraction(10) ** int(exponent[1:])
+    elif suffix:
+        value *= _SUFFIX_MULTIPLIERS[suffix]
+
+    return math.ceil(value * 1000)
+
+
+def parse_cpu_cores(quantity: Any) -> float:
+    """Parse a CPU quantity into cores."""
+    return parse_quantity_milli(quantity) / 1000.0
+
+
+def parse_bytes(quantity: Any) -> int:
+    """Parse a memory quantity into bytes, rounding up."""
+    return -(-parse_quantity_milli(quantity) // 1000)
+
+
+def memo_info() -> Any:
+    """Return hit/miss statistics for the parse memo."""
+    return _parse_milli.cache_info()
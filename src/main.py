@@ -1,33 +1,87 @@
-"""Main entry point for the OpsAgent."""
+"""Main entry point for the OpsAgent.
+
+Commands:
+
+- ``run`` (default): scheduler, remediation and the API server.
+- ``scan --once``: run every detector once, write the issues and exit with a
+  severity-based code; for CI and cron. ``scan --manifests DIR`` checks
+  workload manifests on disk instead of live clusters and clouds.
+- ``export``: stream all current issues as NDJSON.
+
+The API stack (FastAPI, uvicorn) and APScheduler are imported only by ``run``,
+so one-shot commands start quickly.
+"""
 
 import argparse
 import asyncio
 import signal
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 import structlog
 
 from src.utils.config import load_config
 from src.utils.logger import setup_logging
-from src.core.detection_engine import DetectionEngine
-from src.core.scheduler import Scheduler
-from src.api.server import create_app
 
 logger = structlog.get_logger(__name__)
 
+# Exit codes of ``scan``; a severity code is returned for the most severe issue
+# at or above ``--fail-on``
+EXIT_OK = 0
+EXIT_ERROR = 1
+SEVERITY_EXIT_CODES = {"low": 3, "medium": 4, "high": 5, "critical": 6}
+
 
 class OpsAgent:
     """Main OpsAgent orchestrator."""
 
     def __init__(self, config_path: str):
+        from src.api.aggregation import ShardAggregator
+        from src.api.server import create_app
+        from src.api.snapshot import IssueSnapshot
+        from src.core.detection_engine import DetectionEngine
+        from src.core.issue_store import IssueStore
+        from src.core.scheduler import Scheduler
+        from src.core.sharding import create_membership
+
         self.config = load_config(config_path)
         setup_logging(self.config.logging)
         self.logger = structlog.get_logger(__name__)
 
-        self.detection_engine = DetectionEngine(self.config)
-        self.scheduler = Scheduler(self.config, self.detection_engine)
-        self.app = create_app(self.config)
+        self.shard = create_membership(self.config)
+        self.detection_engine = DetectionEngine(self.config, shard=self.shard)
+        self.issue_store = None
+        if self.config.storage.enabled:
+            self.issue_store = IssueStore(
+                self.config.storage.path,
+                retention_days=self.config.storage.retention_days,
+            )
+        self.snapshot = IssueSnapshot()
+        self.aggregator = None
+        local_snapshot = self.snapshot
+        if self.shard is not None:
+            # The scheduler publishes this replica's shard; the API serves all of them
+            local_snapshot = IssueSnapshot()
+            self.aggregator = ShardAggregator(
+                self.shard, local_snapshot, self.snapshot, issue_store=self.issue_store
+            )
+        self.scheduler = Scheduler(
+            self.config,
+            self.detection_engine,
+            issue_store=self.issue_store,
+            snapshot=local_snapshot,
+        )
+        self.app = create_app(
+            self.config,
+            snapshot=self.snapshot,
+            issue_store=self.issue_store,
+            detection_engine=self.detection_engine,
+            aggregator=self.aggregator,
+        )
+        if self.shard is not None:
+            # Pick up a new shard right away instead of waiting for the next tick
+            self.shard.add_listener(self.scheduler.run_all_now)
 
         self._shutdown_event = asyncio.Event()
 
@@ -40,6 +94,18 @@ class OpsAgent:
         for sig in (signal.SIGTERM, signal.SIGINT):
             loop.add_signal_handler(sig, lambda: asyncio.create_task(self.shutdown()))
 
+        # Serve Prometheus metrics on their own port for scraping
+        if self.config.metrics.enabled:
+            from src.metrics.prometheus import start_metrics_server
+            start_metrics_server(self.config.metrics.port)
+            self.logger.info("Metrics server started", port=self.config.metrics.port)
+
+        # Join the shard group before the first scheduled run
+        if self.shard is not None:
+            await self.shard.start()
+        if self.aggregator is not None:
+            await self.aggregator.start()
+
         # Start scheduler
         self.scheduler.start()
         self.logger.info("Detection scheduler started")
@@ -63,10 +129,125 @@ class OpsAgent:
         """Gracefully shutdown the OpsAgent."""
         self.logger.info("Shutting down OpsAgent...")
         self.scheduler.shutdown()
+        self.detection_engine.cancel()
+        self.detection_engine.close()
+        if self.aggregator is not None:
+            await self.aggregator.stop()
+        if self.shard is not None:
+            await self.shard.stop()
+        if self.issue_store is not None:
+            self.issue_store.close()
         self._shutdown_event.set()
 
 
-def main() -> None:
+async def export_issues(config_path: str, output: str) -> int:
+    """Run every detector once and stream the issues to ``output`` as NDJSON.
+
+    Issues are written as detectors produce them, so memory use does not grow
+    with the number of issues. Returns the number of issues written.
+    """
+    from src.core.detection_engine import DetectionEngine
+    from src.detectors.base.encoding import encode_ndjson
+
+    config = load_config(config_path)
+    # stdout may carry the export itself, so logs go to stderr
+    setup_logging(config.logging, stream=sys.stderr)
+
+    detection_engine = DetectionEngine(config)
+    out = sys.stdout.buffer if output == "-" else open(output, "wb")
+    count = 0
+    try:
+        async for batch in detection_engine.stream_detection():
+            out.write(encode_ndjson(batch))
+            count += len(batch)
+        out.flush()
+    finally:
+        detection_engine.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    logger.info("Export completed", issues=count, output=output)
+    return count
+
+
+def scan_exit_code(issues, fail_on: str = "low", complete: bool = True) -> int:
+    """Map a scan result to the process exit code.
+
+    A scan in which any detector failed, timed out or could not check all of
+    its input (e.g. an unparsable manifest) exits with ``EXIT_ERROR``.
+    Otherwise the code is that of the most severe issue at or above
+    ``fail_on``, or ``EXIT_OK`` when there is none.
+    """
+    if not complete:
+        return EXIT_ERROR
+    threshold = SEVERITY_EXIT_CODES[fail_on]
+    codes = [SEVERITY_EXIT_CODES[issue.severity.value] for issue in issues]
+    worst = max(codes, default=EXIT_OK)
+    return worst if worst >= threshold else EXIT_OK
+
+
+async def scan(
+    config_path: str,
+    output: str = "-",
+    output_format: str = "json",
+    fail_on: str = "low",
+    once: bool = True,
+    manifests: Optional[List[str]] = None,
+) -> int:
+    """Run detection without the scheduler or API server.
+
+    With ``once`` every detector runs a single time with full concurrency,
+    the issues are written to ``output`` and the exit code is returned.
+    Otherwise the scan repeats every ``detection.interval`` seconds and
+    rewrites ``output`` each time. ``manifests`` replaces the configured
+    clusters and cloud accounts with the given manifest files or directories.
+    """
+    from src.core.detection_engine import DetectionEngine
+    from src.detectors.base.encoding import encode_issues, encode_ndjson
+
+    config = load_config(config_path)
+    setup_logging(config.logging, stream=sys.stderr)
+    encode = encode_ndjson if output_format == "ndjson" else encode_issues
+    if manifests:
+        _scan_manifests_only(config, manifests)
+
+    detection_engine = DetectionEngine(config, full_concurrency=True)
+    try:
+        while True:
+            issues = await detection_engine.run_detection()
+            # "partial" counts as incomplete too: a CI gate must not pass on
+            # input it could not check
+            complete = all(outcome == "ok" for outcome in detection_engine.last_outcome.values())
+            _write_output(output, encode(issues))
+            code = scan_exit_code(issues, fail_on, complete)
+            logger.info("Scan completed", issues=len(issues), complete=complete, exit_code=code)
+            if once:
+                return code
+            await asyncio.sleep(config.detection.interval)
+    finally:
+        detection_engine.close()
+
+
+def _scan_manifests_only(config, paths: List[str]) -> None:
+    """Point a config at local manifests and away from live APIs."""
+    config.k8s.in_cluster = False
+    config.k8s.contexts = []
+    config.aws.enabled = False
+    config.azure.enabled = False
+    config.manifests.enabled = True
+    config.manifests.paths = list(paths)
+
+
+def _write_output(output: str, payload: bytes) -> None:
+    if output == "-":
+        sys.stdout.buffer.write(payload)
+        sys.stdout.buffer.flush()
+        return
+    with open(output, "wb") as f:
+        f.write(payload)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """CLI entry point."""
     parser = argparse.ArgumentParser(description="Multi-Cloud OpsAgent")
     parser.add_argument(
@@ -75,12 +256,70 @@ def main() -> None:
         default="config/config.yaml",
         help="Path to configuration file",
     )
-    args = parser.parse_args()
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("run", help="Run the agent: scheduler and API server (default)")
+    export_parser = subparsers.add_parser(
+        "export", help="Run all detectors once and stream issues as NDJSON"
+    )
+    export_parser.add_argument(
+        "--output", "-o",
+        default="-",
+        help="File to write to ('-' for stdout)",
+    )
+    scan_parser = subparsers.add_parser(
+        "scan", help="Run detection without the scheduler or API server"
+    )
+    scan_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Scan a single time and exit with a severity-based code",
+    )
+    scan_parser.add_argument(
+        "--output", "-o",
+        default="-",
+        help="File to write issues to ('-' for stdout)",
+    )
+    scan_parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+    scan_parser.add_argument(
+        "--fail-on",
+        choices=list(SEVERITY_EXIT_CODES),
+        default="low",
+        help="Lowest severity that produces a non-zero exit code",
+    )
+    scan_parser.add_argument(
+        "--manifests",
+        action="append",
+        metavar="PATH",
+        help="Scan workload manifests in this file or directory instead of "
+             "live clusters and clouds (repeatable)",
+    )
+    args = parser.parse_args(argv)
 
     if not Path(args.config).exists():
-        print(f"Error: Configuration file not found: {args.config}")
+        print(f"Error: Configuration file not found: {args.config}", file=sys.stderr)
         sys.exit(1)
 
+    if args.command == "scan":
+        try:
+            code = asyncio.run(scan(
+                args.config,
+                output=args.output,
+                output_format=args.format,
+                fail_on=args.fail_on,
+                once=args.once,
+                manifests=args.manifests,
+            ))
+        except KeyboardInterrupt:
+            code = 130
+        sys.exit(code)
+
+    if args.command == "export":
+        try:
+            asyncio.run(export_issues(args.config, args.output))
+        except KeyboardInterrupt:
+            sys.exit(130)
+        return
+
     agent = OpsAgent(args.config)
 
     try:
@@ -0,0 +1 @@
+"""Prometheus metrics for the agent."""
@@ -0,0 +1,115 @@
+"""Prometheus metric definitions and exposition helpers."""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+
+# Detector runs range from milliseconds (cached) to many minutes (large fleets)
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+API_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+DETECTOR_DURATION = Histogram(
+    "opsagent_detector_duration_seconds",
+    "Wall time of a single detector run",
+    ["detector", "outcome"],
+    buckets=DURATION_BUCKETS,
+)
+ISSUES_FOUND = Counter(
+    "opsagent_issues_found_total",
+    "Issues reported by detectors",
+    ["severity", "platform"],
+)
+ISSUE_CHANGES = Counter(
+    "opsagent_issue_changes_total",
+    "Deduplicated issues by change type",
+    ["change"],
+)
+OPEN_ISSUES = Gauge(
+    "opsagent_open_issues",
+    "Issues currently tracked in the deduplication index",
+)
+API_CALLS = Counter(
+    "opsagent_api_calls_total",
+    "Calls made to platform APIs",
+    ["platform", "operation", "status"],
+)
+API_CALL_DURATION = Histogram(
+    "opsagent_api_call_duration_seconds",
+    "Latency of platform API calls",
+    ["platform", "operation"],
+    buckets=API_BUCKETS,
+)
+DETECTION_CYCLE_DURATION = Histogram(
+    "opsagent_detection_cycle_duration_seconds",
+    "Wall time of a scheduled detection run, per job",
+    ["job"],
+    buckets=DURATION_BUCKETS,
+)
+DETECTION_CYCLE_OVERRUNS = Counter(
+    "opsagent_detection_cycle_overruns_total",
+    "Scheduled detection runs that took longer than their job's interval",
+    ["job"],
+)
+SCHEDULER_OVERRUNS = Counter(
+    "opsagent_scheduler_overruns_total",
+    "Scheduled ticks that found the previous run still in progress",
+    ["job", "action"],
+)
+SCHEDULER_INTERVAL = Gauge(
+    "opsagent_scheduler_interval_seconds",
+    "Current effective interval of a scheduled job",
+    ["job"],
+)
+K8S_CONNECTIONS = Gauge(
+    "opsagent_k8s_connections_opened",
+    "HTTP connections opened by a cluster's API client",
+    ["cluster"],
+)
+K8S_REQUESTS = Gauge(
+    "opsagent_k8s_requests_sent",
+    "HTTP requests sent by a cluster's API client",
+    ["cluster"],
+)
+
+SHARD_MEMBERS = Gauge(
+    "opsagent_shard_members",
+    "Live replicas in this replica's shard group",
+)
+
+SHARD_REBALANCES = Counter(
+    "opsagent_shard_rebalances_total",
+    "Shard membership changes observed by this replica",
+)
+
+
+@contextmanager
+def track_api_call(platform: str, operation: str) -> Iterator[None]:
+    """Count and time a platform API call."""
+    started = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        API_CALL_DURATION.labels(platform, operation).observe(time.perf_counter() - started)
+        API_CALLS.labels(platform, operation, status).inc()
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Return the current exposition payload and its content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve the default registry on a dedicated port."""
+    start_http_server(port)
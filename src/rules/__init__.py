@@ -0,0 +1 @@
+"""Declarative container rules compiled into a single evaluation plan."""
@@ -0,0 +1,263 @@
+"""Declarative container rules: facts, conditions and the Rule model.
+
+A rule states *when* it fires as a tree of conditions over ``ContainerFacts``
+and *what* it reports as templates and a values callback. Facts are extracted
+from a container once, with its resource quantities parsed, and then shared by
+every rule.
+"""
+
+import operator
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.detectors.base.detector import Issue, Platform, Severity
+from src.detectors.k8s.quantity import parse_bytes, parse_cpu_cores
+
+
+class ContainerFacts:
+    """Everything a rule may read about one container, computed once.
+
+    Quantities are parsed on first access and memoized, so a malformed
+    quantity only raises for a rule that actually reads it.
+    """
+
+    __slots__ = ("name", "requests", "limits", "_parsed")
+
+    # Numeric facts a Compare condition may reference
+    NUMERIC = ("cpu_request", "memory_request", "cpu_limit", "memory_limit")
+
+    def __init__(self, container: Any):
+        self.name = container.name
+        resources = container.resources
+        self.requests = (resources.requests or None) if resources else None
+        self.limits = (resources.limits or None) if resources else None
+        self._parsed: Dict[str, Any] = {}
+
+    def _quantity(
+        self, fact: str, section: Optional[Dict[str, Any]], resource: str,
+        parse: Callable[[Any], Any],
+    ) -> Any:
+        try:
+            return self._parsed[fact]
+        except KeyError:
+            value = section.get(resource) if section else None
+            parsed = self._parsed[fact] = parse(value) if value else parse("0")
+            return parsed
+
+    @property
+    def cpu_request(self) -> float:
+        """Requested CPU in cores; 0.0 when unset."""
+        return self._quantity("cpu_request", self.requests, "cpu", parse_cpu_cores)
+
+    @property
+    def memory_request(self) -> int:
+        """Requested memory in bytes; 0 when unset."""
+        return self._quantity("memory_request", self.requests, "memory", parse_bytes)
+
+    @property
+    def cpu_limit(self) -> float:
+        """CPU limit in cores; 0.0 when unset."""
+        return self._quantity("cpu_limit", self.limits, "cpu", parse_cpu_cores)
+
+    @property
+    def memory_limit(self) -> int:
+        """Memory limit in bytes; 0 when unset."""
+        return self._quantity("memory_limit", self.limits, "memory", parse_bytes)
+
+    @property
+    def missing(self) -> str:
+        """``requests``, ``limits`` or ``requests/limits``, for titles."""
+        parts = [name for name in ("requests", "limits") if getattr(self, name) is None]
+        return "/".join(parts)
+
+    @property
+    def cpu_request_quantity(self) -> Any:
+        return self.requests.get("cpu") if self.requests else None
+
+    @property
+    def memory_request_quantity(self) -> Any:
+        return self.requests.get("memory") if self.requests else None
+
+
+@dataclass(frozen=True)
+class Target:
+    """The workload a container belongs to."""
+    name: str
+    namespace: Optional[str]
+    resource_type: str
+    cluster: Optional[str] = None
+    labels: Dict[str, str] = field(default_factory=dict)
+
+
+class Condition(ABC):
+    """A predicate over ContainerFacts.
+
+    ``evaluate`` interprets the condition directly; ``expression`` renders it
+    as Python source over a local ``f`` for the compiled plan, binding any
+    constants through ``bind``.
+    """
+
+    @abstractmethod
+    def evaluate(self, facts: ContainerFacts) -> bool:
+        """Return whether the condition holds for ``facts``."""
+        pass
+
+    @abstractmethod
+    def expression(self, bind: Callable[[Any], str]) -> str:
+        """Return the condition as a Python expression over ``f``."""
+        pass
+
+
+@dataclass(frozen=True)
+class Missing(Condition):
+    """True when the container sets no ``requests`` or no ``limits``."""
+    section: str
+
+    def __post_init__(self):
+        if self.section not in ("requests", "limits"):
+            raise ValueError(f"Unknown resource section: {self.section}")
+
+    def evaluate(self, facts: ContainerFacts) -> bool:
+        return getattr(facts, self.section) is None
+
+    def expression(self, bind) -> str:
+        return f"f.{self.section} is None"
+
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@dataclass(frozen=True)
+class Compare(Condition):
+    """Compare a numeric fact (cores or bytes) with a constant."""
+    fact: str
+    op: str
+    value: float
+
+    def __post_init__(self):
+        if self.fact not in ContainerFacts.NUMERIC:
+            raise ValueError(f"Unknown fact: {self.fact}")
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unknown operator: {self.op}")
+
+    def evaluate(self, facts: ContainerFacts) -> bool:
+        return _OPERATORS[self.op](getattr(facts, self.fact), self.value)
+
+    def expression(self, bind) -> str:
+        return f"f.{self.fact} {self.op} {bind(self.value)}"
+
+
+@dataclass(frozen=True)
+class Ratio(Condition):
+    """Compare ``numerator / denominator`` of two numeric facts; false if the denominator is 0."""
+    numerator: str
+    denominator: str
+    op: str
+    value: float
+
+    def __post_init__(self):
+        for name in (self.numerator, self.denominator):
+            if name not in ContainerFacts.NUMERIC:
+                raise ValueError(f"Unknown fact: {name}")
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unknown operator: {self.op}")
+
+    def evaluate(self, facts: ContainerFacts) -> bool:
+        denominator = getattr(facts, self.denominator)
+        if not denominator:
+            return False
+        return _OPERATORS[self.op](getattr(facts, self.numerator) / denominator, self.value)
+
+    def expression(self, bind) -> str:
+        return (
+            f"(f.{self.denominator} != 0 and "
+            f"f.{self.numerator} / f.{self.denominator} {self.op} {bind(self.value)})"
+        )
+
+
+@dataclass(frozen=True)
+class AnyOf(Condition):
+    conditions: Tuple[Condition, ...]
+
+    def __init__(self, *conditions: Condition):
+        object.__setattr__(self, "conditions", conditions)
+
+    def evaluate(self, facts: ContainerFacts) -> bool:
+        return any(condition.evaluate(facts) for condition in self.conditions)
+
+    def expression(self, bind) -> str:
+        return "(" + " or ".join(c.expression(bind) for c in self.conditions) + ")"
+
+
+@dataclass(frozen=True)
+class AllOf(Condition):
+    conditions: Tuple[Condition, ...]
+
+    def __init__(self, *conditions: Condition):
+        object.__setattr__(self, "conditions", conditions)
+
+    def evaluate(self, facts: ContainerFacts) -> bool:
+        return all(condition.evaluate(facts) for condition in self.conditions)
+
+    def expression(self, bind) -> str:
+        return "(" + " and ".join(c.expression(bind) for c in self.conditions) + ")"
+
+
+# values(facts) -> (current_value, recommended_value, metadata)
+ValuesFn = Callable[[ContainerFacts], Tuple[Any, Any, Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One container check.
+
+    ``title`` and ``description`` are ``str.format`` templates over
+    ``facts``, ``container``, ``workload`` and ``resource_type``.
+    """
+    check: str
+    severity: Severity
+    when: Condition
+    title: str
+    description: str
+    auto_fixable: bool = False
+    values: Optional[ValuesFn] = None
+
+    def apply(self, facts: ContainerFacts, target: Target) -> Optional[Issue]:
+        """Evaluate this rule alone, without a compiled plan."""
+        if not self.when.evaluate(facts):
+            return None
+        return self.build(facts, target)
+
+    def build(self, facts: ContainerFacts, target: Target) -> Issue:
+        """Build the issue for a container this rule fired on."""
+        fields = {
+            "facts": facts,
+            "container": facts.name,
+            "workload": target.name,
+            "resource_type": target.resource_type,
+        }
+        current, recommended, metadata = self.values(facts) if self.values else (None, None, {})
+        return Issue(
+            platform=Platform.K8S,
+            resource_type=target.resource_type,
+            resource_name=target.name,
+            namespace=target.namespace,
+            cluster=target.cluster,
+            severity=self.severity,
+            title=self.title.format(**fields),
+            description=self.description.format(**fields),
+            auto_fixable=self.auto_fixable,
+            current_value=current,
+            recommended_value=recommended,
+            tags=target.labels,
+            check=self.check,
+            metadata={"container": facts.name, **metadata},
+        )
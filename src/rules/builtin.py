@@ -0,0 +1,94 @@
+"""Built-in container resource rules."""
+
+from src.detectors.base.detector import Severity
+from src.rules.base import AnyOf, Compare, ContainerFacts, Missing, Rule
+
+# Resource thresholds for detection
+OVER_PROVISIONED_CPU_THRESHOLD = 2.0  # CPU cores
+OVER_PROVISIONED_MEMORY_THRESHOLD = 4 * 1024 * 1024 * 1024  # 4Gi in bytes
+
+# Recommended default resources
+DEFAULT_CPU_REQUEST = "100m"
+DEFAULT_CPU_LIMIT = "200m"
+DEFAULT_MEMORY_REQUEST = "128Mi"
+DEFAULT_MEMORY_LIMIT = "256Mi"
+
+MIB = 1024 * 1024
+
+
+def _as_strings(resources):
+    return {k: str(v) for k, v in resources.items()} if resources else None
+
+
+def _missing_values(facts: ContainerFacts):
+    current = {
+        "container": facts.name,
+        "requests": _as_strings(facts.requests),
+        "limits": _as_strings(facts.limits),
+    }
+    recommended = {
+        "requests": {"cpu": DEFAULT_CPU_REQUEST, "memory": DEFAULT_MEMORY_REQUEST},
+        "limits": {"cpu": DEFAULT_CPU_LIMIT, "memory": DEFAULT_MEMORY_LIMIT},
+    }
+    metadata = {
+        "missing_requests": facts.requests is None,
+        "missing_limits": facts.limits is None,
+    }
+    return current, recommended, metadata
+
+
+def _over_provisioned_values(facts: ContainerFacts):
+    cpu_cores, memory_bytes = facts.cpu_request, facts.memory_request
+    current = {
+        "container": facts.name,
+        "requests": {"cpu": facts.cpu_request_quantity, "memory": facts.memory_request_quantity},
+        "limits": _as_strings(facts.limits),
+    }
+    # Recommend half of the current request, with the current request as limit
+    recommended = {
+        "requests": {
+            "cpu": f"{int(cpu_cores * 500)}m",
+            "memory": f"{int(memory_bytes / MIB * 0.5)}Mi",
+        },
+        "limits": {
+            "cpu": f"{int(cpu_cores * 1000)}m",
+            "memory": f"{int(memory_bytes / MIB)}Mi",
+        },
+    }
+    metadata = {"cpu_cores": cpu_cores, "memory_bytes": memory_bytes}
+    return current, recommended, metadata
+
+
+MISSING_RESOURCES = Rule(
+    check="missing_resources",
+    severity=Severity.MEDIUM,
+    when=AnyOf(Missing("requests"), Missing("limits")),
+    title="Missing resource {facts.missing}",
+    description=(
+        "Container '{container}' in {resource_type} '{workload}' "
+        "is missing resource {facts.missing}. "
+        "This can lead to unpredictable scheduling and potential resource contention."
+    ),
+    auto_fixable=True,
+    values=_missing_values,
+)
+
+OVER_PROVISIONED = Rule(
+    check="over_provisioned",
+    severity=Severity.LOW,
+    when=AnyOf(
+        Compare("cpu_request", ">", OVER_PROVISIONED_CPU_THRESHOLD),
+        Compare("memory_request", ">", OVER_PROVISIONED_MEMORY_THRESHOLD),
+    ),
+    title="Over-provisioned resources",
+    description=(
+        "Container '{container}' in {resource_type} '{workload}' "
+        "has excessive resource requests "
+        "(CPU: {facts.cpu_request_quantity}, Memory: {facts.memory_request_quantity}). "
+        "Consider reducing to optimize cluster utilization."
+    ),
+    auto_fixable=True,
+    values=_over_provisioned_values,
+)
+
+DEFAULT_RULES = (MISSING_RESOURCES, OVER_PROVISIONED)
@@ -0,0 +1,75 @@
+"""Compile a set of rules into a single evaluation plan.
+
+Evaluating rules one by one means every rule re-reads the container, re-parses
+its quantities and pays a few Python calls per condition. ``RulePlan`` instead
+generates one function for the whole rule set: every distinct condition is
+computed once into a local, and each rule is reduced to a boolean expression
+over those locals. Per container the cost is one fact extraction plus a handful
+of bytecodes per rule; issues are only built for rules that fire.
+"""
+
+from typing import Any, Callable, Dict, List, Sequence
+
+from src.detectors.base.detector import Issue
+from src.rules.base import AllOf, AnyOf, Condition, ContainerFacts, Rule, Target
+
+
+class RulePlan:
+    """A compiled, immutable rule set."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = tuple(rules)
+        checks = [rule.check for rule in self.rules]
+        duplicates = sorted({check for check in checks if checks.count(check) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate rule checks: {', '.join(duplicates)}")
+        self.source, self._evaluate = self._compile(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(self, facts: ContainerFacts) -> List[Rule]:
+        """Return the rules that fire for a container, in rule order."""
+        return [self.rules[index] for index in self._evaluate(facts)]
+
+    def check_container(self, container: Any, target: Target) -> List[Issue]:
+        """Extract facts once and build an issue for every rule that fires."""
+        facts = ContainerFacts(container)
+        return [self.rules[index].build(facts, target) for index in self._evaluate(facts)]
+
+    @staticmethod
+    def _compile(rules: Sequence[Rule]):
+        constants: Dict[str, Any] = {}
+        terms: Dict[str, str] = {}
+        lines: List[str] = []
+
+        def bind(value: Any) -> str:
+            name = f"k{len(constants)}"
+            constants[name] = value
+            return name
+
+        def term(condition: Condition) -> str:
+            # Combinators are inlined; leaf conditions shared by several rules
+            # are computed once
+            if isinstance(condition, AnyOf):
+                return "(" + " or ".join(term(c) for c in condition.conditions) + ")"
+            if isinstance(condition, AllOf):
+                return "(" + " and ".join(term(c) for c in condition.conditions) + ")"
+            key = repr(condition)
+            if key not in terms:
+                terms[key] = f"c{len(terms)}"
+                lines.append(f"    {terms[key]} = {condition.expression(bind)}")
+            return terms[key]
+
+        checks = [
+            f"    if {term(rule.when)}: hits.append({index})"
+            for index, rule in enumerate(rules)
+        ]
+        source = "\n".join(
+            ["def evaluate(f):", "    hits = []", *lines, *checks, "    return hits"]
+        )
+
+        namespace: Dict[str, Any] = dict(constants)
+        exec(compile(source, "<rule-plan>", "exec"), namespace)
+        evaluate: Callable[[ContainerFacts], List[int]] = namespace["evaluate"]
+        return source, evaluate
@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 import yaml
 from pydantic import BaseModel, Field
@@ -13,7 +13,27 @@ class K8sConfig(BaseModel):
     """Kubernetes configuration."""
     in_cluster: bool = False
     kubeconfig: Optional[str] = None
-    contexts: List[Dict[str, Any]] = []
+    contexts: List[Dict[str, Any]] = []  # {"name": ..., "enabled": bool, "cluster": ...}
+    cluster_name: Optional[str] = None  # Tag for issues from the in-cluster/default context
+    check_interval: Optional[int] = None  # Seconds between scans (default: detection.interval)
+    check_jitter: Optional[float] = None  # Random offset per scan (default: detection.jitter)
+    page_size: int = 500  # Objects per list request (limit/continue paging)
+    lean_listing: bool = True  # Parse raw list JSON instead of full client models
+    watch: bool = False  # Keep a list/watch cache instead of re-listing each cycle
+    watch_timeout: int = 300  # Seconds before a watch is re-established
+    sync_timeout: float = 60.0  # Seconds to wait for the initial list when watching
+    template_cache_size: int = 10000  # Memoized pod-template results (0 disables)
+    # Also compare each container with its namespace (outlier requests, limit/
+    # request ratios) with src.analyzers.fleet; needs the "analysis" extra
+    fleet_analysis: bool = False
+
+    # API client connection pool
+    connection_pool_maxsize: int = 32  # Connections kept per cluster
+    tcp_keepalive: bool = True
+    tcp_keepalive_idle: int = 60  # Seconds idle before keep-alive probes
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+    gzip: bool = True  # Request gzip-compressed responses
 
 
 class AWSConfig(BaseModel):
@@ -36,6 +56,14 @@ class DetectionConfig(BaseModel):
     """Detection engine configuration."""
     interval: int = 300
     parallel_workers: int = 5
+    detector_timeout: Optional[float] = None  # Seconds; defaults to interval
+    dedup_ttl: int = 86400  # Seconds an unseen issue stays in the dedup index
+    per_detector_schedules: bool = True  # One job per detector at its own check_interval
+    jitter: float = 0  # Random offset (seconds) applied to each scheduled run
+    overlap_policy: Literal["skip", "coalesce", "delay"] = "skip"  # When a run overruns
+    adaptive_interval: bool = False  # Stretch the interval to fit measured run time
+    adaptive_headroom: float = 1.5  # Interval = run time * headroom when stretched
+    max_interval: Optional[int] = None  # Cap for the stretched interval (default 4x)
 
 
 class RemediationConfig(BaseModel):
@@ -45,6 +73,9 @@ class RemediationConfig(BaseModel):
     auto_fix_severity: List[str] = ["low"]
     require_approval_severity: List[str] = ["medium", "high"]
     max_concurrent_fixes: int = 3
+    max_retries: int = 3  # Retries for a failed fix
+    retry_backoff: float = 1.0  # Seconds before the first retry, doubled each time
+    retry_backoff_max: float = 30.0
 
 
 class GitHubConfig(BaseModel):
@@ -69,6 +100,25 @@ class GrafanaConfig(BaseModel):
     api_key: Optional[str] = None
 
 
+class MetricsSourceConfig(BaseModel):
+    """Prometheus-compatible source of container usage for right-sizing."""
+    enabled: bool = False
+    url: Optional[str] = None  # Prometheus/Thanos/Mimir base URL
+    # Without a url, query through Grafana's proxy for this datasource
+    grafana_datasource_uid: Optional[str] = None
+    bearer_token: Optional[str] = None  # Defaults to grafana.api_key via the proxy
+    cluster_label: Optional[str] = None  # Series label holding the cluster name
+    lookback: int = 604800  # Seconds of usage history considered (7 days)
+    step: int = 300  # Resolution of the downsampled series, in seconds
+    namespaces_per_query: int = 20  # Namespaces batched into one range query
+    max_concurrency: int = 4  # Range queries in flight
+    max_samples: int = 4096  # Ring buffer size per workload container and resource
+    percentile: float = 95.0  # Usage percentile requests are sized to
+    headroom: float = 1.2  # Multiplier on top of the percentile
+    min_samples: int = 12  # Fewer samples keep the static recommendation
+    timeout: float = 30.0
+
+
 class LoggingConfig(BaseModel):
     """Logging configuration."""
     level: str = "INFO"
@@ -82,6 +132,45 @@ class MetricsConfig(BaseModel):
     path: str = "/metrics"
 
 
+class ManifestsConfig(BaseModel):
+    """Offline scanning of workload manifests on disk."""
+    enabled: bool = False
+    paths: List[str] = []  # Files or directories searched for *.yaml / *.yml
+    cluster_name: str = "manifests"  # Tag for issues found in manifests
+    check_interval: Optional[int] = None  # Seconds between scans (default: detection.interval)
+    check_jitter: Optional[float] = None  # Random offset per scan (default: detection.jitter)
+    cache_path: Optional[str] = ".cache/manifests.json"  # Parse cache; None disables
+    workers: Optional[int] = None  # Parser processes (default: CPU count)
+
+
+class StorageConfig(BaseModel):
+    """Issue history storage configuration."""
+    enabled: bool = True
+    path: str = "data/issues.db"
+    retention_days: int = 30
+    prune_interval: int = 3600
+
+
+class ShardingConfig(BaseModel):
+    """Split detection across replicas with Lease-based membership."""
+    enabled: bool = False
+    # Replicas sharing work must use the same group
+    group: str = "opsagent-shard"
+    # Defaults to the POD_NAME / POD_NAMESPACE environment variables
+    identity: Optional[str] = None
+    namespace: Optional[str] = None
+    lease_duration: int = 15
+    renew_interval: int = 5
+    # "namespace": every replica lists and checks only the namespaces it owns
+    # (with k8s.watch, informers still watch whole clusters; only checks split);
+    # "cluster": whole detectors (clusters, cloud accounts) are assigned
+    granularity: Literal["namespace", "cluster"] = "namespace"
+    vnodes: int = 64
+    # URL peers use to reach this replica's API for merged reads; defaults to
+    # http://$POD_IP:18080
+    advertise_url: Optional[str] = None
+
+
 class Config(BaseSettings):
     """Main configuration."""
     environment: str = "production"
@@ -93,8 +182,12 @@ class Config(BaseSettings):
     github: GitHubConfig = Field(default_factory=GitHubConfig)
     notifications: NotificationsConfig = Field(default_factory=NotificationsConfig)
     grafana: GrafanaConfig = Field(default_factory=GrafanaConfig)
+    metrics_source: MetricsSourceConfig = Field(default_factory=MetricsSourceConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    manifests: ManifestsConfig = Field(default_factory=ManifestsConfig)
+    storage: StorageConfig = Field(default_factory=StorageConfig)
+    sharding: ShardingConfig = Field(default_factory=ShardingConfig)
 
 
 def load_config(config_path: str) -> Config:
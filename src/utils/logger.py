@@ -2,18 +2,22 @@
 
 import logging
 import sys
+from typing import TextIO
 
 import structlog
 
 
-def setup_logging(config) -> None:
-    """Configure structured logging with structlog."""
+def setup_logging(config, stream: TextIO = sys.stdout) -> None:
+    """Configure structured logging with structlog.
+
+    Commands that write data to stdout pass ``sys.stderr`` as ``stream``.
+    """
     log_level = getattr(logging, config.level.upper(), logging.INFO)
 
     # Configure standard library logging
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
+        stream=stream,
         level=log_level,
     )
 
@@ -0,0 +1,33 @@
+"""JSON helpers that use orjson when it is installed."""
+
+import json
+from datetime import datetime
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional extra
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes; non-JSON values fall back to str().
+
+    Datetimes are written in ISO 8601 on both paths, as orjson does natively.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode()
+
+
+def _default(obj: Any) -> str:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
@@ -0,0 +1,113 @@
+"""Unit tests for the fleet analyzer."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.analyzers.fleet import FleetAnalyzer, FleetColumns, group_percentiles  # noqa: E402
+from src.detectors.k8s.lean import Workload  # noqa: E402
+
+GI = 1024 ** 3
+
+
+def fleet(rows):
+    columns = FleetColumns()
+    for row in rows:
+        columns.add(*row)
+    return columns
+
+
+class TestGroupPercentiles:
+    """Test suite for group_percentiles."""
+
+    def test_matches_numpy_percentile(self):
+        rng = np.random.default_rng(0)
+        codes = rng.integers(0, 7, 2000)
+        values = rng.lognormal(size=2000)
+        values[rng.random(2000) < 0.2] = np.nan
+        percentiles = (0, 25, 50, 90, 99, 100)
+
+        counts, result = group_percentiles(codes, values, 8, percentiles)
+
+        for group in range(7):
+            selected = values[(codes == group) & ~np.isnan(values)]
+            assert counts[group] == len(selected)
+            np.testing.assert_allclose(result[group], np.percentile(selected, percentiles))
+        assert counts[7] == 0
+        assert np.isnan(result[7]).all()
+
+    def test_single_value_group(self):
+        counts, result = group_percentiles(np.array([0]), np.array([3.0]), 1, (50, 99))
+
+        assert counts.tolist() == [1]
+        assert result.tolist() == [[3.0, 3.0]]
+
+
+class TestFleetAnalyzer:
+    """Test suite for FleetAnalyzer."""
+
+    @pytest.fixture
+    def report(self):
+        rows = [("shop", "Deployment", f"web-{i}", "app", 0.25, GI, 0.5, GI) for i in range(9)]
+        rows.append(("shop", "Deployment", "hog", "app", 8.0, GI, 8.0, GI))
+        rows.append(("shop", "StatefulSet", "db", "postgres", 0.5, 2 * GI, 4.0, 2 * GI))
+        rows.append(("batch", "Deployment", "job", "worker", 16.0, 0, 0, 0))
+        return FleetAnalyzer(percentiles=(50, 95)).analyze(fleet(rows))
+
+    def test_group_percentiles(self, report):
+        assert report.by_namespace.get("shop", "cpu_request", 50) == 0.25
+        assert report.by_namespace.get("batch", "memory_request", 50) is None
+        assert report.by_class.get("StatefulSet", "memory_limit", 95) == 2 * GI
+        assert report.by_namespace.get("missing", "cpu_request", 50) is None
+        assert report.by_namespace.percentiles == (25, 50, 75, 95)
+
+    def test_outliers_need_enough_peers(self, report):
+        flagged = np.flatnonzero(report.outliers["cpu_request"]).tolist()
+
+        # "job" is alone in its namespace, so it has no peers to compare with
+        assert [report.columns.workloads[i] for i in flagged] == ["hog"]
+
+    def test_limit_request_ratios(self, report):
+        assert report.ratios["cpu"][0] == 2.0
+        assert np.isnan(report.ratios["cpu"][-1])
+        assert np.flatnonzero(report.high_ratios["cpu"]).tolist() == [10]
+
+    def test_issues(self, report):
+        issues = {issue.check: issue for issue in report.issues(cluster="prod")}
+
+        outlier = issues["fleet_outlier_cpu_request"]
+        target = (outlier.resource_name, outlier.namespace, outlier.cluster)
+        assert target == ("hog", "shop", "prod")
+        assert outlier.current_value == {"container": "app", "cpu_request": "8000m"}
+        assert outlier.recommended_value == {"cpu_request": "250m"}
+        ratio = issues["limit_request_ratio_cpu"]
+        assert (ratio.resource_type, ratio.resource_name) == ("StatefulSet", "db")
+        assert ratio.current_value["ratio"] == 8.0
+
+    def test_to_dict(self, report):
+        stats = report.by_class.to_dict()
+
+        assert stats["Deployment"]["cpu_request"]["count"] == 11
+        assert stats["StatefulSet"]["cpu_limit"]["p50"] == 4.0
+
+    def test_add_workload(self):
+        columns = FleetColumns()
+        columns.add_workload("Deployment", Workload({
+            "metadata": {"name": "web", "namespace": "shop"},
+            "spec": {"template": {"spec": {"containers": [
+                {"name": "app", "resources": {"requests": {"cpu": "500m", "memory": "1Gi"}}},
+                {"name": "sidecar"},
+            ]}}},
+        }))
+
+        report = FleetAnalyzer().analyze(columns)
+
+        assert columns.containers == ["app", "sidecar"]
+        assert report.by_namespace.to_dict()["shop"]["cpu_request"]["count"] == 1
+        assert report.by_namespace.get("shop", "memory_request", 50) == GI
+
+    def test_empty_fleet(self):
+        report = FleetAnalyzer().analyze(FleetColumns())
+
+        assert len(report) == 0
+        assert report.issues() == []
@@ -0,0 +1,299 @@
+"""Unit tests for usage collection against a local fake Prometheus."""
+
+import asyncio
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+from urllib.parse import parse_qs
+
+import pytest
+
+from src.analyzers import usage
+from src.analyzers.usage import PrometheusClient, PrometheusError, UsageCollector, workload_of
+from src.detectors.k8s.lean import Workload
+from src.detectors.k8s.pod_resources import PodResourceDetector
+from src.utils.config import Config, GrafanaConfig, MetricsSourceConfig
+
+MIB = 1024 * 1024
+NOW = 1_700_000_000.0
+
+
+class FakePrometheus(BaseHTTPRequestHandler):
+    """Serves /api/v1/query and /api/v1/query_range from generated series.
+
+    Every namespace has one Deployment pod with an ``app`` container; sample
+    ``i`` of a range is ``(i % 100) / 100`` cores and ``(i % 100 + 1)`` MiB.
+    """
+
+    namespaces = ["kube-system", "payments", "shop", "web"]
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        params = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+        self.server.requests.append((self.path, params, dict(self.headers)))
+
+        if self.server.fail:
+            return self._reply({"status": "error", "errorType": "bad_data", "error": "boom"}, 400)
+        if self.path.endswith("/api/v1/query"):
+            result = [{"metric": {"namespace": ns}, "value": [NOW, "1"]} for ns in self.namespaces]
+        elif self.path.endswith("/api/v1/query_range"):
+            result = self._range(params)
+        else:
+            return self._reply({"status": "error", "error": "not found"}, 404)
+        self._reply({"status": "success", "data": {"resultType": "vector", "result": result}})
+
+    def _range(self, params):
+        start, end, step = float(params["start"]), float(params["end"]), int(params["step"])
+        namespaces = re.search(r'namespace=~"([^"]+)"', params["query"]).group(1).split("|")
+        cpu = "container_cpu_usage_seconds_total" in params["query"]
+        points = int((end - start) // step) + 1
+        offset = int((start - self.server.origin) // step)
+        result = []
+        for namespace in namespaces:
+            values = []
+            for i in range(offset, offset + points):
+                value = (i % 100) / 100 if cpu else (i % 100 + 1) * MIB
+                values.append([self.server.origin + i * step, str(value)])
+            metric = {"namespace": namespace, "pod": "web-5d8f7c9b4-x2k9z", "container": "app"}
+            result.append({"metric": metric, "values": values})
+        return result
+
+    def _reply(self, body, status=200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def prometheus():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakePrometheus)
+    server.requests = []
+    server.fail = False
+    server.origin = 0.0
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def source(prometheus, **overrides):
+    settings = {
+        "enabled": True,
+        "url": f"http://127.0.0.1:{prometheus.server_port}",
+        "lookback": 99 * 60,
+        "step": 60,
+        "namespaces_per_query": 2,
+    }
+    settings.update(overrides)
+    return MetricsSourceConfig(**settings)
+
+
+def collector(prometheus, clock=lambda: NOW, **overrides):
+    config = source(prometheus, **overrides)
+    prometheus.origin = NOW - config.lookback
+    return UsageCollector(config, cluster="prod", clock=clock)
+
+
+def range_queries(prometheus):
+    return [params for path, params, _ in prometheus.requests if path.endswith("query_range")]
+
+
+@pytest.mark.parametrize("pod, workload", [
+    ("web-5d8f7c9b4-x2k9z", "web"),
+    ("payments-api-7f9c6d5b8c-bxz2q", "payments-api"),
+    ("postgres-0", "postgres"),
+    ("node-exporter-x2k9z", "node-exporter"),
+    ("standalone", "standalone"),
+])
+def test_workload_of(pod, workload):
+    assert workload_of(pod) == workload
+
+
+class TestUsageCollector:
+    """Test suite for UsageCollector."""
+
+    @pytest.mark.asyncio
+    async def test_batches_namespaces(self, prometheus):
+        usage_collector = collector(prometheus)
+
+        await usage_collector.refresh(lambda namespace: namespace != "kube-system")
+
+        queries = [params["query"] for params in range_queries(prometheus)]
+        assert len(queries) == 4  # 2 namespace batches x (cpu, memory)
+        assert sum('namespace=~"payments|shop"' in query for query in queries) == 2
+        assert sum('namespace=~"web"' in query for query in queries) == 2
+        assert all("[60s]" in query for query in queries)
+        assert len(usage_collector) == 3
+
+    @pytest.mark.asyncio
+    async def test_recommends_from_p95(self, prometheus):
+        usage_collector = collector(prometheus)
+        await usage_collector.refresh()
+
+        recommendation = usage_collector.recommend("shop", "web", "app")
+
+        # 100 samples 0.00..0.99 cores / 1..100 MiB; p95 = 0.94 cores / 95 MiB
+        assert recommendation["usage"] == {"cpu": 0.94, "memory": 95 * MIB}
+        assert recommendation["requests"] == {"cpu": "1130m", "memory": "114Mi"}
+        assert recommendation["limits"] == {"cpu": "2260m", "memory": "228Mi"}
+        assert recommendation["samples"] == {"cpu": 100, "memory": 100}
+        assert usage_collector.recommend("shop", "other", "app") is None
+
+    @pytest.mark.asyncio
+    async def test_min_samples(self, prometheus):
+        usage_collector = collector(prometheus, min_samples=101)
+        await usage_collector.refresh()
+
+        assert usage_collector.recommend("shop", "web", "app") is None
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_incremental_and_bounded(self, prometheus):
+        clock = Mock(return_value=NOW)
+        usage_collector = collector(prometheus, clock=clock, max_samples=120)
+        await usage_collector.refresh()
+        prometheus.requests.clear()
+
+        clock.return_value = NOW + 60 * 50
+        await usage_collector.refresh()
+
+        starts = {float(params["start"]) for params in range_queries(prometheus)}
+        assert starts == {NOW + 60}
+        series = usage_collector._series[("shop", "web", "app")]
+        assert len(series.cpu) == 120  # 100 + 50 samples, the newest 120 are kept
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_take_turns(self, prometheus):
+        usage_collector = collector(prometheus)
+
+        await asyncio.gather(usage_collector.refresh(), usage_collector.refresh())
+
+        # The second refresh finds nothing new instead of ingesting the same samples
+        assert len(range_queries(prometheus)) == 4  # one refresh: 2 batches x (cpu, memory)
+        assert len(usage_collector._series[("shop", "web", "app")].cpu) == 100
+
+    def test_merges_pods_by_timestamp(self, prometheus):
+        usage_collector = collector(prometheus, max_samples=4)
+
+        usage_collector._ingest("cpu", [
+            {
+                "metric": {"namespace": "shop", "pod": pod, "container": "app"},
+                "values": [[NOW + i * 60, str(value)] for i, value in enumerate(values)],
+            }
+            for pod, values in [
+                ("web-5d8f7c9b4-x2k9z", [1, 2, 3, 4]),
+                ("web-5d8f7c9b4-bxz2q", [10, 20, 30, 40]),
+            ]
+        ])
+
+        series = usage_collector._series[("shop", "web", "app")]
+        # The newest samples of both pods are kept, not the whole second pod
+        assert list(series.cpu) == [3, 30, 4, 40]
+        assert series.cpu.itemsize == 8
+        assert series.last_seen == NOW + 180
+
+    @pytest.mark.asyncio
+    async def test_splits_long_ranges(self, prometheus, monkeypatch):
+        monkeypatch.setattr(usage, "MAX_POINTS", 30)
+        usage_collector = collector(prometheus, namespaces_per_query=10)
+
+        await usage_collector.refresh()
+
+        assert len(range_queries(prometheus)) == 2 * 4  # 100 points in chunks of 30
+        assert len(usage_collector._series[("shop", "web", "app")].cpu) == 100
+
+    @pytest.mark.asyncio
+    async def test_cluster_label(self, prometheus):
+        usage_collector = collector(prometheus, cluster_label="cluster")
+
+        await usage_collector.refresh()
+
+        assert all('cluster="prod"' in params["query"] for _, params, _ in prometheus.requests)
+
+    @pytest.mark.asyncio
+    async def test_error_response(self, prometheus):
+        prometheus.fail = True
+
+        with pytest.raises(PrometheusError, match="bad_data: boom"):
+            await collector(prometheus).refresh()
+
+    @pytest.mark.asyncio
+    async def test_grafana_proxy(self, prometheus):
+        grafana = GrafanaConfig(url=f"http://127.0.0.1:{prometheus.server_port}/", api_key="secret")
+        config = source(prometheus, url=None, grafana_datasource_uid="prom")
+        prometheus.origin = NOW - config.lookback
+
+        await UsageCollector(config, grafana=grafana, clock=lambda: NOW).refresh()
+
+        path, _, headers = prometheus.requests[0]
+        assert path == "/api/datasources/proxy/uid/prom/api/v1/query"
+        assert headers["Authorization"] == "Bearer secret"
+
+    def test_needs_a_source(self):
+        with pytest.raises(ValueError, match="needs a url"):
+            UsageCollector(MetricsSourceConfig(enabled=True))
+
+    @pytest.mark.asyncio
+    async def test_client_requires_context(self):
+        with pytest.raises(RuntimeError, match="outside"):
+            await PrometheusClient("http://127.0.0.1:1").query("up")
+
+
+class TestDetectorUsage:
+    """Test suite for usage-based recommendations in PodResourceDetector."""
+
+    @pytest.fixture
+    def detector(self, prometheus):
+        config = Config(metrics_source=source(prometheus))
+        detector = PodResourceDetector(config)
+        prometheus.origin = NOW - config.metrics_source.lookback
+        detector.usage._clock = lambda: NOW
+        return detector
+
+    def check(self, detector, namespace="shop"):
+        workload = Workload({
+            "metadata": {"name": "web", "namespace": namespace},
+            "spec": {"template": {"spec": {"containers": [{
+                "name": "app",
+                "resources": {
+                    "requests": {"cpu": "4", "memory": "8Gi"},
+                    "limits": {"cpu": "4", "memory": "8Gi"},
+                },
+            }]}}},
+        })
+        issues = detector._check_workload("Deployment", workload)
+        return {issue.check: issue for issue in detector._apply_usage(issues)}
+
+    @pytest.mark.asyncio
+    async def test_over_provisioned_uses_usage(self, detector):
+        await detector._refresh_usage()
+
+        issue = self.check(detector)["over_provisioned"]
+
+        assert issue.recommended_value["requests"] == {"cpu": "1130m", "memory": "114Mi"}
+        assert issue.metadata["recommendation_source"] == "usage"
+        assert issue.metadata["usage_percentile"] == 95.0
+
+    @pytest.mark.asyncio
+    async def test_skipped_namespaces_are_not_queried(self, detector, prometheus):
+        await detector._refresh_usage()
+
+        assert not any("kube-system" in params["query"] for params in range_queries(prometheus))
+
+    @pytest.mark.asyncio
+    async def test_falls_back_without_usage(self, detector, prometheus):
+        prometheus.fail = True
+        await detector._refresh_usage()  # logged, not raised
+
+        issue = self.check(detector)["over_provisioned"]
+
+        assert issue.recommended_value["requests"] == {"cpu": "2000m", "memory": "4096Mi"}
+        assert "recommendation_source" not in issue.metadata
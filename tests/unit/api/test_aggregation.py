@@ -0,0 +1,146 @@
+"""Unit tests for merged reads across sharded replicas."""
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.aggregation import ShardAggregator
+from src.api.server import create_app
+from src.api.snapshot import IssueSnapshot
+from src.core.issue_store import IssueStore
+from src.detectors.base.detector import Issue, Platform, Severity
+from src.utils.config import Config
+
+
+def make_issue(name, severity=Severity.LOW):
+    return Issue(
+        platform=Platform.K8S, resource_type="Deployment", resource_name=name,
+        namespace=name, severity=severity, title="t", description="d",
+    )
+
+
+class Replicas(httpx.AsyncBaseTransport):
+    """Routes peer requests by host to each replica's app, in process."""
+
+    def __init__(self):
+        self.apps = {}
+        self.down = set()
+        self.statuses = []
+
+    async def handle_async_request(self, request):
+        host = request.url.host
+        if host in self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        transport = httpx.ASGITransport(app=self.apps[host])
+        response = await transport.handle_async_request(request)
+        self.statuses.append(response.status_code)
+        return response
+
+
+class Replica:
+    def __init__(self, identity, transport, tmp_path, peers):
+        self.local = IssueSnapshot()
+        self.merged = IssueSnapshot()
+        self.store = IssueStore(str(tmp_path / f"{identity}.db"))
+        membership = SimpleNamespace(identity=identity, peers=peers)
+        self.aggregator = ShardAggregator(
+            membership, self.local, self.merged, issue_store=self.store, transport=transport
+        )
+        self.app = create_app(
+            Config(), snapshot=self.merged, issue_store=self.store, aggregator=self.aggregator
+        )
+        transport.apps[identity] = self.app
+
+    def detect(self, issues):
+        self.local.publish(issues)
+        self.store.upsert(issues)
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    transport = Replicas()
+    a = Replica("pod-a", transport, tmp_path, {"pod-b": "http://pod-b"})
+    b = Replica("pod-b", transport, tmp_path, {"pod-a": "http://pod-a"})
+    a.detect([make_issue("web-0", Severity.HIGH), make_issue("web-2")])
+    b.detect([make_issue("web-1", Severity.HIGH), make_issue("web-3")])
+    yield transport, a, b
+    a.store.close()
+    b.store.close()
+
+
+class TestShardAggregator:
+    """Test suite for ShardAggregator."""
+
+    @pytest.mark.asyncio
+    async def test_every_replica_serves_all_issues(self, replicas):
+        _, a, b = replicas
+
+        await a.aggregator.refresh()
+        await b.aggregator.refresh()
+
+        names = [item["resource_name"] for item in a.merged.items()]
+        assert sorted(names) == ["web-0", "web-1", "web-2", "web-3"]
+        # Same content, same version: ETags and cursors work on either replica
+        assert a.merged.version == b.merged.version
+        first = TestClient(a.app).get("/issues", params={"limit": 2})
+        rest = TestClient(b.app).get("/issues", params={"cursor": first.json()["next_cursor"]})
+        assert len(first.json()["items"]) + len(rest.json()["items"]) == 4
+        assert TestClient(b.app).get(
+            "/issues", params={"limit": 2}, headers={"If-None-Match": first.headers["ETag"]}
+        ).status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_unchanged_peer_is_not_refetched(self, replicas):
+        transport, a, b = replicas
+        await a.aggregator.refresh()
+
+        await a.aggregator.refresh()
+
+        assert transport.statuses == [200, 304]
+        b.detect([make_issue("web-5")])
+        await a.aggregator.refresh()
+
+        assert transport.statuses[-1] == 200
+        names = {item["resource_name"] for item in a.merged.items()}
+        assert names == {"web-0", "web-2", "web-5"}
+
+    @pytest.mark.asyncio
+    async def test_unreachable_peer_keeps_its_last_issues(self, replicas):
+        transport, a, _ = replicas
+        await a.aggregator.refresh()
+        transport.down.add("pod-b")
+
+        await a.aggregator.refresh()
+
+        assert len(a.merged) == 4
+
+    @pytest.mark.asyncio
+    async def test_departed_peer_is_dropped(self, replicas):
+        _, a, _ = replicas
+        await a.aggregator.refresh()
+        a.aggregator.membership.peers = {}
+
+        await a.aggregator.refresh()
+
+        assert {item["resource_name"] for item in a.merged.items()} == {"web-0", "web-2"}
+
+    def test_history_pages_across_replicas(self, replicas):
+        _, a, b = replicas
+        client_a, client_b = TestClient(a.app), TestClient(b.app)
+
+        first = client_a.get("/issues/history", params={"limit": 3}).json()
+        rest = client_b.get("/issues/history", params={"cursor": first["next_cursor"]}).json()
+
+        names = [row["resource_name"] for row in first["items"] + rest["items"]]
+        assert sorted(names) == ["web-0", "web-1", "web-2", "web-3"]
+        assert len(names) == 4
+
+    def test_history_fails_when_peer_is_down(self, replicas):
+        transport, a, _ = replicas
+        transport.down.add("pod-b")
+
+        response = TestClient(a.app).get("/issues/history")
+
+        assert response.status_code == 503
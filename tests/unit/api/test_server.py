@@ -0,0 +1,160 @@
+"""Unit tests for the FastAPI server."""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.server import create_app
+from src.api.snapshot import IssueSnapshot
+from src.core.issue_store import IssueStore
+from src.detectors.base.detector import Issue, Platform, Severity
+from src.metrics import prometheus as metrics
+from src.utils.config import Config, MetricsConfig
+
+
+class TestServer:
+    """Test suite for the API server."""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(create_app(Config()))
+
+    def test_health(self, client):
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
+
+    def test_metrics_prometheus_exposition(self, client):
+        """Test /metrics serves the Prometheus text format."""
+        metrics.DETECTOR_DURATION.labels("TestDetector", "ok").observe(0.2)
+        metrics.ISSUES_FOUND.labels("low", "k8s").inc()
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert 'opsagent_detector_duration_seconds_bucket{detector="TestDetector"' in body
+        assert 'opsagent_issues_found_total{platform="k8s",severity="low"}' in body
+        assert "opsagent_detection_cycle_overruns_total" in body
+
+    @pytest.fixture
+    def snapshot(self):
+        snapshot = IssueSnapshot()
+        snapshot.publish([
+            Issue(
+                platform=Platform.K8S,
+                resource_type="Deployment",
+                resource_name=f"web-{i}",
+                namespace="default",
+                severity=Severity.HIGH if i % 2 else Severity.LOW,
+                title="Missing resource limits",
+                description="x" * 200,
+            )
+            for i in range(20)
+        ])
+        return snapshot
+
+    def test_issues_paginated_and_filtered(self, snapshot):
+        client = TestClient(create_app(Config(), snapshot=snapshot))
+
+        params = {"severity": "high", "limit": 5, "fields": "resource_name"}
+        response = client.get("/issues", params=params)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 10
+        assert len(data["items"]) == 5
+        assert set(data["items"][0]) == {"resource_name"}
+        assert data["next_cursor"]
+
+    def test_issues_etag_not_modified(self, snapshot):
+        client = TestClient(create_app(Config(), snapshot=snapshot))
+
+        first = client.get("/issues")
+        second = client.get("/issues", headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.content == b""
+
+    def test_issues_gzip(self, snapshot):
+        client = TestClient(create_app(Config(), snapshot=snapshot))
+
+        response = client.get("/issues", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "etag" in response.headers
+
+    def test_issues_bad_request(self, client):
+        assert client.get("/issues", params={"fields": "nope"}).status_code == 400
+
+    def test_issue_history(self, tmp_path):
+        store = IssueStore(str(tmp_path / "issues.db"))
+        store.upsert([
+            Issue(
+                platform=Platform.K8S, resource_type="Deployment", resource_name=f"web-{i}",
+                severity=Severity.LOW, title="t", description="d",
+            )
+            for i in range(3)
+        ])
+        client = TestClient(create_app(Config(), issue_store=store))
+
+        first = client.get("/issues/history", params={"limit": 2}).json()
+        rest = client.get("/issues/history", params={"cursor": first["next_cursor"]}).json()
+
+        assert len(first["items"]) + len(rest["items"]) == 3
+        store.close()
+
+    def test_issues_export_streams_ndjson(self):
+        async def stream_detection():
+            for i in range(3):
+                yield [
+                    Issue(
+                        platform=Platform.K8S, resource_type="Deployment",
+                        resource_name=f"web-{i}", severity=Severity.LOW,
+                        title="t", description="d",
+                    )
+                ]
+
+        engine = Mock(stream_detection=stream_detection)
+        client = TestClient(create_app(Config(), detection_engine=engine))
+
+        response = client.get("/issues/export")
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line)["resource_name"] for line in lines] == ["web-0", "web-1", "web-2"]
+
+    @pytest.mark.asyncio
+    async def test_issues_export_runs_one_at_a_time(self):
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def stream_detection():
+            started.set()
+            await release.wait()
+            yield []
+
+        app = create_app(Config(), detection_engine=Mock(stream_detection=stream_detection))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/issues/export"))
+            await started.wait()
+
+            rejected = await client.get("/issues/export")
+            release.set()
+            assert (await first).status_code == 200
+            assert (await client.get("/issues/export")).status_code == 200
+
+        assert rejected.status_code == 429
+        assert "Retry-After" in rejected.headers
+
+    def test_metrics_disabled(self):
+        client = TestClient(create_app(Config(metrics=MetricsConfig(enabled=False))))
+
+        assert client.get("/metrics").status_code == 404
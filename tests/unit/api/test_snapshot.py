@@ -0,0 +1,96 @@
+"""Unit tests for IssueSnapshot."""
+
+import json
+
+import pytest
+
+from src.api.snapshot import InvalidQuery, IssueSnapshot
+from src.detectors.base.detector import Issue, Platform, Severity
+
+
+def make_issue(name, severity=Severity.LOW, namespace="default") -> Issue:
+    return Issue(
+        platform=Platform.K8S,
+        resource_type="Deployment",
+        resource_name=name,
+        namespace=namespace,
+        severity=severity,
+        title="Missing resource limits",
+        description="test",
+        check="missing_resources",
+    )
+
+
+@pytest.fixture
+def snapshot():
+    snapshot = IssueSnapshot()
+    snapshot.publish([
+        make_issue("a"),
+        make_issue("b", severity=Severity.CRITICAL),
+        make_issue("c", namespace="prod"),
+        make_issue("d", severity=Severity.HIGH, namespace="prod"),
+    ])
+    return snapshot
+
+
+def page(snapshot, **query):
+    body, etag = snapshot.page(**query)
+    return json.loads(body), etag
+
+
+class TestIssueSnapshot:
+    """Test suite for IssueSnapshot."""
+
+    def test_most_severe_first(self, snapshot):
+        data, _ = page(snapshot)
+
+        assert [item["resource_name"] for item in data["items"]][:2] == ["b", "d"]
+        assert data["total"] == 4
+
+    def test_cursor_walks_every_issue_once(self, snapshot):
+        names, cursor = [], None
+        while True:
+            data, _ = page(snapshot, cursor=cursor, limit=3)
+            names += [item["resource_name"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert sorted(names) == ["a", "b", "c", "d"]
+
+    def test_filters_and_projection(self, snapshot):
+        data, _ = page(
+            snapshot,
+            filters={"namespace": "prod", "severity": "low"},
+            fields=["resource_name", "severity"],
+        )
+
+        assert data["items"] == [{"resource_name": "c", "severity": "low"}]
+
+    def test_invalid_query(self, snapshot):
+        with pytest.raises(InvalidQuery):
+            snapshot.page(fields=["secret"])
+        with pytest.raises(InvalidQuery):
+            snapshot.page(filters={"title": "x"})
+        with pytest.raises(InvalidQuery):
+            snapshot.page(cursor="not-a-cursor")
+
+    def test_version_tracks_content(self, snapshot):
+        version = snapshot.version
+
+        assert not snapshot.publish([
+            make_issue("a"),
+            make_issue("b", severity=Severity.CRITICAL),
+            make_issue("c", namespace="prod"),
+            make_issue("d", severity=Severity.HIGH, namespace="prod"),
+        ])
+        assert snapshot.version == version
+        assert snapshot.publish([make_issue("a")])
+        assert snapshot.version != version
+
+    def test_pages_are_cached(self, snapshot):
+        first, etag = snapshot.page(limit=2)
+        second, same_etag = snapshot.page(limit=2)
+
+        assert first is second
+        assert etag == same_etag == snapshot.etag(limit=2)
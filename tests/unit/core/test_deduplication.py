@@ -0,0 +1,144 @@
+"""Unit tests for IssueDeduplicator and issue fingerprints."""
+
+import pytest
+
+from src.core.deduplication import IssueDeduplicator
+from src.detectors.base.detector import Issue, Platform, Severity
+
+
+def make_issue(name="web", severity=Severity.LOW, container="app", **kwargs) -> Issue:
+    return Issue(
+        platform=Platform.K8S,
+        resource_type="Deployment",
+        resource_name=name,
+        namespace="default",
+        cluster="prod",
+        severity=severity,
+        title="Missing resource limits",
+        description="test",
+        check="missing_resources",
+        metadata={"container": container},
+        **kwargs,
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFingerprint:
+    """Test suite for Issue fingerprints."""
+
+    def test_stable_across_instances(self):
+        first, second = make_issue(), make_issue()
+
+        assert first.fingerprint == second.fingerprint
+        assert first.id == first.fingerprint
+
+    @pytest.mark.parametrize("changes", [
+        {"name": "api"},
+        {"container": "sidecar"},
+    ])
+    def test_distinct_targets(self, changes):
+        assert make_issue().fingerprint != make_issue(**changes).fingerprint
+
+    def test_cluster_is_part_of_identity(self):
+        other = make_issue()
+        other.cluster = "staging"
+
+        assert make_issue().fingerprint != other.fingerprint
+
+    def test_explicit_id_kept(self):
+        assert make_issue(id="custom").id == "custom"
+
+
+class TestIssueDeduplicator:
+    """Test suite for IssueDeduplicator."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def dedup(self, clock):
+        return IssueDeduplicator(ttl=100, clock=clock)
+
+    def test_repeat_is_unchanged(self, dedup):
+        first = dedup.update("k8s", [make_issue()])
+        second = dedup.update("k8s", [make_issue()])
+
+        assert len(first.new) == 1
+        assert second.actionable == []
+        assert len(second.unchanged) == 1
+
+    def test_changed_values(self, dedup):
+        dedup.update("k8s", [make_issue()])
+        delta = dedup.update("k8s", [make_issue(severity=Severity.HIGH)])
+
+        assert len(delta.changed) == 1
+        assert delta.actionable == delta.changed
+
+    def test_resolved_when_missing_from_complete_run(self, dedup):
+        dedup.update("k8s", [make_issue("a"), make_issue("b")])
+        delta = dedup.update("k8s", [make_issue("a")])
+
+        assert [issue.resource_name for issue in delta.resolved] == ["b"]
+        assert len(dedup) == 1
+
+    def test_failed_run_does_not_resolve(self, dedup):
+        dedup.update("k8s", [make_issue("a")])
+        delta = dedup.update("k8s", [], complete=False)
+
+        assert delta.resolved == []
+        assert len(dedup) == 1
+
+    def test_scopes_are_independent(self, dedup):
+        dedup.update("k8s", [make_issue("a")])
+        delta = dedup.update("rds", [])
+
+        assert delta.resolved == []
+        assert len(dedup.active()) == 1
+
+    def test_duplicates_within_run_collapse(self, dedup):
+        delta = dedup.update("k8s", [make_issue(), make_issue()])
+
+        assert len(delta.new) == 1
+
+    def test_ttl_eviction(self, dedup, clock):
+        dedup.update("k8s", [make_issue("a")])
+        clock.now = 101
+        delta = dedup.update("rds", [])
+
+        assert len(dedup) == 0
+        assert delta.resolved == []
+        # Reappearing after eviction counts as new again
+        assert len(dedup.update("k8s", [make_issue("a")]).new) == 1
+
+    def test_restored_issues_are_unchanged(self, dedup):
+        dedup.restore([("k8s", make_issue("a")), ("k8s", make_issue("b"))])
+
+        delta = dedup.update("k8s", [make_issue("a")])
+
+        assert delta.actionable == []
+        assert delta.fingerprints["unchanged"] == [make_issue("a").fingerprint]
+        assert [issue.resource_name for issue in delta.resolved] == ["b"]
+
+    def test_reported_issue_leaves_its_previous_scope(self, dedup):
+        dedup.restore([(None, make_issue("a")), (None, make_issue("b"))])
+
+        dedup.update("k8s", [make_issue("a"), make_issue("b")])
+        delta = dedup.update("k8s", [make_issue("a")])
+
+        assert [issue.resource_name for issue in delta.resolved] == ["b"]
+        assert dedup._scopes[""] == set()
+
+    def test_moved_issue_is_not_resolved_by_old_scope(self, dedup):
+        dedup.update("old", [make_issue("a")])
+        dedup.update("new", [make_issue("a")])
+
+        assert dedup.update("old", []).resolved == []
+        assert len(dedup) == 1
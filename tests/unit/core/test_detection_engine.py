@@ -0,0 +1,241 @@
+"""Unit tests for DetectionEngine."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.core.detection_engine import DetectionEngine
+from src.detectors.base.detector import IncompleteDetection, Issue, Platform, Severity
+from src.utils.config import AWSConfig, AzureConfig, Config, DetectionConfig, K8sConfig
+
+
+def _make_issue(name: str) -> Issue:
+    return Issue(
+        platform=Platform.K8S,
+        resource_type="Deployment",
+        resource_name=name,
+        severity=Severity.LOW,
+        title="test",
+        description="test",
+    )
+
+
+class FakeDetector:
+    """Detector stub that sleeps before returning a single issue."""
+
+    def __init__(self, name: str, delay: float = 0.0, error: Exception = None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.tracker = None
+
+    async def detect(self):
+        if self.tracker is not None:
+            self.tracker["running"] += 1
+            self.tracker["peak"] = max(self.tracker["peak"], self.tracker["running"])
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            return [_make_issue(self.name)]
+        finally:
+            if self.tracker is not None:
+                self.tracker["running"] -= 1
+
+
+class PagedDetector:
+    """Detector stub that streams ``pages`` batches of issues."""
+
+    def __init__(self, name: str, pages: int, error: Exception = None):
+        self.name = name
+        self.pages = pages
+        self.error = error
+        self.produced = 0
+
+    async def detect_stream(self):
+        for page in range(self.pages):
+            self.produced += 1
+            yield [_make_issue(f"{self.name}-{page}")]
+        if self.error:
+            raise self.error
+
+
+class TestDetectionEngine:
+    """Test suite for DetectionEngine."""
+
+    @pytest.fixture
+    def config(self):
+        return Config(
+            aws=AWSConfig(enabled=False),
+            azure=AzureConfig(enabled=False),
+            detection=DetectionConfig(interval=60, parallel_workers=2),
+        )
+
+    @pytest.fixture
+    def engine(self, config):
+        return DetectionEngine(config)
+
+    def test_one_k8s_detector_per_enabled_context(self):
+        """Test each enabled kubeconfig context gets its own detector."""
+        config = Config(
+            k8s=K8sConfig(contexts=[
+                {"name": "a", "enabled": True},
+                {"name": "b", "enabled": False},
+                {"name": "c"},
+            ]),
+            aws=AWSConfig(enabled=False),
+            azure=AzureConfig(enabled=False),
+        )
+
+        engine = DetectionEngine(config)
+
+        assert [d.cluster for d in engine.detectors] == ["a", "c"]
+
+    async def test_results_merged_in_detector_order(self, engine):
+        """Test issues keep detector order regardless of completion order."""
+        engine.detectors = [
+            FakeDetector("slow", delay=0.05),
+            FakeDetector("fast", delay=0.0),
+        ]
+
+        issues = await engine.run_detection()
+
+        assert [issue.resource_name for issue in issues] == ["slow", "fast"]
+
+    async def test_parallel_workers_bound(self, engine):
+        """Test no more than parallel_workers detectors run at once."""
+        tracker = {"running": 0, "peak": 0}
+        engine.detectors = [FakeDetector(f"d{i}", delay=0.02) for i in range(6)]
+        for detector in engine.detectors:
+            detector.tracker = tracker
+
+        issues = await engine.run_detection()
+
+        assert len(issues) == 6
+        assert tracker["peak"] == 2
+
+    async def test_detectors_run_concurrently(self, engine):
+        """Test cycle time is set by the slowest detector, not the sum."""
+        engine.detectors = [FakeDetector(f"d{i}", delay=0.1) for i in range(2)]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await engine.run_detection()
+
+        assert loop.time() - started < 0.18
+
+    async def test_detector_timeout(self, engine, config):
+        """Test a hung detector is abandoned after the timeout."""
+        config.detection.detector_timeout = 0.05
+        engine.detectors = [FakeDetector("hung", delay=10), FakeDetector("ok")]
+
+        issues = await engine.run_detection()
+
+        assert [issue.resource_name for issue in issues] == ["ok"]
+
+    async def test_detector_failure_isolated(self, engine):
+        """Test one failing detector does not drop the others' issues."""
+        engine.detectors = [
+            FakeDetector("broken", error=RuntimeError("boom")),
+            FakeDetector("ok"),
+        ]
+
+        issues = await engine.run_detection()
+
+        assert [issue.resource_name for issue in issues] == ["ok"]
+
+    async def test_incomplete_detector_reports_partial(self, engine):
+        """Test issues of a partial run are kept but the run is not complete."""
+        error = IncompleteDetection("1 manifest(s) could not be checked", [_make_issue("half")])
+        engine.detectors = [FakeDetector("partial", error=error), FakeDetector("ok")]
+
+        issues = await engine.run_detection()
+
+        assert [issue.resource_name for issue in issues] == ["half", "ok"]
+        assert engine.last_outcome == {"partial": "partial", "ok": "ok"}
+
+    async def test_run_detector_shares_worker_limit(self, engine):
+        """Test single-detector runs respect the engine-wide worker limit."""
+        tracker = {"running": 0, "peak": 0}
+        detectors = [FakeDetector(f"d{i}", delay=0.02) for i in range(4)]
+        for detector in detectors:
+            detector.tracker = tracker
+
+        results = await asyncio.gather(*(engine.run_detector(d) for d in detectors))
+
+        assert [issues[0].resource_name for issues in results] == ["d0", "d1", "d2", "d3"]
+        assert tracker["peak"] == 2
+        assert not engine._tasks
+
+    async def test_records_metrics(self, engine):
+        """Test detector durations and issue counts are exported."""
+        engine.detectors = [FakeDetector("metered")]
+        before = REGISTRY.get_sample_value(
+            "opsagent_issues_found_total", {"severity": "low", "platform": "k8s"}
+        ) or 0
+
+        await engine.run_detection()
+
+        assert REGISTRY.get_sample_value(
+            "opsagent_detector_duration_seconds_count",
+            {"detector": "metered", "outcome": "ok"}
+        ) == 1
+        assert REGISTRY.get_sample_value(
+            "opsagent_issues_found_total", {"severity": "low", "platform": "k8s"}
+        ) == before + 1
+
+    async def test_cancel(self, engine):
+        """Test cancel aborts in-flight detectors."""
+        engine.detectors = [FakeDetector("hung", delay=10)]
+
+        run = asyncio.create_task(engine.run_detection())
+        await asyncio.sleep(0.01)
+        engine.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        assert not engine._tasks
+
+    @pytest.mark.asyncio
+    async def test_stream_detection_yields_every_batch(self, engine):
+        engine.detectors = [
+            PagedDetector("a", pages=3),
+            PagedDetector("b", pages=2, error=RuntimeError("boom")),
+        ]
+
+        names = []
+        async for batch in engine.stream_detection():
+            names.extend(issue.resource_name for issue in batch)
+
+        assert sorted(names) == ["a-0", "a-1", "a-2", "b-0", "b-1"]
+        assert not engine._tasks
+
+    @pytest.mark.asyncio
+    async def test_stream_detection_applies_backpressure(self, engine):
+        """Test producers stop at the queue bound and are cancelled on close."""
+        detector = PagedDetector("a", pages=1000)
+        engine.detectors = [detector]
+
+        stream = engine.stream_detection(queue_size=2)
+        await stream.__anext__()
+        await asyncio.sleep(0.01)
+        assert detector.produced <= 4
+
+        await stream.aclose()
+        assert not engine._tasks
+
+    @pytest.mark.asyncio
+    async def test_skips_detectors_owned_by_other_replica(self, config):
+        shard = Mock(granularity="cluster")
+        shard.owns.side_effect = lambda key: key == "detector:mine"
+        engine = DetectionEngine(config, shard=shard)
+        mine, theirs = FakeDetector("mine"), FakeDetector("theirs")
+        mine.shard = theirs.shard = None
+        engine.detectors = [mine, theirs]
+
+        issues = await engine.run_detection()
+
+        assert [issue.resource_name for issue in issues] == ["mine"]
+        assert engine.last_outcome == {"mine": "ok", "theirs": "skipped"}
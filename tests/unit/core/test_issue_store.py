@@ -0,0 +1,154 @@
+"""Unit tests for IssueStore."""
+
+import sqlite3
+
+import pytest
+
+from src.core.issue_store import IssueStore
+from src.detectors.base.detector import Issue, Platform, Severity
+from src.utils import serialization
+from src.utils.serialization import dumps
+
+
+def make_issue(name="web", severity=Severity.LOW, namespace="default", **kwargs) -> Issue:
+    return Issue(
+        platform=Platform.K8S,
+        resource_type="Deployment",
+        resource_name=name,
+        namespace=namespace,
+        cluster="prod",
+        severity=severity,
+        title="Missing resource limits",
+        description="test",
+        check="missing_resources",
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = IssueStore(str(tmp_path / "issues.db"), retention_days=1)
+    yield store
+    store.close()
+
+
+class TestIssueStore:
+    """Test suite for IssueStore."""
+
+    def test_uses_wal(self, store):
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_reads_do_not_wait_for_writer(self, store):
+        store.upsert([make_issue()])
+
+        with store._lock:  # As if a large ingestion transaction were running
+            assert store.count() == 1
+
+    def test_open_issues_round_trip(self, store):
+        issue = make_issue("a", metadata={"container": "app"})
+        store.upsert([issue, make_issue("b")], scope="k8s")
+        store.mark_resolved([make_issue("b").fingerprint])
+
+        [(scope, data)] = store.open_issues()
+
+        assert scope == "k8s"
+        assert Issue.from_dict(data) == issue
+        assert Issue.from_dict(data).fingerprint == issue.fingerprint
+
+    @pytest.mark.parametrize("backend", ["orjson", "json"])
+    def test_query_returns_to_dict_form(self, store, monkeypatch, backend):
+        if backend == "json":
+            monkeypatch.setattr(serialization, "orjson", None)
+        elif serialization.orjson is None:
+            pytest.skip("orjson not installed")
+        issue = make_issue(metadata={"container": "app"}, current_value={"cpu": None})
+        store.upsert([issue], seen_at=100.0)
+
+        [row] = store.query()
+
+        assert row == {
+            **issue.to_dict(), "first_seen": 100.0, "last_seen": 100.0, "resolved_at": None
+        }
+
+    def test_reads_dict_payloads_of_older_rows(self, store):
+        issue = make_issue()
+        store.upsert([issue])
+        store._conn.execute("UPDATE issues SET payload = ?", (dumps(issue.to_dict()),))
+
+        assert store.query()[0]["resource_name"] == "web"
+        assert Issue.from_dict(store.open_issues()[0][1]) == issue
+
+    def test_adds_scope_to_existing_database(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE issues (fingerprint TEXT PRIMARY KEY, id TEXT NOT NULL,"
+            " platform TEXT NOT NULL, cluster TEXT, region TEXT, namespace TEXT,"
+            " resource_type TEXT NOT NULL, resource_name TEXT NOT NULL, check_name TEXT,"
+            " severity TEXT NOT NULL, title TEXT NOT NULL, first_seen REAL NOT NULL,"
+            " last_seen REAL NOT NULL, resolved_at REAL, payload BLOB NOT NULL)"
+        )
+        conn.close()
+
+        store = IssueStore(path)
+        store.upsert([make_issue()], scope="k8s")
+
+        assert [scope for scope, _ in store.open_issues()] == ["k8s"]
+        store.close()
+
+    def test_upsert_keeps_first_seen(self, store):
+        store.upsert([make_issue()], seen_at=100.0)
+        store.upsert([make_issue(severity=Severity.HIGH)], seen_at=200.0)
+
+        [row] = store.query()
+        assert row["first_seen"] == 100.0
+        assert row["last_seen"] == 200.0
+        assert row["severity"] == "high"
+
+    def test_touch_refreshes_last_seen(self, store):
+        issue = make_issue()
+        store.upsert([issue], seen_at=100.0)
+        store.touch([issue.fingerprint], seen_at=300.0)
+
+        [row] = store.query()
+        assert (row["first_seen"], row["last_seen"]) == (100.0, 300.0)
+
+    def test_filters(self, store):
+        store.upsert([
+            make_issue("a", severity=Severity.HIGH),
+            make_issue("b", namespace="prod"),
+            make_issue("c"),
+        ])
+
+        assert [r["resource_name"] for r in store.query({"severity": "high"})] == ["a"]
+        assert store.count({"namespace": "default"}) == 2
+        with pytest.raises(ValueError):
+            store.query({"payload": "x"})
+
+    def test_keyset_pagination(self, store):
+        for i in range(5):
+            store.upsert([make_issue(f"w{i}")], seen_at=float(i))
+
+        first = store.query(limit=2)
+        last = first[-1]
+        rest = store.query(after=(last["first_seen"], last["fingerprint"]), limit=10)
+
+        assert [r["resource_name"] for r in first + rest] == [f"w{i}" for i in range(5)]
+
+    def test_resolved_hidden_and_reopened(self, store):
+        issue = make_issue()
+        store.upsert([issue])
+        store.mark_resolved([issue.fingerprint])
+
+        assert store.query() == []
+        assert store.query(active_only=False)[0]["resolved_at"] is not None
+
+        store.upsert([issue])
+        assert store.count() == 1
+
+    def test_prune(self, store):
+        store.upsert([make_issue("old")], seen_at=0.0)
+        store.upsert([make_issue("new")], seen_at=100_000.0)
+
+        assert store.prune(now=100_000.0) == 1
+        assert [r["resource_name"] for r in store.query()] == ["new"]
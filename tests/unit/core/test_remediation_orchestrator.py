@@ -0,0 +1,100 @@
+"""Unit tests for RemediationOrchestrator."""
+
+import asyncio
+
+import pytest
+
+from src.core.remediation_orchestrator import RemediationOrchestrator
+from src.detectors.base.detector import Issue, Platform, Severity
+from src.utils.config import Config, RemediationConfig
+
+
+def make_issue(name: str, namespace: str = "default") -> Issue:
+    return Issue(
+        platform=Platform.K8S,
+        resource_type="Deployment",
+        resource_name=name,
+        namespace=namespace,
+        severity=Severity.LOW,
+        title="test",
+        description="test",
+    )
+
+
+class TestRemediationOrchestrator:
+    """Test suite for RemediationOrchestrator."""
+
+    @pytest.fixture
+    def orchestrator(self):
+        config = Config(remediation=RemediationConfig(
+            max_concurrent_fixes=3, max_retries=2, retry_backoff=0.001
+        ))
+        return RemediationOrchestrator(config)
+
+    def track(self, orchestrator, delay=0.01, failures=None):
+        """Replace the fix step with one that records concurrency."""
+        state = {"running": 0, "peak": 0, "per_resource": {}, "overlap": False, "calls": []}
+        failures = dict(failures or {})
+
+        async def fix(issue):
+            state["calls"].append(issue.resource_name)
+            key = issue.resource_name
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            state["per_resource"][key] = state["per_resource"].get(key, 0) + 1
+            if state["per_resource"][key] > 1:
+                state["overlap"] = True
+            try:
+                await asyncio.sleep(delay)
+                if failures.get(key):
+                    failures[key] -= 1
+                    raise RuntimeError("transient")
+            finally:
+                state["running"] -= 1
+                state["per_resource"][key] -= 1
+
+        orchestrator._process_single_issue = fix
+        return state
+
+    async def test_bounded_concurrency(self, orchestrator):
+        state = self.track(orchestrator)
+
+        await orchestrator.process_issues([make_issue(f"app-{i}") for i in range(10)])
+
+        assert len(state["calls"]) == 10
+        assert state["peak"] == 3
+
+    async def test_concurrency_limit_shared_across_calls(self, orchestrator):
+        state = self.track(orchestrator)
+
+        await asyncio.gather(
+            orchestrator.process_issues([make_issue(f"a-{i}") for i in range(5)]),
+            orchestrator.process_issues([make_issue(f"b-{i}") for i in range(5)]),
+        )
+
+        assert len(state["calls"]) == 10
+        assert state["peak"] == 3
+
+    async def test_same_resource_never_fixed_concurrently(self, orchestrator):
+        state = self.track(orchestrator)
+
+        await orchestrator.process_issues([make_issue("same") for _ in range(4)])
+
+        assert len(state["calls"]) == 4
+        assert state["overlap"] is False
+        assert orchestrator._resource_locks == {}
+
+    async def test_retries_with_backoff(self, orchestrator):
+        state = self.track(orchestrator, failures={"flaky": 2})
+
+        await orchestrator.process_issues([make_issue("flaky")])
+
+        assert state["calls"] == ["flaky"] * 3
+
+    async def test_gives_up_after_max_retries(self, orchestrator):
+        state = self.track(orchestrator, failures={"broken": 10})
+
+        await orchestrator.process_issues([make_issue("broken"), make_issue("ok")])
+
+        assert state["calls"].count("broken") == 3
+        assert state["calls"].count("ok") == 1
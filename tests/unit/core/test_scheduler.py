@@ -0,0 +1,313 @@
+"""Unit tests for Scheduler."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.core.detection_engine import DetectionEngine
+from src.core.issue_store import IssueStore
+from src.core.scheduler import Scheduler
+from src.detectors.base.detector import Issue, Platform, Severity
+from src.utils.config import AWSConfig, Config, DetectionConfig, K8sConfig
+
+
+def blocking_job(release):
+    """Return an async job mock that waits until ``release`` is set."""
+    async def wait():
+        await release.wait()
+    return AsyncMock(side_effect=wait)
+
+
+def overruns(job_id, action):
+    return REGISTRY.get_sample_value(
+        "opsagent_scheduler_overruns_total", {"job": job_id, "action": action}
+    ) or 0
+
+
+def cycle_count(labels):
+    return REGISTRY.get_sample_value(
+        "opsagent_detection_cycle_duration_seconds_count", labels
+    ) or 0
+
+
+def cycle_overruns(labels):
+    return REGISTRY.get_sample_value("opsagent_detection_cycle_overruns_total", labels) or 0
+
+
+class TestScheduler:
+    """Test suite for Scheduler overlap handling."""
+
+    def make_scheduler(self, **detection):
+        config = Config(detection=DetectionConfig(interval=60, **detection))
+        scheduler = Scheduler(config, detection_engine=Mock())
+        scheduler.scheduler = Mock(running=True)
+        return scheduler
+
+    def add_job(self, scheduler, job_id, func):
+        scheduler._add_guarded_job(job_id, job_id, func, scheduler.config.detection.interval)
+
+    def test_per_detector_jobs_use_check_interval(self):
+        """Test each detector gets its own job at its own interval."""
+        scheduler = self.make_scheduler(jitter=5)
+        cheap = Mock(check_interval=30, check_jitter=None)
+        cheap.name = "k8s"
+        default = Mock(check_interval=None, check_jitter=20)
+        default.name = "rds"
+        scheduler.detection_engine.detectors = [cheap, default]
+
+        scheduler.start()
+
+        jobs = {
+            call.kwargs["id"]: call.kwargs["trigger"]
+            for call in scheduler.scheduler.add_job.call_args_list
+        }
+        assert jobs["detect:k8s"].interval.total_seconds() == 30
+        assert jobs["detect:rds"].interval.total_seconds() == 60
+        assert jobs["detect:k8s"].jitter == 5  # Global detection.jitter
+        assert jobs["detect:rds"].jitter == 20  # The detector's own check_jitter
+
+    def test_single_job_when_per_detector_disabled(self):
+        scheduler = self.make_scheduler(per_detector_schedules=False)
+        scheduler.detection_engine.detectors = [Mock(check_interval=30)]
+
+        scheduler.start()
+
+        ids = [call.kwargs["id"] for call in scheduler.scheduler.add_job.call_args_list]
+        assert ids == ["detection_job"]
+
+    async def test_detector_job_remediates_only_new_issues(self):
+        """Test repeated issues are not re-sent to remediation."""
+        scheduler = self.make_scheduler()
+        detector = Mock()
+        detector.name = "k8s"
+        issue = Issue(
+            platform=Platform.K8S,
+            resource_type="Deployment",
+            resource_name="web",
+            severity=Severity.LOW,
+            title="test",
+            description="test",
+        )
+        scheduler.detection_engine.last_outcome = {"k8s": "ok"}
+        scheduler.detection_engine.run_detector = AsyncMock(return_value=[issue])
+        scheduler.remediation_orchestrator.process_issues = AsyncMock()
+
+        await scheduler._detector_job(detector)
+        await scheduler._detector_job(detector)
+
+        scheduler.detection_engine.run_detector.assert_awaited_with(detector)
+        scheduler.remediation_orchestrator.process_issues.assert_awaited_once_with([issue])
+
+    async def test_failed_k8s_run_does_not_resolve_issues(self):
+        """Test a failed list keeps open issues open until the cluster recovers."""
+        from kubernetes.client.rest import ApiException
+
+        config = Config(
+            k8s=K8sConfig(contexts=[{"name": "prod"}]),
+            aws=AWSConfig(enabled=False),
+            detection=DetectionConfig(interval=60),
+        )
+        engine = DetectionEngine(config)
+        detector = engine.detectors[0]
+        scheduler = Scheduler(config, detection_engine=engine)
+        scheduler.remediation_orchestrator.process_issues = AsyncMock()
+
+        def response(*names):
+            return Mock(data=json.dumps({"metadata": {}, "items": [
+                {
+                    "metadata": {"name": name, "namespace": "shop", "uid": name},
+                    "spec": {"template": {"spec": {"containers": [{"name": "app"}]}}},
+                }
+                for name in names
+            ]}).encode())
+
+        detector._k8s_client = Mock()
+        detector._k8s_client.list_stateful_set_for_all_namespaces.side_effect = (
+            lambda **kwargs: response()
+        )
+        detector._k8s_client.list_daemon_set_for_all_namespaces.side_effect = (
+            lambda **kwargs: response()
+        )
+        detector._k8s_client.list_deployment_for_all_namespaces.side_effect = [
+            response("web", "api"),
+            ApiException(status=500, reason="Internal Server Error"),
+            response("web", "api"),
+        ]
+
+        open_issues = []
+        for _ in range(3):
+            await scheduler._detector_job(detector)
+            open_issues.append(len(scheduler.deduplicator))
+
+        assert open_issues == [2, 2, 2]
+        assert engine.last_outcome[detector.name] == "ok"
+        scheduler.remediation_orchestrator.process_issues.assert_awaited_once()
+
+    async def test_skip_policy_drops_overlapping_tick(self):
+        scheduler = self.make_scheduler(overlap_policy="skip")
+        release = asyncio.Event()
+        func = blocking_job(release)
+        self.add_job(scheduler, "skip_job", func)
+        before = overruns("skip_job", "skipped")
+
+        first = asyncio.create_task(scheduler._run_guarded("skip_job"))
+        await asyncio.sleep(0)
+        await scheduler._run_guarded("skip_job")
+        release.set()
+        await first
+
+        assert func.await_count == 1
+        assert overruns("skip_job", "skipped") == before + 1
+
+    async def test_coalesce_policy_runs_once_more(self):
+        scheduler = self.make_scheduler(overlap_policy="coalesce")
+        release = asyncio.Event()
+        func = blocking_job(release)
+        self.add_job(scheduler, "coalesce_job", func)
+
+        first = asyncio.create_task(scheduler._run_guarded("coalesce_job"))
+        await asyncio.sleep(0)
+        # Several ticks during one run collapse into a single follow-up run
+        await scheduler._run_guarded("coalesce_job")
+        await scheduler._run_guarded("coalesce_job")
+        release.set()
+        await first
+
+        assert func.await_count == 2
+        assert overruns("coalesce_job", "coalesced") >= 2
+
+    async def test_delay_policy_reschedules_from_run_end(self):
+        scheduler = self.make_scheduler(overlap_policy="delay")
+        self.add_job(scheduler, "delay_job", AsyncMock())
+
+        await scheduler._run_guarded("delay_job")
+
+        scheduler.scheduler.reschedule_job.assert_called_once()
+        trigger = scheduler.scheduler.reschedule_job.call_args.kwargs["trigger"]
+        assert trigger.interval.total_seconds() == 60
+
+    async def test_run_records_duration_and_overrun(self):
+        scheduler = self.make_scheduler()
+        self.add_job(scheduler, "detect:slow", AsyncMock())
+        self.add_job(scheduler, "detect:fast", AsyncMock())
+        scheduler._jobs["detect:slow"].interval = 0  # Any run outlasts it
+        labels = [{"job": "detect:slow"}, {"job": "detect:fast"}]
+        before = [(cycle_count(label), cycle_overruns(label)) for label in labels]
+
+        await scheduler._run_guarded("detect:slow")
+        await scheduler._run_guarded("detect:fast")
+
+        after = [(cycle_count(label), cycle_overruns(label)) for label in labels]
+        assert after[0] == (before[0][0] + 1, before[0][1] + 1)
+        assert after[1] == (before[1][0] + 1, before[1][1])
+
+    async def test_skip_policy_keeps_schedule(self):
+        scheduler = self.make_scheduler(overlap_policy="skip")
+        self.add_job(scheduler, "steady_job", AsyncMock())
+
+        await scheduler._run_guarded("steady_job")
+
+        scheduler.scheduler.reschedule_job.assert_not_called()
+
+    @pytest.mark.parametrize("duration, expected", [
+        (100, 150),  # Stretched to duration * headroom
+        (1000, 240),  # Capped at 4x the base interval
+        (10, 60),  # Never below the configured interval
+    ])
+    def test_adaptive_interval(self, duration, expected):
+        scheduler = self.make_scheduler(adaptive_interval=True, adaptive_headroom=1.5)
+        self.add_job(scheduler, "adaptive_job", AsyncMock())
+        state = scheduler._jobs["adaptive_job"]
+        state.last_duration = duration
+
+        scheduler._reschedule(state)
+
+        assert state.interval == expected
+        assert REGISTRY.get_sample_value(
+            "opsagent_scheduler_interval_seconds", {"job": "adaptive_job"}
+        ) == expected
+
+    def test_adaptive_interval_shrinks_back(self):
+        scheduler = self.make_scheduler(adaptive_interval=True)
+        self.add_job(scheduler, "shrink_job", AsyncMock())
+        state = scheduler._jobs["shrink_job"]
+        state.interval = 200
+        state.last_duration = 5
+
+        scheduler._reschedule(state)
+
+        assert state.interval == 60
+
+    @pytest.mark.asyncio
+    async def test_handle_issues_persists_to_store(self):
+        """Test each run is written to the issue store and resolutions recorded."""
+        scheduler = self.make_scheduler()
+        scheduler.issue_store = Mock()
+        scheduler.remediation_orchestrator = Mock(process_issues=AsyncMock())
+        issue = Issue(
+            platform=Platform.K8S, resource_type="Deployment", resource_name="web",
+            severity=Severity.LOW, title="t", description="d",
+        )
+
+        await scheduler._handle_issues("k8s", [issue], complete=True)
+        await scheduler._handle_issues("k8s", [issue], complete=True)
+        await scheduler._handle_issues("k8s", [], complete=True)
+
+        scheduler.issue_store.upsert.assert_any_call(
+            [issue], scope="k8s", fingerprints=[issue.fingerprint]
+        )
+        scheduler.issue_store.touch.assert_any_call([issue.fingerprint])
+        scheduler.issue_store.mark_resolved.assert_called_once_with([issue.fingerprint])
+
+    @pytest.mark.asyncio
+    async def test_restart_does_not_remediate_open_issues_again(self, tmp_path):
+        store = IssueStore(str(tmp_path / "issues.db"))
+        issues = [
+            Issue(
+                platform=Platform.K8S, resource_type="Deployment", resource_name=name,
+                severity=Severity.LOW, title="t", description="d",
+            )
+            for name in ("web", "api")
+        ]
+        before = self.make_scheduler()
+        before.issue_store = store
+        before.remediation_orchestrator = Mock(process_issues=AsyncMock())
+        await before._handle_issues("k8s", issues, complete=True)
+
+        after = self.make_scheduler()
+        after.issue_store = store
+        after.remediation_orchestrator = Mock(process_issues=AsyncMock())
+        after.restore_open_issues()
+        await after._handle_issues("k8s", issues[:1], complete=True)
+
+        after.remediation_orchestrator.process_issues.assert_not_awaited()
+        assert [row["resource_name"] for row in store.query()] == ["web"]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_handle_issues_publishes_snapshot_on_change(self):
+        scheduler = self.make_scheduler()
+        scheduler.snapshot = Mock()
+        scheduler.remediation_orchestrator = Mock(process_issues=AsyncMock())
+        issue = Issue(
+            platform=Platform.K8S, resource_type="Deployment", resource_name="web",
+            severity=Severity.LOW, title="t", description="d",
+        )
+
+        await scheduler._handle_issues("k8s", [issue], complete=True)
+        await scheduler._handle_issues("k8s", [issue], complete=True)
+
+        scheduler.snapshot.publish.assert_called_once_with([issue])
+
+    def test_run_all_now_triggers_every_job(self):
+        scheduler = self.make_scheduler()
+        self.add_job(scheduler, "detect:a", AsyncMock())
+        self.add_job(scheduler, "detect:b", AsyncMock())
+
+        scheduler.run_all_now()
+
+        triggered = [call.args[0] for call in scheduler.scheduler.modify_job.call_args_list]
+        assert triggered == ["detect:a", "detect:b"]
@@ -0,0 +1,180 @@
+"""Unit tests for consistent hashing and Lease-based shard membership."""
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from src.core.sharding import HashRing, ShardMembership
+from src.utils.config import ShardingConfig
+
+KEYS = [f"prod/ns-{i}" for i in range(2000)]
+
+
+class FakeLeaseApi:
+    """In-memory stand-in for CoordinationV1Api shared by several replicas."""
+
+    def __init__(self):
+        self.leases = {}
+        self.versions = {}
+
+    def patch_namespaced_lease(self, name, namespace, body):
+        if name not in self.leases:
+            raise ApiException(status=404)
+        self.create_namespaced_lease(namespace, body)
+
+    def create_namespaced_lease(self, namespace, body):
+        name = body["metadata"]["name"]
+        self.leases[name] = body
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def list_namespaced_lease(self, namespace, label_selector=None):
+        """Return the leases the way the client deserializes them."""
+        items = []
+        for name, body in self.leases.items():
+            spec = body["spec"]
+            items.append(SimpleNamespace(
+                metadata=SimpleNamespace(
+                    name=name,
+                    resource_version=str(self.versions[name]),
+                    annotations=body["metadata"].get("annotations"),
+                ),
+                spec=SimpleNamespace(
+                    holder_identity=spec["holderIdentity"],
+                    lease_duration_seconds=spec["leaseDurationSeconds"],
+                    renew_time=datetime.strptime(spec["renewTime"], "%Y-%m-%dT%H:%M:%S.%fZ"),
+                    acquire_time=None,
+                ),
+            ))
+        return SimpleNamespace(items=items)
+
+    def delete_namespaced_lease(self, name, namespace, body=None):
+        if name not in self.leases:
+            raise ApiException(status=404)
+        expected = ((body or {}).get("preconditions") or {}).get("resourceVersion")
+        if expected is not None and expected != str(self.versions[name]):
+            raise ApiException(status=409)
+        del self.leases[name]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+def make_member(identity, api, clock, **settings):
+    config = ShardingConfig(enabled=True, identity=identity, namespace="ops", **settings)
+    return ShardMembership(config, api=api, clock=clock)
+
+
+class TestHashRing:
+    """Test suite for HashRing."""
+
+    def test_keys_spread_evenly(self):
+        ring = HashRing(["a", "b", "c", "d"], vnodes=128)
+
+        counts = Counter(ring.owner(key) for key in KEYS)
+
+        assert set(counts) == {"a", "b", "c", "d"}
+        assert min(counts.values()) > len(KEYS) / 4 * 0.6
+
+    def test_join_moves_only_the_new_share(self):
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b", "c", "d"])
+
+        moved = [key for key in KEYS if before.owner(key) != after.owner(key)]
+
+        assert all(after.owner(key) == "d" for key in moved)
+        assert len(moved) < len(KEYS) / 4 * 1.5
+
+    def test_empty_ring(self):
+        assert HashRing([]).owner("x") is None
+
+
+class TestShardMembership:
+    """Test suite for ShardMembership."""
+
+    @pytest.mark.asyncio
+    async def test_replicas_partition_keys(self):
+        api, clock = FakeLeaseApi(), FakeClock()
+        replicas = [make_member(name, api, clock) for name in ("pod-a", "pod-b", "pod-c")]
+
+        for replica in replicas:
+            await replica.sync()
+        for replica in replicas:  # Everyone sees every lease on the second round
+            await replica.sync()
+
+        for key in KEYS[:200]:
+            assert sum(replica.owns(key) for replica in replicas) == 1
+        assert replicas[0].members == {"pod-a", "pod-b", "pod-c"}
+
+    @pytest.mark.asyncio
+    async def test_peers_advertise_api_urls(self, monkeypatch):
+        monkeypatch.setenv("POD_IP", "10.0.0.2")
+        api, clock = FakeLeaseApi(), FakeClock()
+        a = make_member("pod-a", api, clock, advertise_url="http://pod-a:18080/")
+        b = make_member("pod-b", api, clock)
+        await a.sync()
+        await b.sync()
+        await a.sync()
+
+        assert a.peers == {"pod-b": "http://10.0.0.2:18080"}
+        assert b.peers == {"pod-a": "http://pod-a:18080"}
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_rebalances(self):
+        api, clock = FakeLeaseApi(), FakeClock()
+        a, b = make_member("pod-a", api, clock), make_member("pod-b", api, clock)
+        changes = []
+        a.add_listener(lambda: changes.append(set(a.members)))
+        await b.sync()
+        await a.sync()
+
+        clock.now += timedelta(seconds=30)  # pod-b stopped renewing
+        await a.sync()
+
+        assert changes == [{"pod-a", "pod-b"}, {"pod-a"}]
+        assert all(a.owns(key) for key in KEYS[:100])
+        # The crashed replica's lease is garbage-collected
+        assert list(api.leases) == ["opsagent-shard-pod-a"]
+
+    @pytest.mark.asyncio
+    async def test_renewed_lease_is_not_deleted(self):
+        api, clock = FakeLeaseApi(), FakeClock()
+        a, b = make_member("pod-a", api, clock), make_member("pod-b", api, clock)
+        await b.sync()
+        clock.now += timedelta(seconds=30)
+        stale = api.list_namespaced_lease("ops").items[0]
+        await b.sync()  # pod-b renews after pod-a listed its lease
+
+        a._delete_expired(api, stale)
+
+        assert "opsagent-shard-pod-b" in api.leases
+
+    @pytest.mark.asyncio
+    async def test_stop_releases_lease(self):
+        api, clock = FakeLeaseApi(), FakeClock()
+        member = make_member("pod-a", api, clock)
+        await member.start()
+
+        assert "opsagent-shard-pod-a" in api.leases
+        await member.stop()
+        assert api.leases == {}
+
+    @pytest.mark.asyncio
+    async def test_api_failure_keeps_scanning_alone(self):
+        def unavailable(*args, **kwargs):
+            raise ApiException(status=500)
+
+        api = FakeLeaseApi()
+        api.list_namespaced_lease = unavailable
+        member = make_member("pod-a", api, FakeClock())
+
+        await member.sync()
+
+        assert member.owns("prod/default")
@@ -0,0 +1,67 @@
+"""Unit tests for bulk issue encoding."""
+
+import json
+
+import pytest
+
+from src.detectors.base import encoding
+from src.detectors.base.detector import Issue, Platform, Severity
+
+
+def make_issue(name="web") -> Issue:
+    return Issue(
+        platform=Platform.K8S,
+        resource_type="Deployment",
+        resource_name=name,
+        severity=Severity.HIGH,
+        title="Missing resource limits",
+        description="test",
+        namespace="default",
+        metadata={"container": "app"},
+    )
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(encoding, "orjson", None)
+    elif encoding.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestEncoding:
+    """Test suite for issue encoders."""
+
+    def test_issue_is_slotted(self):
+        assert not hasattr(make_issue(), "__dict__")
+
+    def test_encode_issues(self, backend):
+        issues = [make_issue("a"), make_issue("b")]
+
+        decoded = json.loads(encoding.encode_issues(issues))
+
+        assert [item["resource_name"] for item in decoded] == ["a", "b"]
+        assert decoded[0]["fingerprint"] == issues[0].fingerprint
+        assert decoded[0]["severity"] == "high"
+        assert decoded[0]["platform"] == "k8s"
+        assert decoded[0]["detected_at"].startswith(str(issues[0].detected_at.date()))
+
+    def test_backends_emit_the_same_fields(self, monkeypatch):
+        if encoding.orjson is None:
+            pytest.skip("orjson not installed")
+        issue = make_issue("ü")
+        with_orjson = encoding.encode_issue(issue)
+        monkeypatch.setattr(encoding, "orjson", None)
+
+        assert with_orjson == encoding.encode_issue(issue)
+        assert list(json.loads(with_orjson)) == list(issue.to_dict())
+
+    def test_encode_ndjson(self, backend):
+        lines = encoding.encode_ndjson([make_issue("a"), make_issue("b")]).splitlines()
+
+        assert [json.loads(line)["resource_name"] for line in lines] == ["a", "b"]
+
+    def test_empty(self, backend):
+        assert encoding.encode_issues([]) == b"[]"
+        assert encoding.encode_ndjson([]) == b""
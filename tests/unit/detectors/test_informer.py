@@ -0,0 +1,137 @@
+"""Unit tests for WorkloadInformer."""
+
+from unittest.mock import Mock
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from src.detectors.k8s.informer import WorkloadInformer
+
+
+def make_workload(name, generation=1, labels=None, namespace="default"):
+    workload = Mock()
+    workload.metadata.name = name
+    workload.metadata.namespace = namespace
+    workload.metadata.generation = generation
+    workload.metadata.labels = labels or {}
+    return workload
+
+
+def make_list(items, resource_version="100", continue_token=None):
+    result = Mock()
+    result.items = items
+    result.metadata.resource_version = resource_version
+    result.metadata._continue = continue_token
+    return result
+
+
+class FakeWatch:
+    """Watch stub that replays a fixed list of events or raises."""
+
+    def __init__(self, events=None, error=None, on_done=None):
+        self.events = events or []
+        self.error = error
+        self.on_done = on_done
+        self.resource_version = None
+
+    def stream(self, func, **kwargs):
+        for event in self.events:
+            self.resource_version = event["object"].metadata.resource_version
+            yield event
+        if self.on_done:
+            self.on_done()
+        if self.error:
+            raise self.error
+
+    def stop(self):
+        pass
+
+
+class TestWorkloadInformer:
+    """Test suite for WorkloadInformer."""
+
+    @pytest.fixture
+    def check_fn(self):
+        return Mock(side_effect=lambda obj: [f"issue:{obj.metadata.name}"])
+
+    def test_relist_loads_all_pages(self, check_fn):
+        """Test the initial list follows continue tokens and records the RV."""
+        list_fn = Mock(side_effect=[
+            make_list([make_workload("a")], continue_token="next"),
+            make_list([make_workload("b")], resource_version="100"),
+        ])
+        informer = WorkloadInformer("Deployment", list_fn, check_fn, page_size=1)
+
+        informer._relist()
+
+        assert sorted(informer.issues()) == ["issue:a", "issue:b"]
+        assert informer._resource_version == "100"
+        assert informer.wait_for_sync(0)
+
+    def test_unchanged_generation_not_rechecked(self, check_fn):
+        """Test status-only updates do not re-run the template check."""
+        informer = WorkloadInformer("Deployment", Mock(), check_fn)
+        informer._apply("ADDED", make_workload("a", generation=1))
+        informer._apply("MODIFIED", make_workload("a", generation=1))
+
+        assert check_fn.call_count == 1
+
+    def test_changed_generation_rechecked(self, check_fn):
+        """Test spec changes re-run the template check for that object only."""
+        informer = WorkloadInformer("Deployment", Mock(), check_fn)
+        informer._apply("ADDED", make_workload("a", generation=1))
+        informer._apply("ADDED", make_workload("b", generation=1))
+        informer._apply("MODIFIED", make_workload("a", generation=2))
+
+        assert check_fn.call_count == 3
+        assert check_fn.call_args.args[0].metadata.name == "a"
+
+    def test_label_change_rechecked(self, check_fn):
+        """Test label changes re-run the check since labels become issue tags."""
+        informer = WorkloadInformer("Deployment", Mock(), check_fn)
+        informer._apply("ADDED", make_workload("a", labels={"app": "x"}))
+        informer._apply("MODIFIED", make_workload("a", labels={"app": "y"}))
+
+        assert check_fn.call_count == 2
+
+    def test_deleted_removes_issues(self, check_fn):
+        """Test deleted objects drop out of the cache."""
+        informer = WorkloadInformer("Deployment", Mock(), check_fn)
+        informer._apply("ADDED", make_workload("a"))
+        informer._apply("DELETED", make_workload("a"))
+
+        assert informer.issues() == []
+
+    def test_resync_after_gone(self, check_fn):
+        """Test a 410 Gone watch error triggers a fresh list."""
+        list_fn = Mock(side_effect=[
+            make_list([make_workload("a")], resource_version="100"),
+            make_list([make_workload("b")], resource_version="200"),
+        ])
+        informer = WorkloadInformer("Deployment", list_fn, check_fn)
+        watches = iter([
+            FakeWatch(error=ApiException(status=410, reason="Gone")),
+            FakeWatch(on_done=informer._stop.set),
+        ])
+        informer._watch_factory = lambda: next(watches)
+
+        informer._run()
+
+        assert list_fn.call_count == 2
+        assert informer.issues() == ["issue:b"]
+        assert informer._resource_version == "200"
+
+    def test_watch_events_update_resource_version(self, check_fn):
+        """Test watch resumes from the last seen resourceVersion."""
+        informer = WorkloadInformer("Deployment", Mock(), check_fn)
+        informer._resource_version = "100"
+        workload = make_workload("a")
+        workload.metadata.resource_version = "101"
+        informer._watch_factory = lambda: FakeWatch(events=[
+            {"type": "ADDED", "object": workload},
+        ])
+
+        informer._watch_once()
+
+        assert informer.issues() == ["issue:a"]
+        assert informer._resource_version == "101"
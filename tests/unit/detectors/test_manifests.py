@@ -0,0 +1,263 @@
+"""Unit tests for offline manifest scanning."""
+
+import os
+
+import pytest
+
+from src.detectors.base.detector import IncompleteDetection
+from src.detectors.k8s import manifests
+from src.detectors.k8s.manifests import ManifestDetector, parse_manifest
+from src.utils.config import Config, ManifestsConfig
+
+DEPLOYMENT = """\
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: web
+  namespace: shop
+  annotations:
+    team: payments
+spec:
+  template:
+    spec:
+      containers:
+        - name: app
+          image: nginx
+"""
+
+STATEFULSET_AND_SERVICE = """\
+apiVersion: v1
+kind: Service
+metadata:
+  name: db
+---
+apiVersion: apps/v1
+kind: StatefulSet
+metadata:
+  name: db
+spec:
+  template:
+    spec:
+      containers:
+        - name: postgres
+          resources:
+            requests: {cpu: 100m, memory: 128Mi}
+            limits: {cpu: 200m, memory: 256Mi}
+"""
+
+LIST = """\
+apiVersion: v1
+kind: List
+items:
+  - apiVersion: apps/v1
+    kind: DaemonSet
+    metadata: {name: agent, namespace: monitoring}
+    spec:
+      template:
+        spec:
+          containers: [{name: agent}]
+"""
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+class TestParseManifest:
+    """Test suite for parse_manifest."""
+
+    def test_keeps_workloads_only(self, tmp_path):
+        path = write(tmp_path / "db.yaml", STATEFULSET_AND_SERVICE)
+
+        digest, workloads, error = parse_manifest(str(path))
+
+        assert error is None
+        assert digest
+        assert [w["kind"] for w in workloads] == ["StatefulSet"]
+        assert workloads[0]["spec"]["template"]["spec"]["containers"][0]["resources"]["limits"] == {
+            "cpu": "200m", "memory": "256Mi"
+        }
+
+    def test_slims_documents(self, tmp_path):
+        path = write(tmp_path / "web.yaml", DEPLOYMENT)
+
+        _, workloads, _ = parse_manifest(str(path))
+
+        assert workloads[0]["metadata"] == {"name": "web", "namespace": "shop", "labels": None}
+        assert workloads[0]["spec"]["template"]["spec"]["containers"] == [
+            {"name": "app", "resources": None}
+        ]
+
+    def test_expands_lists(self, tmp_path):
+        path = write(tmp_path / "list.yaml", LIST)
+
+        _, workloads, _ = parse_manifest(str(path))
+
+        assert [w["metadata"]["name"] for w in workloads] == ["agent"]
+
+    def test_unchanged_digest_skips_parsing(self, tmp_path):
+        path = write(tmp_path / "web.yaml", DEPLOYMENT)
+        digest, _, _ = parse_manifest(str(path))
+
+        assert parse_manifest(str(path), known_digest=digest) == (digest, None, None)
+
+    def test_invalid_yaml(self, tmp_path):
+        path = write(tmp_path / "bad.yaml", "kind: [unclosed\n")
+
+        _, workloads, error = parse_manifest(str(path))
+
+        assert workloads == []
+        assert error
+
+
+class TestManifestDetector:
+    """Test suite for ManifestDetector."""
+
+    @pytest.fixture
+    def tree(self, tmp_path):
+        root = tmp_path / "repo"
+        write(root / "apps" / "web.yaml", DEPLOYMENT)
+        write(root / "apps" / "db.yml", STATEFULSET_AND_SERVICE)
+        write(root / "system" / "list.yaml", LIST)
+        write(root / "README.md", "not a manifest")
+        write(root / ".git" / "ignored.yaml", DEPLOYMENT)
+        return root
+
+    @pytest.fixture
+    def config(self, tmp_path, tree):
+        return Config(manifests=ManifestsConfig(
+            enabled=True,
+            paths=[str(tree)],
+            cache_path=str(tmp_path / "cache" / "manifests.json"),
+        ))
+
+    @pytest.mark.asyncio
+    async def test_detect(self, config, tree):
+        detector = ManifestDetector(config)
+
+        issues = await detector.detect()
+
+        by_name = {(i.resource_type, i.resource_name) for i in issues}
+        assert ("Deployment", "web") in by_name
+        assert ("DaemonSet", "agent") in by_name
+        web = next(i for i in issues if i.resource_name == "web")
+        assert web.cluster == "manifests"
+        assert web.namespace == "shop"
+        assert web.metadata["manifest"] == os.path.normpath(str(tree / "apps" / "web.yaml"))
+        assert detector.stats == {
+            "files": 3, "unchanged": 0, "rehashed": 0, "parsed": 3, "errors": 0
+        }
+
+    @pytest.mark.asyncio
+    async def test_invalid_quantity_skips_only_that_document(self, config, tree):
+        bad = DEPLOYMENT.replace("name: web", "name: bad").replace(
+            "image: nginx", "resources: {requests: {memory: 1GB}}"
+        )
+        path = write(tree / "apps" / "bad.yaml", bad)
+        detector = ManifestDetector(config)
+
+        with pytest.raises(IncompleteDetection) as excinfo:
+            await detector.detect()
+
+        assert {i.resource_name for i in excinfo.value.issues} == {"web", "agent"}
+        assert detector.stats["errors"] == 1
+        assert list(detector.errors) == [os.path.normpath(str(path))]
+
+    @pytest.mark.asyncio
+    async def test_parse_errors_are_reported_on_every_run(self, config, tree):
+        path = write(tree / "apps" / "bad.yaml", "kind: [unclosed\n")
+        key = os.path.normpath(str(path))
+        with pytest.raises(IncompleteDetection):
+            await ManifestDetector(config).detect()
+
+        # Unchanged, then touched but identical: both served from the cache
+        for _ in range(2):
+            detector = ManifestDetector(config)
+            with pytest.raises(IncompleteDetection) as excinfo:
+                await detector.detect()
+
+            assert detector.stats["parsed"] == 0
+            assert detector.stats["errors"] == 1
+            assert list(detector.errors) == [key]
+            assert {i.resource_name for i in excinfo.value.issues} >= {"web", "agent"}
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert detector.stats["rehashed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_same_object_in_two_files(self, config, tree):
+        write(tree / "overlays" / "web.yaml", DEPLOYMENT)
+
+        issues = await ManifestDetector(config).detect()
+
+        web = [i for i in issues if i.resource_name == "web"]
+        assert len({i.metadata["manifest"] for i in web}) == 2
+        assert len({i.fingerprint for i in web}) == len(web) == 2
+        assert all(i.id == i.fingerprint for i in web)
+
+    @pytest.mark.asyncio
+    async def test_default_namespace(self, config):
+        issues = await ManifestDetector(config).detect()
+
+        assert {i.namespace for i in issues if i.resource_name == "db"} <= {"default"}
+
+    def test_cache_skips_unchanged_files(self, config, tree, mocker):
+        ManifestDetector(config).load_workloads()
+        parse = mocker.spy(manifests, "parse_manifest")
+
+        detector = ManifestDetector(config)
+        workloads = detector.load_workloads()
+
+        parse.assert_not_called()
+        assert detector.stats["unchanged"] == 3
+        assert len(workloads) == 3
+
+    def test_touched_file_is_rehashed_not_reparsed(self, config, tree):
+        ManifestDetector(config).load_workloads()
+        path = tree / "apps" / "web.yaml"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        detector = ManifestDetector(config)
+        detector.load_workloads()
+
+        assert detector.stats["rehashed"] == 1
+        assert detector.stats["parsed"] == 0
+
+    def test_changed_and_deleted_files(self, config, tree):
+        ManifestDetector(config).load_workloads()
+        write(tree / "apps" / "web.yaml", DEPLOYMENT.replace("name: web", "name: shop-web"))
+        (tree / "system" / "list.yaml").unlink()
+
+        detector = ManifestDetector(config)
+        workloads = dict(detector.load_workloads())
+
+        assert detector.stats["parsed"] == 1
+        assert len(workloads) == 2
+        web = workloads[os.path.normpath(str(tree / "apps" / "web.yaml"))]
+        assert web[0]["metadata"]["name"] == "shop-web"
+
+    def test_corrupt_cache_is_ignored(self, config):
+        os.makedirs(os.path.dirname(config.manifests.cache_path))
+        with open(config.manifests.cache_path, "w") as f:
+            f.write("{not json")
+
+        detector = ManifestDetector(config)
+        detector.load_workloads()
+
+        assert detector.stats["parsed"] == 3
+
+    def test_process_pool(self, config, tree, mocker):
+        for i in range(manifests.POOL_THRESHOLD):
+            manifest = DEPLOYMENT.replace("name: web", f"name: app-{i}")
+            write(tree / "many" / f"app-{i}.yaml", manifest)
+        config.manifests.workers = 2
+        config.manifests.cache_path = None
+
+        detector = ManifestDetector(config)
+        workloads = detector.load_workloads()
+
+        assert detector.stats["parsed"] == manifests.POOL_THRESHOLD + 3
+        assert sum(len(documents) for _, documents in workloads) == manifests.POOL_THRESHOLD + 3
@@ -1,5 +1,10 @@
 """Unit tests for PodResourceDetector."""
 
+import asyncio
+import json
+import socket
+import time
+
 import pytest
 from unittest.mock import Mock, AsyncMock, MagicMock
 from typing import Dict, Any
@@ -18,6 +23,15 @@ class TestPodResourceDetector:
         config.k8s = Mock()
         config.k8s.in_cluster = False
         config.k8s.contexts = [{"name": "test-context", "enabled": True}]
+        config.k8s.page_size = 500
+        config.k8s.watch = False
+        config.k8s.lean_listing = False
+        config.k8s.cluster_name = None
+        config.k8s.connect_timeout = 10.0
+        config.k8s.read_timeout = 120.0
+        config.k8s.template_cache_size = 1000
+        config.k8s.fleet_analysis = False
+        config.metrics_source.enabled = False
         return config
 
     @pytest.fixture
@@ -29,6 +43,57 @@ class TestPodResourceDetector:
         """Test platform property returns K8S."""
         assert detector.platform == Platform.K8S
 
+    def test_cluster_name_from_context(self, mock_config):
+        """Test issues are tagged with the context's cluster name."""
+        detector = PodResourceDetector(mock_config, context={"name": "prod-eu"})
+        container = Mock()
+        container.name = "app"
+        container.resources = None
+
+        issue = detector._check_missing_resources(
+            "web", "default", "Deployment", container, {}
+        )
+
+        assert detector.cluster == "prod-eu"
+        assert detector.name == "PodResourceDetector[prod-eu]"
+        assert issue.cluster == "prod-eu"
+        assert issue.to_dict()["cluster"] == "prod-eu"
+
+    def test_cluster_name_defaults(self, mock_config):
+        """Test cluster names for in-cluster and default kubeconfig access."""
+        assert PodResourceDetector(mock_config).cluster == "default"
+        mock_config.k8s.in_cluster = True
+        assert PodResourceDetector(mock_config).cluster == "in-cluster"
+        mock_config.k8s.cluster_name = "hub"
+        assert PodResourceDetector(mock_config).cluster == "hub"
+
+    def test_initialize_client_per_context(self, mock_config, mocker):
+        """Test each context gets its own ApiClient instead of the global default."""
+        mock_config.k8s.kubeconfig = None
+        mock_config.k8s.connection_pool_maxsize = 16
+        mock_config.k8s.tcp_keepalive = True
+        mock_config.k8s.tcp_keepalive_idle = 30
+        mock_config.k8s.gzip = True
+        load = mocker.patch("kubernetes.config.load_kube_config")
+
+        first = PodResourceDetector(mock_config, context={"name": "a"})
+        second = PodResourceDetector(mock_config, context={"name": "b"})
+        first._initialize_k8s_client()
+        second._initialize_k8s_client()
+
+        contexts = [call.kwargs["context"] for call in load.call_args_list]
+        assert contexts == ["a", "b"]
+        assert first._api_client is not second._api_client
+        assert first._k8s_client.api_client is first._api_client
+        assert first._api_client.configuration.connection_pool_maxsize == 16
+        assert first._api_client.default_headers["Accept-Encoding"] == "gzip"
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in (
+            first._api_client.configuration.socket_options
+        )
+        assert first.connection_stats() == {
+            "pools": 0, "connections": 0, "requests": 0, "reused": 0
+        }
+
     def test_resource_type_property(self, detector):
         """Test resource_type property returns Pod."""
         assert detector.resource_type == "Pod"
@@ -235,27 +300,34 @@ class TestPodResourceDetector:
 
         assert issue is None
 
+    def _make_workload(self, name="web", namespace="default", generation=1, uid=None):
+        """Create a workload whose single container has no resources."""
+        workload = Mock()
+        workload.metadata.name = name
+        workload.metadata.namespace = namespace
+        workload.metadata.uid = uid or f"uid-{namespace}-{name}"
+        workload.metadata.labels = {"app": name}
+        workload.metadata.generation = generation
+        container = Mock()
+        container.name = "app"
+        container.resources = None
+        workload.spec.template.spec.containers = [container]
+        return workload
+
+    def _make_page(self, workloads, continue_token=None):
+        """Create one list response page."""
+        page = Mock()
+        page.items = list(workloads)
+        page.metadata._continue = continue_token
+        return page
+
     @pytest.mark.asyncio
     async def test_check_deployments_with_issues(self, detector, mocker):
         """Test checking deployments with resource issues."""
-        # Mock Kubernetes client
-        mock_deployment = Mock()
-        mock_deployment.metadata.name = "test-deployment"
-        mock_deployment.metadata.namespace = "default"
-        mock_deployment.metadata.labels = {"app": "test"}
-
-        # Mock pod spec with missing resources
-        mock_container = Mock()
-        mock_container.name = "app"
-        mock_container.resources = None
-
-        mock_deployment.spec.template.spec.containers = [mock_container]
-
-        mock_list_result = Mock()
-        mock_list_result.items = [mock_deployment]
-
         detector._k8s_client = Mock()
-        detector._k8s_client.list_deployment_for_all_namespaces.return_value = mock_list_result
+        detector._k8s_client.list_deployment_for_all_namespaces.return_value = self._make_page(
+            [self._make_workload("test-deployment")]
+        )
 
         issues = await detector._check_deployments()
 
@@ -266,20 +338,280 @@ class TestPodResourceDetector:
     @pytest.mark.asyncio
     async def test_check_deployments_skip_system_namespace(self, detector):
         """Test skipping system namespace deployments."""
-        mock_deployment = Mock()
-        mock_deployment.metadata.name = "coredns"
-        mock_deployment.metadata.namespace = "kube-system"
-        mock_deployment.metadata.labels = {}
+        detector._k8s_client = Mock()
+        detector._k8s_client.list_deployment_for_all_namespaces.return_value = self._make_page(
+            [self._make_workload("coredns", namespace="kube-system")]
+        )
 
-        mock_list_result = Mock()
-        mock_list_result.items = [mock_deployment]
+        issues = await detector._check_deployments()
 
+        assert len(issues) == 0  # Should skip kube-system
+
+    @pytest.mark.asyncio
+    async def test_check_deployments_paginates(self, detector):
+        """Test listing follows continue tokens and yields issues per page."""
+        detector.config.k8s.page_size = 2
         detector._k8s_client = Mock()
-        detector._k8s_client.list_deployment_for_all_namespaces.return_value = mock_list_result
+        detector._k8s_client.list_deployment_for_all_namespaces.side_effect = [
+            self._make_page([self._make_workload("a"), self._make_workload("b")], "token-1"),
+            self._make_page([self._make_workload("c")]),
+        ]
+
+        pages = [
+            [issue.resource_name for issue in page_issues]
+            async for page_issues in detector._iter_workload_issues("Deployment")
+        ]
+
+        assert pages == [["a", "b"], ["c"]]
+        calls = detector._k8s_client.list_deployment_for_all_namespaces.call_args_list
+        selector = detector.NAMESPACE_FIELD_SELECTOR
+        assert calls[0].kwargs == {
+            "limit": 2, "field_selector": selector, "_request_timeout": (10.0, 120.0)
+        }
+        assert calls[1].kwargs["_continue"] == "token-1"
+
+    @pytest.mark.asyncio
+    async def test_expired_continue_token_relists(self, detector):
+        """Test a 410 restarts the listing and skips workloads already yielded."""
+        from kubernetes.client.rest import ApiException
+
+        detector._k8s_client = Mock()
+        detector._k8s_client.list_deployment_for_all_namespaces.side_effect = [
+            self._make_page([self._make_workload("a"), self._make_workload("b")], "token-1"),
+            ApiException(status=410, reason="Gone"),
+            self._make_page([self._make_workload("a"), self._make_workload("b")], "token-2"),
+            self._make_page([self._make_workload("c")]),
+        ]
+
+        pages = [
+            [issue.resource_name for issue in page_issues]
+            async for page_issues in detector._iter_workload_issues("Deployment")
+        ]
+
+        assert pages == [["a", "b"], [], ["c"]]
+        calls = detector._k8s_client.list_deployment_for_all_namespaces.call_args_list
+        assert [call.kwargs.get("_continue") for call in calls] == [
+            None, "token-1", None, "token-2"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_list_error_mid_listing_is_raised(self, detector):
+        """Test an API error on a later page fails the listing instead of truncating it."""
+        from kubernetes.client.rest import ApiException
+
+        detector._k8s_client = Mock()
+        detector._k8s_client.list_deployment_for_all_namespaces.side_effect = [
+            self._make_page([self._make_workload("a")], "token-1"),
+            ApiException(status=500, reason="Internal Server Error"),
+        ]
+
+        with pytest.raises(ApiException):
+            await detector._check_deployments()
+
+    @pytest.mark.asyncio
+    async def test_detect_stream_yields_per_page(self, detector, mocker):
+        """Test streaming detection yields each non-empty page across kinds."""
+        mocker.patch.object(detector, "_initialize_k8s_client")
+        client = detector._k8s_client = Mock()
+        client.list_deployment_for_all_namespaces.return_value = self._make_page(
+            [self._make_workload("web")]
+        )
+        client.list_stateful_set_for_all_namespaces.return_value = self._make_page([])
+        client.list_daemon_set_for_all_namespaces.return_value = self._make_page(
+            [self._make_workload("agent")]
+        )
+
+        batches = [batch async for batch in detector.detect_stream()]
+
+        names = [{issue.resource_name for issue in batch} for batch in batches]
+        assert names == [{"web"}, {"agent"}]
+
+    @pytest.mark.asyncio
+    async def test_fleet_analysis_flags_outlier_requests(self, mock_config, mocker):
+        """Test fleet analysis compares each listed container with its namespace."""
+        pytest.importorskip("numpy")
+        mock_config.k8s.fleet_analysis = True
+        detector = PodResourceDetector(mock_config)
+        mocker.patch.object(detector, "_initialize_k8s_client")
+        workloads = [self._make_workload(f"web-{i}", namespace="shop") for i in range(6)]
+        workloads.append(self._make_workload("hog", namespace="shop"))
+        for workload in workloads:
+            cpu = "8" if workload.metadata.name == "hog" else "250m"
+            container = workload.spec.template.spec.containers[0]
+            container.resources = Mock(requests={"cpu": cpu, "memory": "1Gi"}, limits=None)
+        client = detector._k8s_client = Mock()
+        client.list_deployment_for_all_namespaces.return_value = self._make_page(workloads)
+        client.list_stateful_set_for_all_namespaces.return_value = self._make_page([])
+        client.list_daemon_set_for_all_namespaces.return_value = self._make_page(
+            [self._make_workload("coredns", namespace="kube-system")]
+        )
+        detector.connection_stats = Mock(return_value={"connections": 1, "requests": 3})
+
+        issues = await detector.detect()
+        batches = [batch async for batch in detector.detect_stream()]
+
+        outliers = [i for i in issues if i.check == "fleet_outlier_cpu_request"]
+        assert [(i.resource_name, i.cluster) for i in outliers] == [("hog", "default")]
+        assert [i.check for i in batches[-1]] == ["fleet_outlier_cpu_request"]
+
+    @pytest.mark.asyncio
+    async def test_checks_only_owned_namespaces(self, detector):
+        """Test a sharded detector skips namespaces owned by other replicas."""
+        detector._k8s_client = Mock()
+        detector._k8s_client.list_deployment_for_all_namespaces.return_value = self._make_page(
+            [self._make_workload(namespace="team-a"), self._make_workload(namespace="team-b")]
+        )
+        detector.shard = Mock()
+        detector.shard.owns.side_effect = lambda key: key == f"{detector.cluster}/team-a"
 
         issues = await detector._check_deployments()
 
-        assert len(issues) == 0  # Should skip kube-system
+        assert {issue.namespace for issue in issues} == {"team-a"}
+
+    @pytest.mark.asyncio
+    async def test_sharded_replica_lists_only_owned_namespaces(self, detector, mocker):
+        """Test replicas sharing a cluster list their own namespaces, not the whole cluster."""
+        mocker.patch.object(detector, "_initialize_k8s_client")
+        namespaces = [Mock() for _ in range(3)]
+        for namespace, name in zip(namespaces, ("team-a", "team-b", "kube-system")):
+            namespace.metadata.name = name
+        detector._core_v1_client = Mock()
+        detector._core_v1_client.list_namespace.return_value = self._make_page(namespaces)
+        client = detector._k8s_client = Mock()
+        for lister in detector.NAMESPACED_LISTERS.values():
+            getattr(client, lister).side_effect = lambda namespace, **kwargs: self._make_page(
+                [self._make_workload(namespace=namespace)]
+            )
+        detector.shard = Mock(members={"replica-0", "replica-1"})
+        detector.shard.owns.side_effect = lambda key: key == f"{detector.cluster}/team-a"
+
+        issues = await detector.detect()
+
+        assert {issue.namespace for issue in issues} == {"team-a"}
+        assert [call.args for call in client.list_namespaced_deployment.call_args_list] == [
+            ("team-a",)
+        ]
+        assert "field_selector" not in client.list_namespaced_deployment.call_args.kwargs
+        client.list_deployment_for_all_namespaces.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_check_deployments_lean_listing(self, detector):
+        """Test lean listing parses raw JSON pages without client models."""
+        response = Mock()
+        response.data = json.dumps({
+            "metadata": {"resourceVersion": "10"},
+            "items": [{
+                "metadata": {
+                    "name": "web",
+                    "namespace": "default",
+                    "generation": 3,
+                    "labels": {"app": "web"},
+                    "managedFields": [{"manager": "kubectl"}],
+                },
+                "spec": {"template": {"spec": {"containers": [{
+                    "name": "app",
+                    "image": "nginx",
+                    "resources": {"requests": {"cpu": "4", "memory": "1Gi"}},
+                }]}}},
+                "status": {"replicas": 1},
+            }],
+        }).encode()
+
+        detector.config.k8s.lean_listing = True
+        detector._k8s_client = Mock()
+        detector._k8s_client.list_deployment_for_all_namespaces.return_value = response
+
+        issues = await detector._check_deployments()
+
+        call = detector._k8s_client.list_deployment_for_all_namespaces.call_args
+        assert call.kwargs["_preload_content"] is False
+        assert call.kwargs["field_selector"] == detector.NAMESPACE_FIELD_SELECTOR
+        response.release_conn.assert_called_once()
+        assert sorted(issue.title for issue in issues) == [
+            "Missing resource limits", "Over-provisioned resources"
+        ]
+        assert issues[0].tags == {"app": "web"}
+
+    def test_check_workload_memoizes_unchanged_template(self, detector, mocker):
+        """Test an unchanged generation reuses the cached issues."""
+        check = mocker.spy(detector, "_check_pod_template")
+
+        first = detector._check_workload("Deployment", self._make_workload())
+        second = detector._check_workload("Deployment", self._make_workload())
+
+        assert check.call_count == 1
+        assert [i.id for i in first] == [i.id for i in second]
+        assert detector._template_cache.stats()["hits"] == 1
+
+    def test_check_workload_rechecks_new_generation(self, detector, mocker):
+        """Test a new generation misses the memo and is re-checked."""
+        check = mocker.spy(detector, "_check_pod_template")
+
+        detector._check_workload("Deployment", self._make_workload(generation=1))
+        detector._check_workload("Deployment", self._make_workload(generation=2))
+
+        assert check.call_count == 2
+        assert detector._template_cache.stats()["misses"] == 2
+
+    def test_check_workload_rechecks_recreated_object(self, detector):
+        """Test an object recreated under the same name does not get the old issues."""
+        detector._check_workload("Deployment", self._make_workload(uid="old"))
+        recreated = self._make_workload(uid="new")
+        container = recreated.spec.template.spec.containers[0]
+        container.resources = Mock(
+            requests={"cpu": "100m", "memory": "128Mi"},
+            limits={"cpu": "200m", "memory": "256Mi"},
+        )
+
+        assert detector._check_workload("Deployment", recreated) == []
+
+    def test_check_workload_hashes_template_without_generation(self, detector, mocker):
+        """Test objects without a generation are keyed by template content."""
+        check = mocker.spy(detector, "_check_pod_template")
+
+        def workload(memory):
+            w = self._make_workload(generation=None)
+            container = w.spec.template.spec.containers[0]
+            container.resources = Mock()
+            container.resources.requests = {"cpu": "100m", "memory": memory}
+            container.resources.limits = None
+            return w
+
+        detector._check_workload("Deployment", workload("128Mi"))
+        detector._check_workload("Deployment", workload("128Mi"))
+        detector._check_workload("Deployment", workload("256Mi"))
+
+        assert check.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_detect_does_not_block_event_loop(self, detector):
+        """Test blocking list calls run off the event loop and in parallel."""
+        def slow_list(**kwargs):
+            time.sleep(0.1)
+            return self._make_page([])
+
+        detector._k8s_client = Mock()
+        detector._k8s_client.list_deployment_for_all_namespaces.side_effect = slow_list
+        detector._k8s_client.list_stateful_set_for_all_namespaces.side_effect = slow_list
+        detector._k8s_client.list_daemon_set_for_all_namespaces.side_effect = slow_list
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        started = time.monotonic()
+        issues = await detector.detect()
+        elapsed = time.monotonic() - started
+        ticker_task.cancel()
+
+        assert issues == []
+        assert ticks >= 5  # Loop kept running while the lists were in flight
+        assert elapsed < 0.25  # Three 100ms lists overlapped
 
     def test_resource_to_dict(self, detector):
         """Test converting resources to dictionary."""
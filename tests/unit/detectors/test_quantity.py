@@ -0,0 +1,46 @@
+"""Unit tests for Kubernetes quantity parsing."""
+
+import pytest
+
+from src.detectors.k8s.quantity import parse_bytes, parse_cpu_cores, parse_quantity_milli
+
+
+class TestParseQuantity:
+    """Test suite for parse_quantity_milli."""
+
+    @pytest.mark.parametrize("quantity, expected", [
+        ("100m", 100),
+        ("1", 1000),
+        ("2.5", 2500),
+        (".5", 500),
+        ("0.1", 100),
+        ("250u", 1),  # Rounded up to the next milli-unit
+        ("500n", 1),
+        ("1k", 1000 * 1000),
+        ("1K", 1000 * 1000),
+        ("1M", 10 ** 6 * 1000),
+        ("1E", 10 ** 18 * 1000),
+        ("1Ki", 1024 * 1000),
+        ("1.5Gi", 3 * 2 ** 29 * 1000),
+        ("1Pi", 2 ** 50 * 1000),
+        ("1Ei", 2 ** 60 * 1000),
+        ("1e3", 10 ** 6),
+        ("12E-3", 12),
+        (" 64Mi ", 64 * 2 ** 20 * 1000),
+        (2, 2000),
+    ])
+    def test_valid_quantities(self, quantity, expected):
+        assert parse_quantity_milli(quantity) == expected
+
+    @pytest.mark.parametrize("quantity", ["", "abc", "1Xi", "1e", "Mi", "1.2.3"])
+    def test_invalid_quantities(self, quantity):
+        with pytest.raises(ValueError):
+            parse_quantity_milli(quantity)
+
+    def test_parse_cpu_cores(self):
+        assert parse_cpu_cores("100m") == 0.1
+        assert parse_cpu_cores("1500m") == 1.5
+
+    def test_parse_bytes_rounds_up(self):
+        assert parse_bytes("128Mi") == 128 * 2 ** 20
+        assert parse_bytes("1500m") == 2
@@ -0,0 +1,139 @@
+"""Unit tests for rule conditions and the compiled RulePlan."""
+
+import itertools
+
+import pytest
+
+from src.detectors.base.detector import Severity
+from src.detectors.k8s.lean import Container
+from src.rules.base import (
+    AllOf,
+    AnyOf,
+    Compare,
+    Condition,
+    ContainerFacts,
+    Missing,
+    Ratio,
+    Rule,
+    Target,
+)
+from src.rules.builtin import DEFAULT_RULES, MISSING_RESOURCES, OVER_PROVISIONED
+from src.rules.engine import RulePlan
+
+TARGET = Target("web", "shop", "Deployment", "prod", {"app": "web"})
+
+RESOURCES = [None, {}, {"cpu": "3"}, {"memory": "8Gi"}, {"cpu": "100m", "memory": "128Mi"}]
+
+
+def container(requests=None, limits=None, resources=True):
+    data = {"name": "app"}
+    if resources:
+        data["resources"] = {"requests": requests, "limits": limits}
+    return Container(data)
+
+
+def rule(check, when):
+    return Rule(check=check, severity=Severity.LOW, when=when, title=check, description="")
+
+
+class TestContainerFacts:
+    """Test suite for ContainerFacts."""
+
+    def test_parses_quantities_once(self):
+        facts = ContainerFacts(container({"cpu": "500m", "memory": "1Gi"}, {"cpu": "2"}))
+
+        assert facts.cpu_request == 0.5
+        assert facts.memory_request == 1024 ** 3
+        assert facts.cpu_limit == 2.0
+        assert facts.memory_limit == 0
+
+    def test_malformed_quantity_raises_only_when_read(self):
+        facts = ContainerFacts(container({"cpu": "3", "memory": "8Gi"}, {"memory": "1GB"}))
+
+        assert OVER_PROVISIONED.apply(facts, TARGET) is not None
+        with pytest.raises(ValueError):
+            facts.memory_limit
+
+    def test_empty_sections_count_as_missing(self):
+        facts = ContainerFacts(container({}, None))
+
+        assert facts.requests is None and facts.limits is None
+        assert facts.missing == "requests/limits"
+
+
+class TestConditions:
+    """Test suite for condition validation and evaluation."""
+
+    def test_condition_is_abstract(self):
+        with pytest.raises(TypeError):
+            Condition()
+
+    def test_unknown_fact(self):
+        with pytest.raises(ValueError, match="Unknown fact"):
+            Compare("gpu_request", ">", 1)
+
+    def test_unknown_operator(self):
+        with pytest.raises(ValueError, match="Unknown operator"):
+            Compare("cpu_request", "=>", 1)
+
+    def test_ratio_ignores_zero_denominator(self):
+        condition = Ratio("cpu_limit", "cpu_request", ">", 2)
+
+        assert not condition.evaluate(ContainerFacts(container(None, {"cpu": "4"})))
+        assert condition.evaluate(ContainerFacts(container({"cpu": "1"}, {"cpu": "4"})))
+
+
+class TestRulePlan:
+    """Test suite for RulePlan."""
+
+    def test_matches_per_rule_evaluation(self):
+        rules = [
+            *DEFAULT_RULES,
+            rule("limit_ratio", Ratio("memory_limit", "memory_request", ">=", 4)),
+            rule("big_and_unbounded", AllOf(Compare("cpu_request", ">", 2), Missing("limits"))),
+            rule("any", AnyOf(Missing("requests"), Compare("cpu_limit", "<", 0.2))),
+        ]
+        plan = RulePlan(rules)
+
+        for requests, limits in itertools.product(RESOURCES, RESOURCES):
+            facts = ContainerFacts(container(requests, limits))
+            expected = [r for r in rules if r.when.evaluate(facts)]
+            assert plan.evaluate(facts) == expected, (requests, limits)
+
+    def test_shares_conditions(self):
+        plan = RulePlan([
+            rule("a", Compare("cpu_request", ">", 2)),
+            rule("b", AllOf(Compare("cpu_request", ">", 2), Missing("limits"))),
+        ])
+
+        assert plan.source.count("f.cpu_request >") == 1
+
+    def test_duplicate_checks(self):
+        with pytest.raises(ValueError, match="Duplicate rule checks: a"):
+            RulePlan([rule("a", Missing("limits")), rule("a", Missing("requests"))])
+
+    def test_check_container_builds_issues(self):
+        plan = RulePlan(DEFAULT_RULES)
+
+        issues = plan.check_container(container({"cpu": "3", "memory": "1Gi"}, None), TARGET)
+
+        assert [issue.check for issue in issues] == ["missing_resources", "over_provisioned"]
+        missing, over = issues
+        assert missing.title == "Missing resource limits"
+        assert missing.metadata == {
+            "container": "app", "missing_requests": False, "missing_limits": True
+        }
+        assert over.recommended_value["requests"] == {"cpu": "1500m", "memory": "512Mi"}
+        assert over.description.startswith("Container 'app' in Deployment 'web'")
+        assert (over.cluster, over.namespace, over.tags) == ("prod", "shop", {"app": "web"})
+
+    def test_no_resources(self):
+        issues = RulePlan(DEFAULT_RULES).check_container(container(resources=False), TARGET)
+
+        assert [issue.title for issue in issues] == ["Missing resource requests/limits"]
+
+    def test_rule_apply(self):
+        facts = ContainerFacts(container({"cpu": "100m"}, {"cpu": "200m"}))
+
+        assert MISSING_RESOURCES.apply(facts, TARGET) is None
+        assert OVER_PROVISIONED.apply(facts, TARGET) is None
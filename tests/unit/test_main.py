@@ -0,0 +1,142 @@
+"""Unit tests for the command-line entry point."""
+
+import json
+import subprocess
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+from src import main
+from src.detectors.base.detector import Issue, Platform, Severity
+
+
+def make_issue(severity: Severity) -> Issue:
+    return Issue(
+        platform=Platform.K8S,
+        resource_type="Deployment",
+        resource_name=f"web-{severity.value}",
+        severity=severity,
+        title="t",
+        description="d",
+    )
+
+
+class TestScan:
+    """Test suite for the one-shot scan command."""
+
+    @pytest.mark.parametrize("severities, fail_on, expected", [
+        ([], "low", 0),
+        ([Severity.LOW, Severity.HIGH], "low", 5),
+        ([Severity.CRITICAL], "low", 6),
+        ([Severity.MEDIUM], "high", 0),
+        ([Severity.MEDIUM, Severity.HIGH], "high", 5),
+    ])
+    def test_exit_code(self, severities, fail_on, expected):
+        issues = [make_issue(severity) for severity in severities]
+
+        assert main.scan_exit_code(issues, fail_on) == expected
+
+    def test_exit_code_incomplete_scan(self):
+        assert main.scan_exit_code([make_issue(Severity.CRITICAL)], complete=False) == 1
+
+    @pytest.mark.asyncio
+    async def test_scan_once_writes_issues(self, tmp_path, mocker):
+        async def run_detection():
+            return [make_issue(Severity.MEDIUM)]
+
+        engine = Mock(run_detection=run_detection, last_outcome={"k8s": "ok"})
+        factory = mocker.patch("src.core.detection_engine.DetectionEngine", return_value=engine)
+        mocker.patch.object(main, "load_config")
+        mocker.patch.object(main, "setup_logging")
+        output = tmp_path / "issues.json"
+
+        code = await main.scan("config.yaml", output=str(output))
+
+        assert code == 4
+        assert json.loads(output.read_bytes())[0]["resource_name"] == "web-medium"
+        assert factory.call_args.kwargs == {"full_concurrency": True}
+        engine.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kubeconfig", [
+        None,  # kubeconfig file does not exist
+        "apiVersion: v1\nkind: Config\ncurrent-context: prod\n"
+        "clusters: [{name: prod, cluster: {server: 'http://127.0.0.1:1'}}]\n"
+        "contexts: [{name: prod, context: {cluster: prod, user: prod}}]\n"
+        "users: [{name: prod, user: {token: t}}]\n",
+    ])
+    async def test_scan_unreachable_cluster_fails(self, tmp_path, mocker, kubeconfig):
+        """Test a scan that could not reach its cluster exits with EXIT_ERROR."""
+        kubeconfig_path = tmp_path / "kubeconfig"
+        if kubeconfig:
+            kubeconfig_path.write_text(kubeconfig)
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(json.dumps({
+            "k8s": {
+                "in_cluster": False,
+                "kubeconfig": str(kubeconfig_path),
+                "contexts": [{"name": "prod"}],
+                "read_timeout": 1.0,
+            },
+            "aws": {"enabled": False},
+        }))
+        mocker.patch.object(main, "setup_logging")
+        output = tmp_path / "issues.json"
+
+        code = await main.scan(str(config_path), output=str(output))
+
+        assert code == main.EXIT_ERROR
+        assert json.loads(output.read_bytes()) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("broken", [
+        "kind: [unclosed\n",
+        "kind: Deployment\nmetadata: {name: bad}\nspec:\n  template:\n    spec:\n"
+        "      containers: [{name: app, resources: {requests: {memory: 1GB}}}]\n",
+    ], ids=["invalid-yaml", "invalid-quantity"])
+    async def test_scan_unreadable_manifest_fails(self, tmp_path, mocker, broken):
+        """Test a manifest scan that could not check every file exits with EXIT_ERROR."""
+        manifests = tmp_path / "deploy"
+        manifests.mkdir()
+        (manifests / "web.yaml").write_text(
+            "kind: Deployment\nmetadata: {name: web}\n"
+            "spec: {template: {spec: {containers: [{name: app}]}}}\n"
+        )
+        (manifests / "broken.yaml").write_text(broken)
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(json.dumps({
+            "manifests": {"cache_path": str(tmp_path / "cache.json")},
+        }))
+        mocker.patch.object(main, "setup_logging")
+        output = tmp_path / "issues.json"
+
+        code = await main.scan(str(config_path), output=str(output), manifests=[str(manifests)])
+
+        assert code == main.EXIT_ERROR
+        # The manifests that could be checked are still reported
+        assert {issue["resource_name"] for issue in json.loads(output.read_bytes())} == {"web"}
+
+    def test_scan_manifests_only(self):
+        """Test --manifests replaces live clusters and clouds with local files."""
+        from src.utils.config import Config
+
+        config = Config(k8s={"in_cluster": True, "contexts": [{"name": "prod"}]})
+
+        main._scan_manifests_only(config, ["deploy/"])
+
+        assert not config.k8s.in_cluster and config.k8s.contexts == []
+        assert not config.aws.enabled and not config.azure.enabled
+        assert config.manifests.enabled and config.manifests.paths == ["deploy/"]
+
+    def test_import_skips_api_and_scheduler(self):
+        """Test the CLI module does not load the API stack or APScheduler."""
+        code = (
+            "import sys, src.main; "
+            "print(sorted(m for m in ('fastapi', 'uvicorn', 'apscheduler') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,34 @@
+"""Unit tests for LRUCache."""
+
+from src.utils.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test suite for LRUCache."""
+
+    def test_hit_and_miss_counters(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats() == {"size": 1, "maxsize": 2, "hits": 1, "misses": 1}
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now the oldest
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_zero_size_disables(self):
+        cache = LRUCache(maxsize=0)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0